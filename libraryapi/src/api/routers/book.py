@@ -1,11 +1,17 @@
 from dependency_injector.wiring import inject, Provide
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request, Response, status
 from src.container import Container
-from typing import List
+from typing import List, Literal
 
-from src.core.domain.book import Book, BookIn
+from src.api.routers.job import accepted
+from src.config import config
+from src.core.domain.book import Book, BookIn, InventoryItem, InventoryResult, Isbn
+from src.core.domain.job import JobIn, JobKind
 from src.infrastructure.services.ibook import IBookService
-from src.infrastructure.dto.bookdto import BookDTO
+from src.infrastructure.services.ijob import IJobService
+from src.infrastructure.utils.catalog_import import feed_format, read_records
+from src.infrastructure.dto.bookdto import BookDTO, BookImportResultDTO
+from src.infrastructure.dto.jobdto import JobAcceptedDTO
 
 router = APIRouter(prefix="/Book", tags=["Book"])
 
@@ -23,12 +29,17 @@ async def add_book(
         book (BookIn): The book data to add.
         service (IBookService): The injected book service dependency.
 
+    Raises:
+        HTTPException: 409 if a book with the same ISBN exists.
+
     Returns:
         Book: The newly added book.
     """
     new_book = await service.add_book(book)
     if new_book:
         return new_book
+    if await service.get_book_by_isbn(book.isbn):
+        raise HTTPException(status_code=409, detail="Book with this ISBN already exists")
     raise HTTPException(status_code=400, detail="Unable to create book")
 
 
@@ -73,6 +84,30 @@ async def get_book_by_id(
         return book
     raise HTTPException(status_code=404, detail="Book not found")
 
+@router.get("/isbn/{isbn}", response_model=BookDTO, status_code=200)
+@inject
+async def get_book_by_isbn(
+    isbn: Isbn,
+    service: IBookService = Depends(Provide[Container.book_service]),
+) -> Book:
+    """
+    Endpoint to fetch a book based on its ISBN, e.g. from a barcode scanner.
+
+    Args:
+        isbn (Isbn): The ISBN-10 or ISBN-13, hyphens allowed.
+        service (IBookService): The injected book service dependency.
+
+    Raises:
+        HTTPException: 404 if the book doesn't exist.
+
+    Returns:
+        Book: The book details.
+    """
+    book = await service.get_book_by_isbn(isbn)
+    if book:
+        return book
+    raise HTTPException(status_code=404, detail="Book not found")
+
 @router.get("/search/title/{title}", response_model=list[Book], status_code=200)
 @inject
 async def search_book_by_title(
@@ -137,6 +172,114 @@ async def search_book_by_category(
         return books
     raise HTTPException(status_code=404, detail="No books found for this category")
 
+@router.post("/similar/rebuild", response_model=JobAcceptedDTO, status_code=202)
+@inject
+async def rebuild_similarity_index(
+    request: Request,
+    response: Response,
+    service: IJobService = Depends(Provide[Container.job_service]),
+) -> JobAcceptedDTO:
+    """
+    Endpoint for enqueueing a rebuild of the similar books model.
+
+    Args:
+        request (Request): The incoming HTTP request.
+        response (Response): The outgoing HTTP response.
+        service (IJobService): Injected job service.
+
+    Returns:
+        JobAcceptedDTO: The id of the job and the URL of its status.
+    """
+    job = await service.enqueue_job(JobIn(kind=JobKind.SIMILARITY_REBUILD))
+    return accepted(request, response, job)
+
+
+@router.post("/import", response_model=BookImportResultDTO, status_code=200)
+@inject
+async def import_books(
+    request: Request,
+    format: Literal["csv", "ndjson"] | None = Query(None),
+    service: IBookService = Depends(Provide[Container.book_service]),
+    job_service: IJobService = Depends(Provide[Container.job_service]),
+) -> BookImportResultDTO:
+    """
+    Endpoint for importing a catalog feed streamed in the request body.
+
+    The feed is CSV with a header row or NDJSON, detected from the
+    `Content-Type` header unless `format` is given. Rows are upserted by
+    ISBN; invalid rows are rejected and reported with their line numbers.
+    When books were added or changed, a rebuild of the similar books
+    model is enqueued.
+
+    Args:
+        request (Request): The incoming HTTP request.
+        format (Literal["csv", "ndjson"] | None): The format of the feed.
+        service (IBookService): Injected book service.
+        job_service (IJobService): Injected job service.
+
+    Returns:
+        BookImportResultDTO: The summary of the import.
+    """
+    records = read_records(
+        request.stream(),
+        format or feed_format(request.headers.get("content-type")),
+    )
+    result = await service.import_books(records)
+
+    job_id = None
+    if result.inserted or result.updated:
+        job = await job_service.enqueue_job(JobIn(kind=JobKind.SIMILARITY_REBUILD))
+        job_id = job.id
+
+    return BookImportResultDTO(**result.model_dump(), job_id=job_id)
+
+
+@router.post("/inventory", response_model=InventoryResult, status_code=200)
+@inject
+async def update_inventory(
+    items: list[InventoryItem] = Body(..., min_length=1, max_length=config.INVENTORY_MAX_ITEMS),
+    service: IBookService = Depends(Provide[Container.book_service]),
+) -> InventoryResult:
+    """
+    Endpoint for setting available copies of many books in one transaction.
+
+    Args:
+        items (list[InventoryItem]): The counted stock of books, by id or ISBN.
+        service (IBookService): Injected book service.
+
+    Returns:
+        InventoryResult: The previous and new stock of changed books, the
+            positions of items matching no book and of items of books
+            tracked by copies, which are skipped.
+    """
+    return await service.update_inventory(items)
+
+
+@router.get("/{book_id}/similar", response_model=List[BookDTO], status_code=200)
+@inject
+async def get_similar_books(
+    book_id: int,
+    limit: int = Query(10, ge=1, le=config.SIMILARITY_TOP_N),
+    service: IBookService = Depends(Provide[Container.book_service]),
+) -> List[BookDTO]:
+    """
+    Endpoint for fetching books similar to the given one.
+
+    Args:
+        book_id (int): The book's id.
+        limit (int): Maximal number of returned books.
+        service (IBookService): Injected book service dependency.
+
+    Raises:
+        HTTPException: 404 if the book does not exist.
+
+    Returns:
+        List[BookDTO]: Similar books, most similar first.
+    """
+    if not await service.get_book_by_id(book_id):
+        raise HTTPException(status_code=404, detail="Book not found")
+    return await service.get_similar_books(book_id, limit)
+
 @router.put("/{book_id}", response_model=BookDTO, status_code=200)
 @inject
 async def update_book(
@@ -154,6 +297,7 @@ async def update_book(
 
     Raises:
         HTTPException: 404 if book does not exist.
+        HTTPException: 409 if another book has the same ISBN.
 
     Returns:
         Book: Updated book.
@@ -161,7 +305,9 @@ async def update_book(
     updated_book = await service.update_book(book_id, updated_data)
     if updated_book:
         return updated_book
-    raise HTTPException(status_code=404, detail="Book not found")
+    if not await service.get_book_by_id(book_id):
+        raise HTTPException(status_code=404, detail="Book not found")
+    raise HTTPException(status_code=409, detail="Book with this ISBN already exists")
 
 
 @router.delete("/{book_id}", status_code=204)
@@ -1,10 +1,19 @@
 from datetime import date
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Body, Depends, HTTPException
 from dependency_injector.wiring import inject, Provide
+from src.config import config
 from src.container import Container
 
 from src.infrastructure.dto.borrowingdto import BorrowingDTO
-from src.core.domain.borrowing import Borrowing, BorrowingIn
+from src.core.domain.borrowing import (
+    Borrowing,
+    BorrowingEligibility,
+    BorrowingIn,
+    BorrowingReturn,
+    BulkCheckoutResult,
+    BulkReturnResult,
+    LoanCounter,
+)
 from src.infrastructure.services.iborrowing import IBorrowingService
 
 router = APIRouter(prefix="/borrowings", tags=["borrowings"])
@@ -16,7 +25,93 @@ async def create_borrowing(
     borrowing: BorrowingIn,
     service: IBorrowingService = Depends(Provide[Container.borrowing_service]),
 ) -> Borrowing:
-    return await service.create_borrowing(borrowing)
+    new_borrowing = await service.create_borrowing(borrowing)
+    if not new_borrowing:
+        eligibility = await service.check_eligibility(
+            borrowing.user_id,
+            borrowing.book_id,
+            borrowing.branch_id,
+        )
+        if not eligibility:
+            raise HTTPException(status_code=404, detail="User not found.")
+        raise HTTPException(
+            status_code=409,
+            detail={
+                "message": "User is not eligible to borrow the book.",
+                "failed_rules": [rule.value for rule in eligibility.failed_rules],
+            },
+        )
+    return new_borrowing
+
+@router.post("/bulk", response_model=list[BulkCheckoutResult], status_code=200)
+@inject
+async def create_borrowings(
+    items: list[BorrowingIn] = Body(..., min_length=1, max_length=config.BULK_BORROWING_MAX_ITEMS),
+    service: IBorrowingService = Depends(Provide[Container.borrowing_service]),
+) -> list[BulkCheckoutResult]:
+    """
+    Endpoint for checking out a batch of books in one transaction.
+
+    Args:
+        items (list[BorrowingIn]): The borrowings to create.
+        service (IBorrowingService): Injected borrowing service.
+
+    Returns:
+        list[BulkCheckoutResult]: The created borrowing or the failed rules
+            of every item, in input order.
+    """
+    return await service.create_borrowings(items)
+
+@router.post("/bulk/return", response_model=list[BulkReturnResult], status_code=200)
+@inject
+async def mark_borrowings_as_returned(
+    items: list[BorrowingReturn] = Body(..., min_length=1, max_length=config.BULK_BORROWING_MAX_ITEMS),
+    service: IBorrowingService = Depends(Provide[Container.borrowing_service]),
+) -> list[BulkReturnResult]:
+    """
+    Endpoint for returning a batch of borrowings in one transaction.
+
+    Args:
+        items (list[BorrowingReturn]): The borrowings and their return dates.
+        service (IBorrowingService): Injected borrowing service.
+
+    Returns:
+        list[BulkReturnResult]: Whether every item was returned, in input order.
+    """
+    return await service.mark_borrowings_as_returned(items)
+
+@router.get(
+    "/eligibility/{user_id}/{book_id}",
+    response_model=BorrowingEligibility,
+    status_code=200,
+)
+@inject
+async def check_eligibility(
+    user_id: int,
+    book_id: int,
+    branch_id: int | None = None,
+    service: IBorrowingService = Depends(Provide[Container.borrowing_service]),
+) -> BorrowingEligibility:
+    """
+    Endpoint for checking whether a user may borrow a book, at a branch
+    if given.
+
+    Args:
+        user_id (int): The id of the user.
+        book_id (int): The id of the book.
+        branch_id (int | None): The id of the checkout branch, if any.
+        service (IBorrowingService): Injected borrowing service.
+
+    Raises:
+        HTTPException: 404 if the user does not exist.
+
+    Returns:
+        BorrowingEligibility: The evaluated rules and the ones that failed.
+    """
+    eligibility = await service.check_eligibility(user_id, book_id, branch_id)
+    if not eligibility:
+        raise HTTPException(status_code=404, detail="User not found.")
+    return eligibility
 
 @router.get("/{borrowing_id}", response_model=BorrowingDTO, status_code=200)
 @inject
@@ -38,12 +133,38 @@ async def get_active_borrowings_by_user(
     active_borrowings = await service.get_active_borrowings_by_user(user_id)
     return active_borrowings
 
+@router.get("/loans/{user_id}", response_model=LoanCounter, status_code=200)
+@inject
+async def get_loan_counter(
+    user_id: int,
+    service: IBorrowingService = Depends(Provide[Container.borrowing_service]),
+) -> LoanCounter:
+    """
+    Endpoint for fetching the numbers of active and overdue loans of a user.
+
+    Args:
+        user_id (int): The id of the user.
+        service (IBorrowingService): Injected borrowing service.
+
+    Raises:
+        HTTPException: 404 if the user does not exist.
+
+    Returns:
+        LoanCounter: The loan counts of the user.
+    """
+    counter = await service.get_loan_counter(user_id)
+    if not counter:
+        raise HTTPException(status_code=404, detail="User not found.")
+    return counter
+
 @router.get("/", response_model=list[BorrowingDTO], status_code=200)
 @inject
 async def list_all_borrowings(
+    since: date | None = None,
+    until: date | None = None,
     service: IBorrowingService = Depends(Provide[Container.borrowing_service]),
 ) -> list[BorrowingDTO]:
-    return await service.list_all_borrowings()
+    return await service.list_all_borrowings(since, until)
 
 @router.patch("/{borrowing_id}/return", status_code=200)
 @inject
@@ -62,6 +183,8 @@ async def mark_borrowing_as_returned(
 @inject
 async def get_borrowing_history_by_user(
     user_id: int,
+    since: date | None = None,
+    until: date | None = None,
     service: IBorrowingService = Depends(Provide[Container.borrowing_service]),
 ):
     """
@@ -69,12 +192,14 @@ async def get_borrowing_history_by_user(
 
     Args:
         user_id (int): id of the user.
+        since (date | None): The earliest borrowed date, if any.
+        until (date | None): The latest borrowed date, if any.
         service (IBorrowingService): Injected borrowing service.
 
     Returns:
         List[Borrowing]: A list of completed borrowings for the user.
     """
-    return await service.get_borrowing_history_by_user(user_id)
+    return await service.get_borrowing_history_by_user(user_id, since, until)
 
 @router.delete("/{borrowing_id}", status_code=204)
 @inject
@@ -0,0 +1,120 @@
+from fastapi import APIRouter, Depends, HTTPException
+from dependency_injector.wiring import inject, Provide
+
+from src.container import Container
+from src.core.domain.branch import BranchIn, BranchStockIn
+from src.infrastructure.dto.branchdto import (
+    BookAvailabilityDTO,
+    BranchDTO,
+    BranchStockDTO,
+)
+from src.infrastructure.services.ibranch import IBranchService
+
+router = APIRouter(prefix="/branches", tags=["branches"])
+
+
+@router.post("/", response_model=BranchDTO, status_code=201)
+@inject
+async def add_branch(
+    branch: BranchIn,
+    service: IBranchService = Depends(Provide[Container.branch_service]),
+) -> BranchDTO:
+    """
+    Endpoint for opening a branch with its own stock partition.
+
+    Args:
+        branch (BranchIn): The branch data.
+        service (IBranchService): Injected branch service.
+
+    Raises:
+        HTTPException: 409 if a branch of the same name exists.
+
+    Returns:
+        BranchDTO: The created branch.
+    """
+    new_branch = await service.add_branch(branch)
+    if not new_branch:
+        raise HTTPException(status_code=409, detail="Branch already exists.")
+    return new_branch
+
+
+@router.get("/", response_model=list[BranchDTO], status_code=200)
+@inject
+async def list_branches(
+    service: IBranchService = Depends(Provide[Container.branch_service]),
+) -> list[BranchDTO]:
+    return await service.list_branches()
+
+
+@router.get("/books/{book_id}/availability", response_model=BookAvailabilityDTO, status_code=200)
+@inject
+async def get_book_availability(
+    book_id: int,
+    service: IBranchService = Depends(Provide[Container.branch_service]),
+) -> BookAvailabilityDTO:
+    """
+    Endpoint for finding where copies of a book are available.
+
+    Args:
+        book_id (int): The ID of the book.
+        service (IBranchService): Injected branch service.
+
+    Raises:
+        HTTPException: 404 if the book does not exist.
+
+    Returns:
+        BookAvailabilityDTO: Unassigned copies and copies per branch.
+    """
+    availability = await service.get_book_availability(book_id)
+    if not availability:
+        raise HTTPException(status_code=404, detail="Book not found.")
+    return availability
+
+
+@router.get("/{branch_id}", response_model=BranchDTO, status_code=200)
+@inject
+async def get_branch_by_id(
+    branch_id: int,
+    service: IBranchService = Depends(Provide[Container.branch_service]),
+) -> BranchDTO:
+    branch = await service.get_branch_by_id(branch_id)
+    if not branch:
+        raise HTTPException(status_code=404, detail="Branch not found.")
+    return branch
+
+
+@router.put("/{branch_id}/stock", response_model=list[BranchStockDTO], status_code=200)
+@inject
+async def set_branch_stock(
+    branch_id: int,
+    items: list[BranchStockIn],
+    service: IBranchService = Depends(Provide[Container.branch_service]),
+) -> list[BranchStockDTO]:
+    """
+    Endpoint for setting the copies of books on the shelves of a branch.
+    Books missing from the list keep their stock, unknown books are skipped.
+
+    Args:
+        branch_id (int): The ID of the branch.
+        items (list[BranchStockIn]): The copies per book.
+        service (IBranchService): Injected branch service.
+
+    Raises:
+        HTTPException: 404 if the branch does not exist.
+
+    Returns:
+        list[BranchStockDTO]: The stored stock.
+    """
+    stock = await service.set_branch_stock(branch_id, items)
+    if stock is None:
+        raise HTTPException(status_code=404, detail="Branch not found.")
+    return stock
+
+
+@router.get("/{branch_id}/stock", response_model=list[BranchStockDTO], status_code=200)
+@inject
+async def get_branch_stock(
+    branch_id: int,
+    service: IBranchService = Depends(Provide[Container.branch_service]),
+) -> list[BranchStockDTO]:
+    return await service.get_branch_stock(branch_id)
@@ -0,0 +1,79 @@
+from fastapi import APIRouter, Body, Depends, HTTPException
+from dependency_injector.wiring import inject, Provide
+
+from src.config import config
+from src.container import Container
+from src.core.domain.copy import BookCopyIn, BookCopyUpdate
+from src.infrastructure.dto.copydto import BookCopyDTO
+from src.infrastructure.services.icopy import IBookCopyService
+
+router = APIRouter(prefix="/copies", tags=["copies"])
+
+
+@router.post("/", response_model=list[BookCopyDTO], status_code=201)
+@inject
+async def add_copies(
+    items: list[BookCopyIn] = Body(..., min_length=1, max_length=config.INVENTORY_MAX_ITEMS),
+    service: IBookCopyService = Depends(Provide[Container.copy_service]),
+) -> list[BookCopyDTO]:
+    """
+    Endpoint for registering physical copies of books. Once a book has
+    copies, checkouts lend one of them.
+
+    Args:
+        items (list[BookCopyIn]): The copies to register.
+        service (IBookCopyService): Injected book copy service.
+
+    Returns:
+        list[BookCopyDTO]: The registered copies, without copies of unknown
+            books or branches and already registered barcodes.
+    """
+    return await service.add_copies(items)
+
+
+@router.get("/books/{book_id}", response_model=list[BookCopyDTO], status_code=200)
+@inject
+async def get_copies_by_book(
+    book_id: int,
+    service: IBookCopyService = Depends(Provide[Container.copy_service]),
+) -> list[BookCopyDTO]:
+    return await service.get_copies_by_book(book_id)
+
+
+@router.get("/barcode/{barcode}", response_model=BookCopyDTO, status_code=200)
+@inject
+async def get_copy_by_barcode(
+    barcode: str,
+    service: IBookCopyService = Depends(Provide[Container.copy_service]),
+) -> BookCopyDTO:
+    copy = await service.get_copy_by_barcode(barcode)
+    if not copy:
+        raise HTTPException(status_code=404, detail="Copy not found.")
+    return copy
+
+
+@router.put("/{copy_id}", response_model=BookCopyDTO, status_code=200)
+@inject
+async def update_copy(
+    copy_id: int,
+    data: BookCopyUpdate,
+    service: IBookCopyService = Depends(Provide[Container.copy_service]),
+) -> BookCopyDTO:
+    """
+    Endpoint for moving a copy to another branch or withdrawing it.
+
+    Args:
+        copy_id (int): The ID of the copy.
+        data (BookCopyUpdate): The new location and status.
+        service (IBookCopyService): Injected book copy service.
+
+    Raises:
+        HTTPException: 404 if the copy does not exist or is not on the shelf.
+
+    Returns:
+        BookCopyDTO: The updated copy.
+    """
+    copy = await service.update_copy(copy_id, data)
+    if not copy:
+        raise HTTPException(status_code=404, detail="Copy not found or not on the shelf.")
+    return copy
@@ -0,0 +1,29 @@
+from fastapi import APIRouter
+
+from src.db import database
+from src.infrastructure.dto.pooldto import PoolStatsDTO, ReplicaStatsDTO
+
+router = APIRouter(prefix="/database", tags=["database"])
+
+
+@router.get("/pool", response_model=PoolStatsDTO, status_code=200)
+async def get_pool_stats() -> PoolStatsDTO:
+    """
+    Endpoint for fetching connection pool statistics of this worker.
+
+    Returns:
+        PoolStatsDTO: Open, idle and used connections and the pool bounds.
+    """
+    return PoolStatsDTO(**database.pool_stats())
+
+
+@router.get("/replicas", response_model=list[ReplicaStatsDTO], status_code=200)
+async def get_replica_stats() -> list[ReplicaStatsDTO]:
+    """
+    Endpoint for fetching the health, lag and pool usage of read replicas
+    as seen by this worker.
+
+    Returns:
+        list[ReplicaStatsDTO]: The state of every configured replica.
+    """
+    return [ReplicaStatsDTO(**stats) for stats in database.replica_stats()]
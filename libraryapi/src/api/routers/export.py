@@ -0,0 +1,32 @@
+from fastapi import APIRouter, Depends, Request, Response
+from dependency_injector.wiring import inject, Provide
+
+from src.api.routers.job import accepted
+from src.container import Container
+from src.core.domain.job import JobIn, JobKind
+from src.infrastructure.dto.jobdto import JobAcceptedDTO
+from src.infrastructure.services.ijob import IJobService
+
+router = APIRouter(prefix="/exports", tags=["exports"])
+
+
+@router.post("/", response_model=JobAcceptedDTO, status_code=202)
+@inject
+async def export_analytics(
+    request: Request,
+    response: Response,
+    service: IJobService = Depends(Provide[Container.job_service]),
+) -> JobAcceptedDTO:
+    """
+    Endpoint for enqueueing an export of circulation data to Parquet files.
+
+    Args:
+        request (Request): The incoming HTTP request.
+        response (Response): The outgoing HTTP response.
+        service (IJobService): Injected job service.
+
+    Returns:
+        JobAcceptedDTO: The id of the job and the URL of its status.
+    """
+    job = await service.enqueue_job(JobIn(kind=JobKind.ANALYTICS_EXPORT))
+    return accepted(request, response, job)
@@ -0,0 +1,69 @@
+from datetime import date
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from dependency_injector.wiring import inject, Provide
+
+from src.api.routers.job import accepted
+from src.container import Container
+from src.core.domain.fine import FineTotal
+from src.core.domain.job import JobIn, JobKind
+from src.infrastructure.dto.finedto import FineDTO
+from src.infrastructure.dto.jobdto import JobAcceptedDTO
+from src.infrastructure.services.ifine import IFineService
+from src.infrastructure.services.ijob import IJobService
+
+router = APIRouter(prefix="/fines", tags=["fines"])
+
+
+@router.post("/assess", response_model=JobAcceptedDTO, status_code=202)
+@inject
+async def assess_fines(
+    request: Request,
+    response: Response,
+    today: date | None = None,
+    service: IJobService = Depends(Provide[Container.job_service]),
+) -> JobAcceptedDTO:
+    """
+    Endpoint for enqueueing the computation of fines for all overdue borrowings.
+
+    Args:
+        request (Request): The incoming HTTP request.
+        response (Response): The outgoing HTTP response.
+        today (date | None): The assessment date, today if not given.
+        service (IJobService): Injected job service.
+
+    Returns:
+        JobAcceptedDTO: The id of the job and the URL of its status.
+    """
+    payload = {"today": today.isoformat()} if today else {}
+    job = await service.enqueue_job(JobIn(kind=JobKind.FINE_ASSESSMENT, payload=payload))
+    return accepted(request, response, job)
+
+
+@router.get("/user/{user_id}", response_model=list[FineDTO], status_code=200)
+@inject
+async def get_fines_by_user(
+    user_id: int,
+    service: IFineService = Depends(Provide[Container.fine_service]),
+) -> list[FineDTO]:
+    return await service.get_fines_by_user(user_id)
+
+
+@router.get("/user/{user_id}/total", response_model=FineTotal, status_code=200)
+@inject
+async def get_user_fine_total(
+    user_id: int,
+    service: IFineService = Depends(Provide[Container.fine_service]),
+) -> FineTotal:
+    return await service.get_user_fine_total(user_id)
+
+
+@router.patch("/{fine_id}/pay", status_code=200)
+@inject
+async def pay_fine(
+    fine_id: int,
+    service: IFineService = Depends(Provide[Container.fine_service]),
+) -> dict:
+    if not await service.pay_fine(fine_id):
+        raise HTTPException(status_code=404, detail="Unpaid fine not found.")
+    return {"message": "Fine marked as paid successfully."}
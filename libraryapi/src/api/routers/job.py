@@ -0,0 +1,50 @@
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from dependency_injector.wiring import inject, Provide
+
+from src.container import Container
+from src.infrastructure.dto.jobdto import JobAcceptedDTO, JobDTO
+from src.infrastructure.services.ijob import IJobService
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+
+def accepted(request: Request, response: Response, job: JobDTO) -> JobAcceptedDTO:
+    """A function building the 202 response of an enqueued job.
+
+    Args:
+        request (Request): The incoming HTTP request.
+        response (Response): The outgoing HTTP response.
+        job (JobDTO): The enqueued job.
+
+    Returns:
+        JobAcceptedDTO: The id of the job and the URL of its status.
+    """
+    status_url = str(request.url_for("get_job_by_id", job_id=job.id))
+    response.headers["Location"] = status_url
+
+    return JobAcceptedDTO(job_id=job.id, status=job.status, status_url=status_url)
+
+
+@router.get("/{job_id}", response_model=JobDTO, status_code=200)
+@inject
+async def get_job_by_id(
+    job_id: int,
+    service: IJobService = Depends(Provide[Container.job_service]),
+) -> JobDTO:
+    """
+    Endpoint for fetching the status of a background job.
+
+    Args:
+        job_id (int): The job's id.
+        service (IJobService): Injected job service.
+
+    Raises:
+        HTTPException: 404 if the job does not exist.
+
+    Returns:
+        JobDTO: The job status.
+    """
+    job = await service.get_job_by_id(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found.")
+    return job
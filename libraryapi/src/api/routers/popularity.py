@@ -0,0 +1,47 @@
+from fastapi import APIRouter, Depends, Query
+from dependency_injector.wiring import inject, Provide
+
+from src.container import Container
+from src.infrastructure.dto.popularitydto import BookPopularityDTO
+from src.infrastructure.services.ipopularity import IPopularityService
+
+router = APIRouter(prefix="/popularity", tags=["popularity"])
+
+
+@router.get("/trending", response_model=list[BookPopularityDTO], status_code=200)
+@inject
+async def get_trending_books(
+    limit: int = Query(10, ge=1, le=100),
+    service: IPopularityService = Depends(Provide[Container.popularity_service]),
+) -> list[BookPopularityDTO]:
+    """
+    Endpoint for fetching the most borrowed books, with recent borrowings
+    weighted more than older ones.
+
+    Args:
+        limit (int): Maximal number of returned books.
+        service (IPopularityService): Injected popularity service.
+
+    Returns:
+        list[BookPopularityDTO]: Popularity of books, most popular first.
+    """
+    return await service.get_trending_books(limit)
+
+
+@router.get("/{book_id}", response_model=BookPopularityDTO, status_code=200)
+@inject
+async def get_book_popularity(
+    book_id: int,
+    service: IPopularityService = Depends(Provide[Container.popularity_service]),
+) -> BookPopularityDTO:
+    """
+    Endpoint for fetching the popularity of a single book.
+
+    Args:
+        book_id (int): The book's id.
+        service (IPopularityService): Injected popularity service.
+
+    Returns:
+        BookPopularityDTO: The popularity of the book.
+    """
+    return await service.get_book_popularity(book_id)
@@ -0,0 +1,93 @@
+from fastapi import APIRouter, Depends, HTTPException
+from dependency_injector.wiring import inject, Provide
+
+from src.container import Container
+from src.core.domain.reservation import ReservationIn, ReservationPosition
+from src.infrastructure.dto.reservationdto import ReservationDTO
+from src.infrastructure.services.ireservation import IReservationService
+
+router = APIRouter(prefix="/reservations", tags=["reservations"])
+
+
+@router.post("/", response_model=ReservationDTO, status_code=201)
+@inject
+async def create_reservation(
+    reservation: ReservationIn,
+    service: IReservationService = Depends(Provide[Container.reservation_service]),
+) -> ReservationDTO:
+    """
+    Endpoint for queueing a user for an unavailable book.
+
+    Args:
+        reservation (ReservationIn): The reservation data.
+        service (IReservationService): Injected reservation service.
+
+    Raises:
+        HTTPException: 409 if the book is available or already reserved by the user.
+
+    Returns:
+        ReservationDTO: The created reservation.
+    """
+    new_reservation = await service.create_reservation(reservation)
+    if not new_reservation:
+        raise HTTPException(
+            status_code=409,
+            detail="Book is available or already reserved by the user.",
+        )
+    return new_reservation
+
+
+@router.get("/{reservation_id}", response_model=ReservationDTO, status_code=200)
+@inject
+async def get_reservation_by_id(
+    reservation_id: int,
+    service: IReservationService = Depends(Provide[Container.reservation_service]),
+) -> ReservationDTO:
+    reservation = await service.get_reservation_by_id(reservation_id)
+    if not reservation:
+        raise HTTPException(status_code=404, detail="Reservation not found.")
+    return reservation
+
+
+@router.get("/{reservation_id}/position", response_model=ReservationPosition, status_code=200)
+@inject
+async def get_queue_position(
+    reservation_id: int,
+    service: IReservationService = Depends(Provide[Container.reservation_service]),
+) -> ReservationPosition:
+    """
+    Endpoint for fetching the position of a reservation in its book queue.
+
+    Args:
+        reservation_id (int): The reservation's id.
+        service (IReservationService): Injected reservation service.
+
+    Raises:
+        HTTPException: 404 if the reservation is not waiting in a queue.
+
+    Returns:
+        ReservationPosition: The position, 1 meaning next in line.
+    """
+    position = await service.get_queue_position(reservation_id)
+    if not position:
+        raise HTTPException(status_code=404, detail="Waiting reservation not found.")
+    return position
+
+
+@router.get("/user/{user_id}", response_model=list[ReservationDTO], status_code=200)
+@inject
+async def get_reservations_by_user(
+    user_id: int,
+    service: IReservationService = Depends(Provide[Container.reservation_service]),
+) -> list[ReservationDTO]:
+    return await service.get_reservations_by_user(user_id)
+
+
+@router.delete("/{reservation_id}", status_code=204)
+@inject
+async def cancel_reservation(
+    reservation_id: int,
+    service: IReservationService = Depends(Provide[Container.reservation_service]),
+) -> None:
+    if not await service.cancel_reservation(reservation_id):
+        raise HTTPException(status_code=404, detail="Open reservation not found.")
@@ -0,0 +1,17 @@
+from fastapi import APIRouter
+
+from src.infrastructure.dto.scheduledjobdto import ScheduledJobDTO
+from src.infrastructure.utils.scheduler import scheduler
+
+router = APIRouter(prefix="/scheduler", tags=["scheduler"])
+
+
+@router.get("/jobs", response_model=list[ScheduledJobDTO], status_code=200)
+async def list_scheduled_jobs() -> list[ScheduledJobDTO]:
+    """
+    Endpoint for fetching run metrics of periodic jobs in this worker.
+
+    Returns:
+        list[ScheduledJobDTO]: Run counts and durations of jobs.
+    """
+    return [ScheduledJobDTO(**metrics) for metrics in scheduler.metrics()]
@@ -0,0 +1,75 @@
+from datetime import date
+
+from fastapi import APIRouter, Depends, Query
+from dependency_injector.wiring import inject, Provide
+
+from src.container import Container
+from src.infrastructure.dto.statsdto import BookUtilizationDTO, MonthlyCirculationDTO
+from src.infrastructure.services.istats import IStatsService
+
+router = APIRouter(prefix="/stats", tags=["stats"])
+
+
+@router.get("/categories", response_model=list[MonthlyCirculationDTO], status_code=200)
+@inject
+async def get_category_circulation(
+    since: date | None = None,
+    until: date | None = None,
+    service: IStatsService = Depends(Provide[Container.stats_service]),
+) -> list[MonthlyCirculationDTO]:
+    """
+    Endpoint for fetching monthly checkouts and returns per category.
+
+    Args:
+        since (date | None): The first day of the range. Defaults to a year ago.
+        until (date | None): The last day of the range. Defaults to today.
+        service (IStatsService): Injected statistics service.
+
+    Returns:
+        list[MonthlyCirculationDTO]: Circulation per month and category.
+    """
+    return await service.get_category_circulation(since, until)
+
+
+@router.get("/authors", response_model=list[MonthlyCirculationDTO], status_code=200)
+@inject
+async def get_author_circulation(
+    since: date | None = None,
+    until: date | None = None,
+    service: IStatsService = Depends(Provide[Container.stats_service]),
+) -> list[MonthlyCirculationDTO]:
+    """
+    Endpoint for fetching monthly checkouts and returns per author.
+
+    Args:
+        since (date | None): The first day of the range. Defaults to a year ago.
+        until (date | None): The last day of the range. Defaults to today.
+        service (IStatsService): Injected statistics service.
+
+    Returns:
+        list[MonthlyCirculationDTO]: Circulation per month and author.
+    """
+    return await service.get_author_circulation(since, until)
+
+
+@router.get("/utilization", response_model=list[BookUtilizationDTO], status_code=200)
+@inject
+async def get_book_utilization(
+    limit: int = Query(20, ge=1, le=100),
+    since: date | None = None,
+    until: date | None = None,
+    service: IStatsService = Depends(Provide[Container.stats_service]),
+) -> list[BookUtilizationDTO]:
+    """
+    Endpoint for fetching the titles whose copies were on loan the most.
+
+    Args:
+        limit (int): Maximal number of returned titles.
+        since (date | None): The first day of the range. Defaults to 30 days ago.
+        until (date | None): The last day of the range. Defaults to today.
+        service (IStatsService): Injected statistics service.
+
+    Returns:
+        list[BookUtilizationDTO]: Utilization of titles, most utilized first.
+    """
+    return await service.get_book_utilization(limit, since, until)
@@ -0,0 +1,125 @@
+"""Benchmark of checkout throughput with concurrent clients.
+
+Every client is a separate process lending its own books to its own
+users, as API workers do, so the measured rate shows how checkouts scale
+when only the database is shared. Rows added by the benchmark are
+deleted when it finishes.
+
+Run with `python -m src.benchmark_checkouts [--checkouts N] [--clients 1 2 4 8]`.
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import time
+import uuid
+from datetime import date
+
+from src.container import Container
+from src.core.domain.borrowing import BorrowingIn
+from src.db import (
+    author_table,
+    book_table,
+    borrowing_archive_table,
+    borrowing_shards,
+    borrowing_table,
+    category_table,
+    database,
+    user_loan_counter_table,
+    user_table,
+)
+
+
+async def run_client(checkouts: int, barrier: multiprocessing.Barrier) -> float:
+    """A function lending one copy of every book of a client.
+
+    Args:
+        checkouts (int): Number of checkouts of the client.
+        barrier (multiprocessing.Barrier): The barrier all clients start at.
+
+    Returns:
+        float: The duration of the checkouts in seconds.
+    """
+    await database.connect()
+    await borrowing_shards.connect()
+    try:
+        name = uuid.uuid4().hex
+        author_id = await database.execute(
+            author_table.insert().values(first_name="Benchmark", last_name=name)
+        )
+        category_id = await database.execute(
+            category_table.insert().values(name=name, description="")
+        )
+        book_ids = [
+            await database.execute(book_table.insert().values(
+                title=f"{name} {index}",
+                author_id=author_id,
+                category_id=category_id,
+                published_year=2000,
+                copies_available=1,
+            ))
+            for index in range(checkouts)
+        ]
+        user_ids = [
+            await database.execute(
+                user_table.insert().values(email=f"{name}.{index}@example.com", password="")
+            )
+            for index in range(checkouts)
+        ]
+        repository = Container().borrowing_repository()
+
+        await asyncio.to_thread(barrier.wait)
+        start = time.perf_counter()
+        for user_id, book_id in zip(user_ids, book_ids):
+            await repository.create_borrowing(
+                BorrowingIn(user_id=user_id, book_id=book_id, borrowed_date=date.today())
+            )
+        duration = time.perf_counter() - start
+
+        for table in (borrowing_table, borrowing_archive_table, user_loan_counter_table):
+            await borrowing_shards.gather(
+                lambda shard: shard.execute(table.delete().where(table.c.user_id.in_(user_ids)))
+            )
+        await database.execute(user_table.delete().where(user_table.c.id.in_(user_ids)))
+        await database.execute(author_table.delete().where(author_table.c.id == author_id))
+        await database.execute(category_table.delete().where(category_table.c.id == category_id))
+    finally:
+        await borrowing_shards.disconnect()
+        await database.disconnect()
+
+    return duration
+
+
+def client(checkouts: int, barrier: multiprocessing.Barrier, durations: multiprocessing.Queue) -> None:
+    """The entry point of a client process."""
+    durations.put(asyncio.run(run_client(checkouts, barrier)))
+
+
+def main() -> None:
+    """The entry point of the benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark concurrent checkouts.")
+    parser.add_argument("--checkouts", type=int, default=200)
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    baseline = None
+    for clients in args.clients:
+        barrier = multiprocessing.Barrier(clients)
+        durations = multiprocessing.Queue()
+        processes = [
+            multiprocessing.Process(target=client, args=(args.checkouts, barrier, durations))
+            for _ in range(clients)
+        ]
+        for process in processes:
+            process.start()
+        elapsed = max(durations.get() for _ in processes)
+        for process in processes:
+            process.join()
+
+        rate = clients * args.checkouts / elapsed
+        baseline = baseline or rate
+        print(f"{clients:>3} clients: {rate:8.1f} checkouts/s ({rate / baseline:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
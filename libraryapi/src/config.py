@@ -20,12 +20,96 @@ class AppConfig(BaseSettings):
     DB_USER: Optional[str] = None
     DB_PASSWORD: Optional[str] = None
 
+    # Connection pool settings
+    DB_POOL_MIN_SIZE: int = 2
+    DB_POOL_MAX_SIZE: int = 10
+    DB_POOL_MAX_QUERIES: int = 50000
+    DB_POOL_MAX_INACTIVE_SECONDS: float = 300.0
+    DB_POOL_ACQUIRE_TIMEOUT_SECONDS: float = 10.0
+    DB_CONNECT_TIMEOUT_SECONDS: float = 10.0
+    DB_STATEMENT_CACHE_SIZE: int = 100
+
+    # Read replica settings, hosts as a JSON list of "host:port"
+    DB_REPLICA_HOSTS: list[str] = []
+    DB_REPLICA_MAX_LAG_SECONDS: float = 5.0
+    DB_REPLICA_CHECK_INTERVAL_SECONDS: float = 5.0
+    DB_READ_YOUR_WRITES_SECONDS: float = 10.0
+
+    # Borrowings sharding, hosts as a JSON list of "host:port". Users are
+    # mapped to shards by a jump hash of their id, so appending a shard
+    # only moves users to the new one. Empty keeps borrowings on DB_HOST.
+    BORROWING_SHARD_HOSTS: list[str] = []
+    BORROWING_RESHARD_BATCH_SIZE: int = 100
+
     # Security settings
     SECRET_KEY: Optional[str] = "your-secret-key"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
 
     # Fine rate for overdue books
     FINE_RATE: float = 5.0
+    FINE_ASSESSMENT_BATCH_SIZE: int = 1000
+
+    # Borrowing eligibility settings
+    MAX_ACTIVE_BORROWINGS: int = 5
+    MAX_OUTSTANDING_FINES: float = 0.0
+    BULK_BORROWING_MAX_ITEMS: int = 100
+
+    # Similar books settings
+    SIMILARITY_INDEX_DIR: str = "/tmp/libraryapi/similarity"
+    SIMILARITY_TOP_N: int = 20
+
+    # Popularity settings
+    POPULARITY_HALF_LIFE_DAYS: float = 7.0
+    POPULARITY_FLUSH_INTERVAL_SECONDS: int = 60
+
+    # Reservation settings
+    RESERVATION_HOLD_DAYS: int = 3
+
+    # Scheduler settings
+    SCHEDULER_ENABLED: bool = True
+    SCHEDULER_JITTER_SECONDS: float = 5.0
+    FINE_ASSESSMENT_INTERVAL_SECONDS: int = 86400
+    RESERVATION_EXPIRY_INTERVAL_SECONDS: int = 3600
+    SIMILARITY_REBUILD_INTERVAL_SECONDS: int = 86400
+
+    # Borrowings partitioning settings
+    BORROWING_PARTITION_MONTHS_AHEAD: int = 3
+    BORROWING_PARTITION_RETENTION_MONTHS: Optional[int] = None
+    BORROWING_PARTITION_INTERVAL_SECONDS: int = 86400
+
+    # Borrowings archive settings
+    BORROWING_ARCHIVE_AFTER_DAYS: int = 365
+    BORROWING_ARCHIVE_BATCH_SIZE: int = 1000
+    BORROWING_ARCHIVE_INTERVAL_SECONDS: int = 86400
+
+    # Circulation statistics settings
+    STATS_REFRESH_INTERVAL_SECONDS: int = 3600
+    STATS_REFRESH_LOOKBACK_DAYS: int = 7
+    STATS_REFRESH_CHUNK_DAYS: int = 31
+
+    # Analytics export settings
+    EXPORT_DIR: str = "/tmp/libraryapi/exports"
+    EXPORT_BATCH_SIZE: int = 10000
+    EXPORT_LAG_SECONDS: int = 60
+    EXPORT_INTERVAL_SECONDS: int = 86400
+
+    # Catalog import settings
+    IMPORT_CHUNK_SIZE: int = 10000
+    IMPORT_MAX_ERRORS: int = 1000
+    INVENTORY_MAX_ITEMS: int = 100000
+
+    # Copy inventory settings
+    COPY_AVAILABILITY_REFRESH_INTERVAL_SECONDS: int = 60
+
+    # Loan counters settings
+    LOAN_COUNTER_RECONCILIATION_INTERVAL_SECONDS: int = 3600
+
+    # Job queue settings
+    JOB_MAX_ATTEMPTS: int = 5
+    JOB_RETRY_BASE_SECONDS: int = 10
+    JOB_VISIBILITY_TIMEOUT_SECONDS: int = 300
+    JOB_POLL_INTERVAL_SECONDS: float = 1.0
+    JOB_WORKER_CONCURRENCY: int = 1
 
     # Debugging settings
     DEBUG: bool = True
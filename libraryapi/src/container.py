@@ -15,6 +15,20 @@ from src.infrastructure.repositories.borrowing import BorrowingRepository
 from src.infrastructure.services.borrowing import BorrowingService
 from src.infrastructure.repositories.recommendation import RecommendationRepository
 from src.infrastructure.services.recommendation import RecommendationService
+from src.infrastructure.repositories.popularity import PopularityRepository
+from src.infrastructure.services.popularity import PopularityService
+from src.infrastructure.repositories.reservation import ReservationRepository
+from src.infrastructure.services.reservation import ReservationService
+from src.infrastructure.repositories.fine import FineRepository
+from src.infrastructure.services.fine import FineService
+from src.infrastructure.repositories.job import JobRepository
+from src.infrastructure.services.job import JobService
+from src.infrastructure.repositories.stats import StatsRepository
+from src.infrastructure.services.stats import StatsService
+from src.infrastructure.repositories.branch import BranchRepository
+from src.infrastructure.services.branch import BranchService
+from src.infrastructure.repositories.copy import BookCopyRepository
+from src.infrastructure.services.copy import BookCopyService
 
 
 
@@ -29,6 +43,13 @@ class Container(DeclarativeContainer):
     category_repository = Singleton(CategoryRepository)
     borrowing_repository = Singleton(BorrowingRepository)
     recommendation_repository = Singleton(RecommendationRepository)
+    popularity_repository = Singleton(PopularityRepository)
+    reservation_repository = Singleton(ReservationRepository)
+    fine_repository = Singleton(FineRepository)
+    job_repository = Singleton(JobRepository)
+    stats_repository = Singleton(StatsRepository)
+    branch_repository = Singleton(BranchRepository)
+    copy_repository = Singleton(BookCopyRepository)
 
     # Services
     user_service = Factory(
@@ -55,3 +76,31 @@ class Container(DeclarativeContainer):
         RecommendationService,
         repository=recommendation_repository,
     )
+    popularity_service = Factory(
+        PopularityService,
+        repository=popularity_repository,
+    )
+    reservation_service = Factory(
+        ReservationService,
+        repository=reservation_repository,
+    )
+    fine_service = Factory(
+        FineService,
+        repository=fine_repository,
+    )
+    job_service = Factory(
+        JobService,
+        repository=job_repository,
+    )
+    stats_service = Factory(
+        StatsService,
+        repository=stats_repository,
+    )
+    branch_service = Factory(
+        BranchService,
+        repository=branch_repository,
+    )
+    copy_service = Factory(
+        BookCopyService,
+        repository=copy_repository,
+    )
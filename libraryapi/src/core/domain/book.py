@@ -1,11 +1,56 @@
-from pydantic import BaseModel, ConfigDict
+from typing import Annotated
+
+from pydantic import AfterValidator, BaseModel, ConfigDict, Field, model_validator
+
+
+def _isbn13_sum(digits: str) -> int:
+    """Returns the weighted digit sum of the ISBN-13 checksum."""
+    return sum(int(digit) * (3 if index % 2 else 1) for index, digit in enumerate(digits))
+
+
+def normalize_isbn(value: str) -> str:
+    """Normalizes an ISBN to its ISBN-13 form without separators.
+
+    ISBN-10 values are converted to ISBN-13, so both forms of a book's
+    number compare equal.
+
+    Args:
+        value (str): The ISBN-10 or ISBN-13, with or without hyphens and spaces.
+
+    Raises:
+        ValueError: If the value is not a valid ISBN.
+
+    Returns:
+        str: The 13 digits of the ISBN.
+    """
+    digits = value.replace("-", "").replace(" ", "").upper()
+
+    if len(digits) == 10 and digits[:9].isdigit() and (digits[9].isdigit() or digits[9] == "X"):
+        check = sum(
+            (10 - index) * (10 if digit == "X" else int(digit))
+            for index, digit in enumerate(digits)
+        )
+        if check % 11:
+            raise ValueError("Invalid ISBN-10 check digit.")
+        digits = "978" + digits[:9]
+        return digits + str(-_isbn13_sum(digits) % 10)
+
+    if len(digits) == 13 and digits.isdigit():
+        if _isbn13_sum(digits) % 10:
+            raise ValueError("Invalid ISBN-13 check digit.")
+        return digits
+
+    raise ValueError("ISBN must have 10 or 13 digits.")
+
+
+Isbn = Annotated[str, AfterValidator(normalize_isbn)]
 
 
 class BookIn(BaseModel):
     title: str
     author_id: int
     published_year: int
-    isbn: str
+    isbn: Isbn
     category_id: int
     copies_available: int
 
@@ -13,5 +58,67 @@ class BookIn(BaseModel):
 
 class Book(BookIn):
     id: int
+    isbn: str
+
+    model_config = ConfigDict(from_attributes=True, extra="ignore")
+
+class BookImportRow(BaseModel):
+    """A row of an imported catalog feed. Authors and categories are given
+    by name and created when missing."""
+
+    title: str = Field(min_length=1)
+    author_first_name: str = Field(min_length=1)
+    author_last_name: str = Field(min_length=1)
+    published_year: int
+    isbn: Isbn
+    category_name: str = Field(min_length=1)
+    copies_available: int = Field(0, ge=0)
+
+    model_config = ConfigDict(str_strip_whitespace=True, extra="ignore")
+
+
+class BookImportError(BaseModel):
+    line: int
+    message: str
+
+
+class BookImportResult(BaseModel):
+    rows: int = 0
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    rejected: int = 0
+    errors: list[BookImportError] = []
+
+
+class InventoryItem(BaseModel):
+    """A counted stock of a book, identified by its id or ISBN."""
+
+    book_id: int | None = None
+    isbn: Isbn | None = None
+    copies_available: int = Field(ge=0)
+
+    model_config = ConfigDict(str_strip_whitespace=True)
+
+    @model_validator(mode="after")
+    def check_identifier(self) -> "InventoryItem":
+        """Requires exactly one of the identifiers."""
+        if (self.book_id is None) == (self.isbn is None):
+            raise ValueError("Exactly one of book_id and isbn is required.")
+        return self
+
+
+class InventoryChange(BaseModel):
+    book_id: int
+    isbn: str | None
+    previous: int | None
+    copies_available: int
+
 
-    model_config = ConfigDict(from_attributes=True, extra="ignore")
\ No newline at end of file
+class InventoryResult(BaseModel):
+    items: int
+    updated: int
+    unchanged: int
+    not_found: list[int] = Field(default_factory=list)
+    copy_tracked: list[int] = Field(default_factory=list)
+    changes: list[InventoryChange] = Field(default_factory=list)
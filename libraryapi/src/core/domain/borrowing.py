@@ -1,5 +1,11 @@
+from enum import Enum
 from pydantic import BaseModel, ConfigDict, Field
-from datetime import date
+from datetime import date, datetime
+
+
+class BorrowingStatus(str, Enum):
+    BORROWED = "borrowed"
+    RETURNED = "returned"
 
 
 class BorrowingIn(BaseModel):
@@ -7,11 +13,64 @@ class BorrowingIn(BaseModel):
     book_id: int
     borrowed_date: date
     planned_return_date: date | None = None
-    return_date: date = Field(default=date(1900, 1, 1))
-    status: str = Field(default="borrowed")
+    return_date: date | None = None
+    branch_id: int | None = None
+    status: BorrowingStatus = Field(default=BorrowingStatus.BORROWED)
 
 
 class Borrowing(BorrowingIn):
     id: int
+    copy_id: int | None = None
+    updated_at: datetime | None = None
 
     model_config = ConfigDict(from_attributes=True, extra="forbid")
+
+
+class BorrowingReturn(BaseModel):
+    borrowing_id: int
+    return_date: date
+
+
+class LoanCounter(BaseModel):
+    user_id: int
+    active_loans: int
+    overdue_loans: int
+
+    model_config = ConfigDict(from_attributes=True, extra="ignore")
+
+
+class EligibilityRule(str, Enum):
+    USER_NOT_FOUND = "user_not_found"
+    BOOK_NOT_FOUND = "book_not_found"
+    BOOK_UNAVAILABLE = "book_unavailable"
+    ACTIVE_LOAN_LIMIT = "active_loan_limit"
+    OUTSTANDING_FINES = "outstanding_fines"
+    DUPLICATE_LOAN = "duplicate_loan"
+
+
+class BorrowingEligibility(BaseModel):
+    user_id: int
+    book_id: int
+    branch_id: int | None = None
+    eligible: bool
+    failed_rules: list[EligibilityRule]
+    active_borrowings: int
+    outstanding_fines: float
+    copies_available: int | None = None
+    copy_tracked: bool = False
+    reserved_for_user: bool
+
+    model_config = ConfigDict(from_attributes=True, extra="ignore")
+
+
+class BulkCheckoutResult(BaseModel):
+    user_id: int
+    book_id: int
+    branch_id: int | None = None
+    borrowing: Borrowing | None = None
+    failed_rules: list[EligibilityRule] = Field(default_factory=list)
+
+
+class BulkReturnResult(BaseModel):
+    borrowing_id: int
+    returned: bool
@@ -0,0 +1,30 @@
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class BranchIn(BaseModel):
+    name: str
+    address: str | None = None
+
+
+class Branch(BranchIn):
+    id: int
+
+    model_config = ConfigDict(from_attributes=True, extra="ignore")
+
+
+class BranchStockIn(BaseModel):
+    book_id: int
+    copies_available: int = Field(ge=0)
+
+
+class BranchStock(BranchStockIn):
+    branch_id: int
+
+    model_config = ConfigDict(from_attributes=True, extra="ignore")
+
+
+class BookAvailability(BaseModel):
+    book_id: int
+    copies_available: int
+    unassigned_copies: int
+    branches: list[BranchStock]
@@ -0,0 +1,43 @@
+from enum import Enum
+
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+from datetime import datetime
+
+
+class CopyStatus(str, Enum):
+    AVAILABLE = "available"
+    ON_LOAN = "on_loan"
+    HELD = "held"
+    WITHDRAWN = "withdrawn"
+
+
+class BookCopyIn(BaseModel):
+    book_id: int
+    barcode: str = Field(min_length=1)
+    branch_id: int | None = None
+
+    model_config = ConfigDict(str_strip_whitespace=True)
+
+
+class BookCopy(BookCopyIn):
+    id: int
+    status: CopyStatus
+    updated_at: datetime
+
+    model_config = ConfigDict(from_attributes=True, extra="ignore")
+
+
+class BookCopyUpdate(BaseModel):
+    """A change of the location or the shelf status of a copy. Copies on
+    loan or held for a reservation cannot be changed."""
+
+    branch_id: int | None = None
+    status: CopyStatus = CopyStatus.AVAILABLE
+
+    @field_validator("status")
+    @classmethod
+    def check_status(cls, status: CopyStatus) -> CopyStatus:
+        """Allows only the statuses set by staff."""
+        if status not in (CopyStatus.AVAILABLE, CopyStatus.WITHDRAWN):
+            raise ValueError("A copy can only be made available or withdrawn.")
+        return status
@@ -0,0 +1,21 @@
+from datetime import date
+
+from pydantic import BaseModel, ConfigDict
+
+
+class Fine(BaseModel):
+    id: int
+    borrowing_id: int
+    user_id: int
+    days_overdue: int
+    amount: float
+    assessed_on: date
+    paid: bool
+
+    model_config = ConfigDict(from_attributes=True, extra="ignore")
+
+
+class FineTotal(BaseModel):
+    user_id: int
+    total: float
+    count: int
@@ -0,0 +1,30 @@
+from datetime import datetime
+from enum import Enum
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class JobKind(str, Enum):
+    SIMILARITY_REBUILD = "similarity_rebuild"
+    FINE_ASSESSMENT = "fine_assessment"
+    ANALYTICS_EXPORT = "analytics_export"
+
+
+class JobIn(BaseModel):
+    kind: JobKind
+    payload: dict = Field(default_factory=dict)
+
+
+class Job(JobIn):
+    id: int
+    status: str
+    attempts: int
+    max_attempts: int
+    run_at: datetime
+    locked_until: datetime | None = None
+    last_error: str | None = None
+    result: dict | None = None
+    created_at: datetime
+    updated_at: datetime
+
+    model_config = ConfigDict(from_attributes=True, extra="ignore")
@@ -0,0 +1,9 @@
+from pydantic import BaseModel, ConfigDict
+
+
+class BookPopularity(BaseModel):
+    book_id: int
+    score: float
+    borrow_count: int
+
+    model_config = ConfigDict(from_attributes=True, extra="ignore")
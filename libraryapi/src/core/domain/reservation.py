@@ -0,0 +1,25 @@
+from datetime import datetime
+
+from pydantic import BaseModel, ConfigDict
+
+
+class ReservationIn(BaseModel):
+    user_id: int
+    book_id: int
+
+
+class Reservation(ReservationIn):
+    id: int
+    status: str
+    created_at: datetime
+    ready_at: datetime | None = None
+    branch_id: int | None = None
+    copy_id: int | None = None
+
+    model_config = ConfigDict(from_attributes=True, extra="ignore")
+
+
+class ReservationPosition(BaseModel):
+    reservation_id: int
+    book_id: int
+    position: int
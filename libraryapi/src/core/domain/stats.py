@@ -0,0 +1,24 @@
+from datetime import date
+
+from pydantic import BaseModel, ConfigDict
+
+
+class MonthlyCirculation(BaseModel):
+    month: date
+    id: int
+    name: str
+    checkouts: int
+    returns: int
+
+    model_config = ConfigDict(from_attributes=True, extra="ignore")
+
+
+class BookUtilization(BaseModel):
+    book_id: int
+    title: str
+    checkouts: int
+    loan_days: int
+    copies: int
+    utilization: float | None = None
+
+    model_config = ConfigDict(from_attributes=True, extra="ignore")
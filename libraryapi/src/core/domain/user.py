@@ -1,8 +1,25 @@
-from pydantic import BaseModel, ConfigDict
+from typing import Annotated
+
+from pydantic import AfterValidator, BaseModel, ConfigDict
+
+
+def normalize_email(value: str) -> str:
+    """Normalizes an email address for case-insensitive comparison.
+
+    Args:
+        value (str): The email address as entered.
+
+    Returns:
+        str: The address without surrounding whitespace, in lower case.
+    """
+    return value.strip().lower()
+
+
+Email = Annotated[str, AfterValidator(normalize_email)]
 
 
 class UserIn(BaseModel):
-    email: str
+    email: Email
     password: str
 
 
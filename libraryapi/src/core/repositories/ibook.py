@@ -1,8 +1,14 @@
 """A repository for book entity."""
 
 from abc import ABC, abstractmethod
-from typing import Any
-from src.core.domain.book import Book, BookIn
+from typing import Any, AsyncIterator
+from src.core.domain.book import (
+    Book,
+    BookIn,
+    BookImportResult,
+    InventoryItem,
+    InventoryResult,
+)
 
 
 class IBookRepository(ABC):
@@ -38,6 +44,17 @@ class IBookRepository(ABC):
             Book | None: The book object if found.
         """
 
+    @abstractmethod
+    async def get_book_by_isbn(self, isbn: str) -> Book | None:
+        """Fetches a book by its normalized ISBN.
+
+        Args:
+            isbn (str): The ISBN-13 of the book, without separators.
+
+        Returns:
+            Book | None: The book object if found.
+        """
+
     @abstractmethod
     async def search_book_by_title(self, title: str) -> Any:
         """Searches for books by title.
@@ -71,6 +88,49 @@ class IBookRepository(ABC):
             Any: A list of books belonging to the specified category.
         """
 
+    @abstractmethod
+    async def get_similar_books(self, book_id: int, limit: int) -> list[Book]:
+        """Fetches books similar to the given one.
+
+        Args:
+            book_id (int): id of the book.
+            limit (int): Maximal number of returned books.
+
+        Returns:
+            list[Book]: Similar books, most similar first.
+        """
+
+    @abstractmethod
+    async def rebuild_similarity_index(self, force: bool = False) -> None:
+        """Rebuilds the similar books model from all books."""
+
+    @abstractmethod
+    async def import_books(
+        self,
+        records: AsyncIterator[tuple[int, dict | str]],
+    ) -> BookImportResult:
+        """Imports a catalog feed, upserting books by ISBN.
+
+        Args:
+            records (AsyncIterator[tuple[int, dict | str]]): Line numbers
+                with parsed records or parsing errors.
+
+        Returns:
+            BookImportResult: Counts of processed rows and rejected rows.
+        """
+
+    @abstractmethod
+    async def update_inventory(self, items: list[InventoryItem]) -> InventoryResult:
+        """Sets available copies of many books at once.
+
+        Args:
+            items (list[InventoryItem]): The counted stock of books.
+
+        Returns:
+            InventoryResult: The previous and new stock of changed books, the
+                positions of items matching no book and of skipped items.
+        """
+
     @abstractmethod
     async def update_book(self, book_id: int, book_data: dict) -> Book | None:
         """Updates an existing book.
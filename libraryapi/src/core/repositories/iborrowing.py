@@ -3,7 +3,15 @@
 from abc import ABC, abstractmethod
 from typing import Any, List
 from datetime import date
-from src.core.domain.borrowing import Borrowing, BorrowingIn
+from src.core.domain.borrowing import (
+    Borrowing,
+    BorrowingEligibility,
+    BorrowingIn,
+    BorrowingReturn,
+    BulkCheckoutResult,
+    BulkReturnResult,
+    LoanCounter,
+)
 
 
 class IBorrowingRepository(ABC):
@@ -11,13 +19,13 @@ class IBorrowingRepository(ABC):
 
     @abstractmethod
     async def create_borrowing(self, borrowing: BorrowingIn) -> Any:
-        """Creates a new borrowing record.
+        """Checks out a book and creates a new borrowing record.
 
         Args:
             borrowing (Borrowing): The borrowing data.
 
         Returns:
-            Any: The created borrowing record.
+            Any: The created borrowing record, None if no copy is available.
         """
 
     @abstractmethod
@@ -31,6 +39,35 @@ class IBorrowingRepository(ABC):
             Borrowing | None: The borrowing record if found, otherwise None.
         """
 
+    @abstractmethod
+    async def check_eligibility(
+        self,
+        user_id: int,
+        book_id: int,
+        branch_id: int | None = None,
+    ) -> BorrowingEligibility | None:
+        """Evaluates the checkout rules for a user and a book.
+
+        Args:
+            user_id (int): The user's id.
+            book_id (int): The book's id.
+            branch_id (int | None): The checkout branch's id, if any.
+
+        Returns:
+            BorrowingEligibility | None: The evaluated rules if the user exists.
+        """
+
+    @abstractmethod
+    async def create_borrowings(self, items: list[BorrowingIn]) -> list[BulkCheckoutResult]:
+        """Checks out a batch of books in a single transaction.
+
+        Args:
+            items (list[BorrowingIn]): The borrowings to create.
+
+        Returns:
+            list[BulkCheckoutResult]: The result of every item.
+        """
+
     @abstractmethod
     async def get_active_borrowings_by_user(self, user_id: int) -> list[Borrowing]:
         """Fetches active borrowings for a user.
@@ -43,16 +80,46 @@ class IBorrowingRepository(ABC):
         """
 
     @abstractmethod
-    async def list_all_borrowings(self) -> List[Borrowing]:
+    async def get_loan_counter(self, user_id: int) -> LoanCounter | None:
+        """Fetches the active and overdue loan counts of a user.
+
+        Args:
+            user_id (int): The user's id.
+
+        Returns:
+            LoanCounter | None: The loan counts if the user exists.
+        """
+
+    @abstractmethod
+    async def reconcile_loan_counters(self, today: date | None = None) -> int:
+        """Recounts loans of all users and repairs drifted counters.
+
+        Args:
+            today (date | None): The reference date. Defaults to today.
+
+        Returns:
+            int: The number of repaired counters.
+        """
+
+    @abstractmethod
+    async def list_all_borrowings(
+        self,
+        since: date | None = None,
+        until: date | None = None,
+    ) -> List[Borrowing]:
         """Lists all borrowing records.
 
+        Args:
+            since (date | None): The earliest borrowed date, if any.
+            until (date | None): The latest borrowed date, if any.
+
         Returns:
             List[Borrowing]: A list of all borrowings.
         """
 
     @abstractmethod
     async def mark_borrowing_as_returned(self, borrowing_id: int, return_date: date) -> bool:
-        """Marks a borrowing as returned.
+        """Marks a borrowing as returned and releases its copy.
 
         Args:
             borrowing_id (int): The borrowing's id.
@@ -63,16 +130,48 @@ class IBorrowingRepository(ABC):
         """
 
     @abstractmethod
-    async def get_borrowing_history_by_user(self, user_id: int) -> List[Borrowing]:
+    async def mark_borrowings_as_returned(
+        self,
+        items: list[BorrowingReturn],
+    ) -> list[BulkReturnResult]:
+        """Marks a batch of borrowings as returned and releases their copies.
+
+        Args:
+            items (list[BorrowingReturn]): The borrowings and their return dates.
+
+        Returns:
+            list[BulkReturnResult]: The result of every item.
+        """
+
+    @abstractmethod
+    async def get_borrowing_history_by_user(
+        self,
+        user_id: int,
+        since: date | None = None,
+        until: date | None = None,
+    ) -> List[Borrowing]:
         """Fetches borrowing history for a user.
 
         Args:
             user_id (int): The user's id.
+            since (date | None): The earliest borrowed date, if any.
+            until (date | None): The latest borrowed date, if any.
 
         Returns:
             List[Borrowing]: A list of past borrowings for the user.
         """
 
+    @abstractmethod
+    async def archive_returned_borrowings(self, today: date | None = None) -> int:
+        """Moves long returned borrowings to the archive.
+
+        Args:
+            today (date | None): The reference date. Defaults to today.
+
+        Returns:
+            int: The number of archived borrowings.
+        """
+
     @abstractmethod
     async def delete_borrowing(self, borrowing_id: int) -> bool:
         """Deletes a borrowing record by its id.
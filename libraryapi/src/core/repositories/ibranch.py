@@ -0,0 +1,84 @@
+"""A repository for branch entity."""
+
+from abc import ABC, abstractmethod
+
+from src.core.domain.branch import (
+    BookAvailability,
+    Branch,
+    BranchIn,
+    BranchStock,
+    BranchStockIn,
+)
+
+
+class IBranchRepository(ABC):
+    """An abstract repository class for branch."""
+
+    @abstractmethod
+    async def add_branch(self, data: BranchIn) -> Branch | None:
+        """Adds a new branch together with its stock partition.
+
+        Args:
+            data (BranchIn): The branch input data.
+
+        Returns:
+            Branch | None: The created branch, None if the name is taken.
+        """
+
+    @abstractmethod
+    async def get_branch_by_id(self, branch_id: int) -> Branch | None:
+        """Fetches a branch by its id.
+
+        Args:
+            branch_id (int): The id of the branch.
+
+        Returns:
+            Branch | None: The branch if found.
+        """
+
+    @abstractmethod
+    async def list_branches(self) -> list[Branch]:
+        """Lists all branches.
+
+        Returns:
+            list[Branch]: A list of all branches.
+        """
+
+    @abstractmethod
+    async def set_branch_stock(
+        self,
+        branch_id: int,
+        items: list[BranchStockIn],
+    ) -> list[BranchStock] | None:
+        """Sets the copies of books on the shelves of a branch.
+
+        Args:
+            branch_id (int): The id of the branch.
+            items (list[BranchStockIn]): The copies per book.
+
+        Returns:
+            list[BranchStock] | None: The stored stock of existing books,
+                None if the branch does not exist.
+        """
+
+    @abstractmethod
+    async def get_branch_stock(self, branch_id: int) -> list[BranchStock]:
+        """Lists the stock of a branch.
+
+        Args:
+            branch_id (int): The id of the branch.
+
+        Returns:
+            list[BranchStock]: The copies per book of the branch.
+        """
+
+    @abstractmethod
+    async def get_book_availability(self, book_id: int) -> BookAvailability | None:
+        """Fetches the available copies of a book across branches.
+
+        Args:
+            book_id (int): The id of the book.
+
+        Returns:
+            BookAvailability | None: The availability if the book exists.
+        """
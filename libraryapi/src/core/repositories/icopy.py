@@ -0,0 +1,62 @@
+"""A repository for book copy entity."""
+
+from abc import ABC, abstractmethod
+
+from src.core.domain.copy import BookCopy, BookCopyIn, BookCopyUpdate
+
+
+class IBookCopyRepository(ABC):
+    """An abstract repository class for book copy."""
+
+    @abstractmethod
+    async def add_copies(self, items: list[BookCopyIn]) -> list[BookCopy]:
+        """Registers physical copies of books.
+
+        Args:
+            items (list[BookCopyIn]): The copies to register.
+
+        Returns:
+            list[BookCopy]: The registered copies.
+        """
+
+    @abstractmethod
+    async def get_copy_by_barcode(self, barcode: str) -> BookCopy | None:
+        """Fetches a copy by its barcode.
+
+        Args:
+            barcode (str): The barcode of the copy.
+
+        Returns:
+            BookCopy | None: The copy if found.
+        """
+
+    @abstractmethod
+    async def get_copies_by_book(self, book_id: int) -> list[BookCopy]:
+        """Lists the copies of a book.
+
+        Args:
+            book_id (int): The id of the book.
+
+        Returns:
+            list[BookCopy]: The copies of the book.
+        """
+
+    @abstractmethod
+    async def update_copy(self, copy_id: int, data: BookCopyUpdate) -> BookCopy | None:
+        """Moves or withdraws a copy on the shelf.
+
+        Args:
+            copy_id (int): The id of the copy.
+            data (BookCopyUpdate): The new location and status.
+
+        Returns:
+            BookCopy | None: The updated copy if it was on the shelf.
+        """
+
+    @abstractmethod
+    async def refresh_copy_availability(self) -> int:
+        """Refreshes the cached copy counts of books with copies.
+
+        Returns:
+            int: The number of changed counts.
+        """
@@ -0,0 +1,63 @@
+"""A repository for job entity."""
+
+from abc import ABC, abstractmethod
+
+from src.core.domain.job import Job, JobIn
+
+
+class IJobRepository(ABC):
+    """An abstract repository class for job."""
+
+    @abstractmethod
+    async def enqueue_job(self, job: JobIn) -> Job:
+        """Adds a new job to the queue.
+
+        Args:
+            job (JobIn): The job input data.
+
+        Returns:
+            Job: The queued job.
+        """
+
+    @abstractmethod
+    async def get_job_by_id(self, job_id: int) -> Job | None:
+        """Fetches a job by its id.
+
+        Args:
+            job_id (int): id of the job.
+
+        Returns:
+            Job | None: The job if found.
+        """
+
+    @abstractmethod
+    async def dequeue_job(self) -> Job | None:
+        """Takes the next due job from the queue.
+
+        Returns:
+            Job | None: The taken job, None if the queue is empty.
+        """
+
+    @abstractmethod
+    async def complete_job(self, job: Job, result: dict | None) -> bool:
+        """Marks a taken job as succeeded.
+
+        Args:
+            job (Job): The job returned by `dequeue_job`.
+            result (dict | None): The result of the job.
+
+        Returns:
+            bool: False if the job has meanwhile been taken by another worker.
+        """
+
+    @abstractmethod
+    async def fail_job(self, job: Job, error: str) -> bool:
+        """Schedules a retry of a failed job or marks it as failed.
+
+        Args:
+            job (Job): The job returned by `dequeue_job`.
+            error (str): The description of the error.
+
+        Returns:
+            bool: False if the job has meanwhile been taken by another worker.
+        """
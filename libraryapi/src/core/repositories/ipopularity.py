@@ -0,0 +1,39 @@
+"""A repository for book popularity."""
+
+from abc import ABC, abstractmethod
+
+from src.core.domain.popularity import BookPopularity
+
+
+class IPopularityRepository(ABC):
+    """An abstract repository class for book popularity."""
+
+    @abstractmethod
+    async def get_trending_books(self, limit: int) -> list[BookPopularity]:
+        """Fetches the currently most popular books.
+
+        Args:
+            limit (int): Maximal number of returned books.
+
+        Returns:
+            list[BookPopularity]: Popularity of books, most popular first.
+        """
+
+    @abstractmethod
+    async def get_book_popularity(self, book_id: int) -> BookPopularity:
+        """Fetches the popularity of a single book.
+
+        Args:
+            book_id (int): id of the book.
+
+        Returns:
+            BookPopularity: The popularity of the book.
+        """
+
+    @abstractmethod
+    async def flush_popularity(self) -> int:
+        """Flushes pending counters and reloads the shared state.
+
+        Returns:
+            int: Number of books whose counters were flushed.
+        """
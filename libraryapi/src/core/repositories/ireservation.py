@@ -0,0 +1,81 @@
+"""A repository for reservation entity."""
+
+from abc import ABC, abstractmethod
+
+from src.core.domain.reservation import (
+    Reservation,
+    ReservationIn,
+    ReservationPosition,
+)
+
+
+class IReservationRepository(ABC):
+    """An abstract repository class for reservation."""
+
+    @abstractmethod
+    async def create_reservation(self, reservation: ReservationIn) -> Reservation | None:
+        """Queues a user for an unavailable book.
+
+        Args:
+            reservation (ReservationIn): The reservation input data.
+
+        Returns:
+            Reservation | None: The created reservation, None if the book is
+                available or the user already holds a reservation for it.
+        """
+
+    @abstractmethod
+    async def get_reservation_by_id(self, reservation_id: int) -> Reservation | None:
+        """Fetches a reservation by its id.
+
+        Args:
+            reservation_id (int): id of the reservation.
+
+        Returns:
+            Reservation | None: The reservation if found.
+        """
+
+    @abstractmethod
+    async def get_queue_position(self, reservation_id: int) -> ReservationPosition | None:
+        """Fetches the position of a waiting reservation in its book queue.
+
+        The position is counted, not stored, so a lookup costs O(log n + p)
+        for n waiting reservations and position p.
+
+        Args:
+            reservation_id (int): id of the reservation.
+
+        Returns:
+            ReservationPosition | None: The position, None if the reservation
+                is not waiting.
+        """
+
+    @abstractmethod
+    async def get_reservations_by_user(self, user_id: int) -> list[Reservation]:
+        """Fetches open reservations of a user.
+
+        Args:
+            user_id (int): id of the user.
+
+        Returns:
+            list[Reservation]: Waiting and ready reservations of the user.
+        """
+
+    @abstractmethod
+    async def cancel_reservation(self, reservation_id: int) -> bool:
+        """Cancels an open reservation.
+
+        Args:
+            reservation_id (int): id of the reservation.
+
+        Returns:
+            bool: True if the reservation was cancelled, False otherwise.
+        """
+
+    @abstractmethod
+    async def expire_ready_reservations(self) -> int:
+        """Expires ready reservations which were not picked up in time.
+
+        Returns:
+            int: Number of expired reservations.
+        """
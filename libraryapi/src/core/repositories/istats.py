@@ -0,0 +1,71 @@
+"""A repository for circulation statistics."""
+
+from abc import ABC, abstractmethod
+from datetime import date
+
+from src.core.domain.stats import BookUtilization, MonthlyCirculation
+
+
+class IStatsRepository(ABC):
+    """An abstract repository class for circulation statistics."""
+
+    @abstractmethod
+    async def refresh_circulation(self, today: date | None = None) -> int:
+        """Refreshes the daily circulation rollup.
+
+        Args:
+            today (date | None): The last day to refresh. Defaults to today.
+
+        Returns:
+            int: Number of refreshed days.
+        """
+
+    @abstractmethod
+    async def get_category_circulation(
+        self,
+        since: date | None = None,
+        until: date | None = None,
+    ) -> list[MonthlyCirculation]:
+        """Fetches monthly circulation of categories.
+
+        Args:
+            since (date | None): The first day of the range, if any.
+            until (date | None): The last day of the range, if any.
+
+        Returns:
+            list[MonthlyCirculation]: Circulation per month and category.
+        """
+
+    @abstractmethod
+    async def get_author_circulation(
+        self,
+        since: date | None = None,
+        until: date | None = None,
+    ) -> list[MonthlyCirculation]:
+        """Fetches monthly circulation of authors.
+
+        Args:
+            since (date | None): The first day of the range, if any.
+            until (date | None): The last day of the range, if any.
+
+        Returns:
+            list[MonthlyCirculation]: Circulation per month and author.
+        """
+
+    @abstractmethod
+    async def get_book_utilization(
+        self,
+        limit: int,
+        since: date | None = None,
+        until: date | None = None,
+    ) -> list[BookUtilization]:
+        """Fetches the most utilized titles.
+
+        Args:
+            limit (int): Maximal number of returned titles.
+            since (date | None): The first day of the range, if any.
+            until (date | None): The last day of the range, if any.
+
+        Returns:
+            list[BookUtilization]: Utilization of titles, most utilized first.
+        """
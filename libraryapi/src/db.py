@@ -1,17 +1,26 @@
 """A module providing database access."""
 
 import asyncio
+import itertools
+from contextvars import ContextVar
+from typing import Any, AsyncGenerator, Awaitable, Callable, TypeVar
 
+import asyncpg
 import databases
 import sqlalchemy
-from sqlalchemy.exc import OperationalError, DatabaseError
-from sqlalchemy.ext.asyncio import create_async_engine
+from databases.backends.postgres import PostgresBackend, PostgresConnection
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.dialects.postgresql.named_types import CreateEnumType
 from sqlalchemy.ext.mutable import MutableList
 from asyncpg.exceptions import (
     CannotConnectNowError,
     ConnectionDoesNotExistError,
+    UniqueViolationError,
 )
 from src.config import config
+from src.core.domain.book import normalize_isbn
+from src.core.domain.borrowing import BorrowingStatus
+from src.core.domain.copy import CopyStatus
 
 
 metadata = sqlalchemy.MetaData()
@@ -25,10 +34,17 @@ user_table = sqlalchemy.Table(
         sqlalchemy.Integer,
         primary_key=True,
     ),
-    sqlalchemy.Column("email", sqlalchemy.String, unique=True, nullable=False),
+    sqlalchemy.Column("email", sqlalchemy.String, nullable=False),
     sqlalchemy.Column("password", sqlalchemy.String, nullable=False),
 )
 
+# Emails are unique regardless of case; lookups by email use this index.
+sqlalchemy.Index(
+    "uq_users_email_lower",
+    sqlalchemy.func.lower(user_table.c.email),
+    unique=True,
+)
+
 
 # Books table
 book_table = sqlalchemy.Table(
@@ -53,6 +69,13 @@ book_table = sqlalchemy.Table(
         sqlalchemy.ForeignKey("categories.id", ondelete="CASCADE"),
         nullable=False,
     ),
+    # Catalog imports upsert books by ISBN.
+    sqlalchemy.Index(
+        "uq_books_isbn",
+        "isbn",
+        unique=True,
+        postgresql_where=sqlalchemy.text("isbn IS NOT NULL"),
+    ),
 )
 
 
@@ -84,7 +107,106 @@ category_table = sqlalchemy.Table(
 )
 
 
-# Borrowings table
+# Library branches
+branch_table = sqlalchemy.Table(
+    "branches",
+    metadata,
+    sqlalchemy.Column(
+        "id",
+        sqlalchemy.Integer,
+        primary_key=True,
+    ),
+    sqlalchemy.Column("name", sqlalchemy.String, nullable=False, unique=True),
+    sqlalchemy.Column("address", sqlalchemy.String, nullable=True),
+)
+
+
+# Copies of books on the shelves of branches, list-partitioned by branch.
+# Every branch gets its own partition when created, so checkouts of one
+# title at different branches update rows of different tables.
+# `books.copies_available` keeps the copies not assigned to any branch.
+book_stock_table = sqlalchemy.Table(
+    "book_stock",
+    metadata,
+    sqlalchemy.Column(
+        "branch_id",
+        sqlalchemy.ForeignKey("branches.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    sqlalchemy.Column(
+        "book_id",
+        sqlalchemy.ForeignKey("books.id", ondelete="CASCADE"),
+        primary_key=True,
+        index=True,
+    ),
+    sqlalchemy.Column("copies_available", sqlalchemy.Integer, nullable=False),
+    sqlalchemy.CheckConstraint("copies_available >= 0", name="ck_book_stock_copies"),
+    postgresql_partition_by="LIST (branch_id)",
+)
+
+sqlalchemy.event.listen(
+    book_stock_table,
+    "after_create",
+    sqlalchemy.DDL(
+        "CREATE TABLE IF NOT EXISTS book_stock_default "
+        "PARTITION OF book_stock DEFAULT"
+    ),
+)
+
+
+# Physical copies of books. Once a book has copies, checkouts claim one
+# of them and the copy counts of the book and of `book_stock` are only a
+# cache derived from this table.
+book_copy_table = sqlalchemy.Table(
+    "book_copies",
+    metadata,
+    sqlalchemy.Column(
+        "id",
+        sqlalchemy.Integer,
+        primary_key=True,
+    ),
+    sqlalchemy.Column(
+        "book_id",
+        sqlalchemy.ForeignKey("books.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    ),
+    # The branch the copy belongs to, None for copies of no branch.
+    sqlalchemy.Column(
+        "branch_id",
+        sqlalchemy.ForeignKey("branches.id", ondelete="SET NULL"),
+        nullable=True,
+    ),
+    sqlalchemy.Column("barcode", sqlalchemy.String, nullable=False, unique=True),
+    sqlalchemy.Column(
+        "status",
+        sqlalchemy.Enum(
+            CopyStatus,
+            name="copy_status",
+            values_callable=lambda statuses: [status.value for status in statuses],
+        ),
+        nullable=False,
+        server_default=CopyStatus.AVAILABLE.value,
+    ),
+    sqlalchemy.Column(
+        "updated_at",
+        sqlalchemy.DateTime(timezone=True),
+        nullable=False,
+        server_default=sqlalchemy.func.now(),
+    ),
+    # Free copies of a title at a location, claimed by checkouts.
+    sqlalchemy.Index(
+        "ix_book_copies_available",
+        "book_id",
+        "branch_id",
+        "id",
+        postgresql_where=sqlalchemy.text("status = 'available'"),
+    ),
+)
+
+
+# Borrowings table, range-partitioned by month of `borrowed_date`.
+# The partition key has to be a part of the primary key.
 borrowing_table = sqlalchemy.Table(
     "borrowings",
     metadata,
@@ -92,48 +214,1030 @@ borrowing_table = sqlalchemy.Table(
         "id",
         sqlalchemy.Integer,
         primary_key=True,
+        autoincrement=True,
     ),
     sqlalchemy.Column(
         "user_id",
         sqlalchemy.ForeignKey("users.id", ondelete="CASCADE"),
         nullable=False,
+        index=True,
     ),
     sqlalchemy.Column(
         "book_id",
         sqlalchemy.ForeignKey("books.id", ondelete="CASCADE"),
         nullable=False,
+        index=True,
     ),
-    sqlalchemy.Column("borrowed_date", sqlalchemy.Date, nullable=False),
+    sqlalchemy.Column("borrowed_date", sqlalchemy.Date, primary_key=True),
     sqlalchemy.Column("planned_return_date", sqlalchemy.Date, nullable=True),
     sqlalchemy.Column("return_date", sqlalchemy.Date, nullable=True),
+    # The branch the copy was taken from, None for copies of `books`.
+    sqlalchemy.Column(
+        "branch_id",
+        sqlalchemy.ForeignKey("branches.id", ondelete="SET NULL"),
+        nullable=True,
+    ),
+    # The lent copy, None for books without copy rows.
+    sqlalchemy.Column(
+        "copy_id",
+        sqlalchemy.ForeignKey("book_copies.id", ondelete="SET NULL"),
+        nullable=True,
+    ),
     sqlalchemy.Column(
         "status",
-        sqlalchemy.String,
+        sqlalchemy.Enum(
+            BorrowingStatus,
+            name="borrowing_status",
+            values_callable=lambda statuses: [status.value for status in statuses],
+        ),
+        nullable=False,
+        server_default=BorrowingStatus.BORROWED.value,
+    ),
+    sqlalchemy.Column(
+        "updated_at",
+        sqlalchemy.DateTime(timezone=True),
         nullable=False,
-        default="borrowed",
+        server_default=sqlalchemy.func.now(),
+        index=True,
     ),
+    # Active loans are a small subset of all borrowings, so lookups of
+    # active loans and of overdue ones use indexes covering only them.
+    sqlalchemy.Index(
+        "ix_borrowings_active_user",
+        "user_id",
+        postgresql_where=sqlalchemy.text("status = 'borrowed'"),
+    ),
+    sqlalchemy.Index(
+        "ix_borrowings_active_due",
+        "planned_return_date",
+        postgresql_where=sqlalchemy.text("status = 'borrowed'"),
+    ),
+    postgresql_partition_by="RANGE (borrowed_date)",
 )
 
+sqlalchemy.event.listen(
+    borrowing_table,
+    "after_create",
+    sqlalchemy.DDL(
+        "CREATE TABLE IF NOT EXISTS borrowings_default "
+        "PARTITION OF borrowings DEFAULT"
+    ),
+)
 
 
-db_uri = (
-    f"postgresql+asyncpg://{config.DB_USER}:{config.DB_PASSWORD}"
-    f"@{config.DB_HOST}/{config.DB_NAME}"
+# Cold archive of returned borrowings. Archived rows are never updated,
+# so the table keeps no status column and only the index used by
+# user history lookups.
+borrowing_archive_table = sqlalchemy.Table(
+    "borrowings_archive",
+    metadata,
+    sqlalchemy.Column("id", sqlalchemy.Integer, primary_key=True, autoincrement=False),
+    sqlalchemy.Column(
+        "user_id",
+        sqlalchemy.ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+    ),
+    sqlalchemy.Column(
+        "book_id",
+        sqlalchemy.ForeignKey("books.id", ondelete="CASCADE"),
+        nullable=False,
+    ),
+    sqlalchemy.Column("borrowed_date", sqlalchemy.Date, nullable=False),
+    sqlalchemy.Column("planned_return_date", sqlalchemy.Date, nullable=True),
+    sqlalchemy.Column("return_date", sqlalchemy.Date, nullable=False),
+    sqlalchemy.Column(
+        "branch_id",
+        sqlalchemy.ForeignKey("branches.id", ondelete="SET NULL"),
+        nullable=True,
+    ),
+    sqlalchemy.Column(
+        "copy_id",
+        sqlalchemy.ForeignKey("book_copies.id", ondelete="SET NULL"),
+        nullable=True,
+    ),
+    sqlalchemy.Index(
+        "ix_borrowings_archive_user_borrowed",
+        "user_id",
+        "borrowed_date",
+    ),
 )
 
-engine = create_async_engine(
-    db_uri,
-    echo=True,
-    future=True,
-    pool_pre_ping=True,
+
+# Per-user counters of active and overdue loans. Active loans are kept
+# exact by a trigger on borrowings; overdue loans grow as time passes,
+# so they are refreshed by the reconciliation job.
+user_loan_counter_table = sqlalchemy.Table(
+    "user_loan_counters",
+    metadata,
+    sqlalchemy.Column(
+        "user_id",
+        sqlalchemy.ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    sqlalchemy.Column("active_loans", sqlalchemy.Integer, nullable=False, server_default="0"),
+    sqlalchemy.Column("overdue_loans", sqlalchemy.Integer, nullable=False, server_default="0"),
+    sqlalchemy.Column(
+        "updated_at",
+        sqlalchemy.DateTime(timezone=True),
+        nullable=False,
+        server_default=sqlalchemy.func.now(),
+    ),
+)
+
+# Created after all tables, as it needs both borrowings and the counters.
+# The trigger is cloned to every partition of borrowings, also the ones
+# attached later.
+sqlalchemy.event.listen(
+    metadata,
+    "after_create",
+    sqlalchemy.DDL("""
+        CREATE OR REPLACE FUNCTION track_user_loans() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.status = 'borrowed' THEN
+                UPDATE user_loan_counters
+                SET active_loans = active_loans - 1,
+                    overdue_loans = CASE
+                        WHEN OLD.planned_return_date < current_date
+                        THEN greatest(overdue_loans - 1, 0)
+                        ELSE overdue_loans
+                    END,
+                    updated_at = now()
+                WHERE user_id = OLD.user_id;
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.status = 'borrowed' THEN
+                INSERT INTO user_loan_counters (user_id, active_loans, overdue_loans)
+                VALUES (NEW.user_id, 1, 0)
+                ON CONFLICT (user_id) DO UPDATE
+                SET active_loans = user_loan_counters.active_loans + 1,
+                    updated_at = now();
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """),
+)
+sqlalchemy.event.listen(
+    metadata,
+    "after_create",
+    sqlalchemy.DDL("""
+        CREATE OR REPLACE FUNCTION touch_updated_at() RETURNS trigger AS $$
+        BEGIN
+            NEW.updated_at = now();
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+    """),
+)
+# Keeps `updated_at` of borrowings current for incremental exports.
+sqlalchemy.event.listen(
+    metadata,
+    "after_create",
+    sqlalchemy.DDL("""
+        CREATE OR REPLACE TRIGGER borrowings_touch_updated_at
+        BEFORE UPDATE ON borrowings
+        FOR EACH ROW EXECUTE FUNCTION touch_updated_at()
+    """),
+)
+sqlalchemy.event.listen(
+    metadata,
+    "after_create",
+    sqlalchemy.DDL("""
+        CREATE OR REPLACE TRIGGER borrowings_user_loans
+        AFTER INSERT OR DELETE OR UPDATE OF status, user_id ON borrowings
+        FOR EACH ROW EXECUTE FUNCTION track_user_loans()
+    """),
+)
+
+
+# Book popularity table
+book_popularity_table = sqlalchemy.Table(
+    "book_popularity",
+    metadata,
+    sqlalchemy.Column(
+        "book_id",
+        sqlalchemy.ForeignKey("books.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    sqlalchemy.Column("score", sqlalchemy.Float, nullable=False, server_default="0"),
+    sqlalchemy.Column("borrow_count", sqlalchemy.Integer, nullable=False, server_default="0"),
+    sqlalchemy.Column(
+        "updated_at",
+        sqlalchemy.DateTime(timezone=True),
+        nullable=False,
+        server_default=sqlalchemy.func.now(),
+    ),
 )
 
-database = databases.Database(
+# Reservations table
+reservation_table = sqlalchemy.Table(
+    "reservations",
+    metadata,
+    sqlalchemy.Column(
+        "id",
+        sqlalchemy.Integer,
+        primary_key=True,
+    ),
+    sqlalchemy.Column(
+        "user_id",
+        sqlalchemy.ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    ),
+    sqlalchemy.Column(
+        "book_id",
+        sqlalchemy.ForeignKey("books.id", ondelete="CASCADE"),
+        nullable=False,
+    ),
+    sqlalchemy.Column("status", sqlalchemy.String, nullable=False, server_default="waiting"),
+    sqlalchemy.Column(
+        "created_at",
+        sqlalchemy.DateTime(timezone=True),
+        nullable=False,
+        server_default=sqlalchemy.func.now(),
+    ),
+    sqlalchemy.Column("ready_at", sqlalchemy.DateTime(timezone=True), nullable=True),
+    # The branch and the copy held for a ready reservation, None for
+    # copies of `books` and books without copy rows.
+    sqlalchemy.Column(
+        "branch_id",
+        sqlalchemy.ForeignKey("branches.id", ondelete="SET NULL"),
+        nullable=True,
+    ),
+    sqlalchemy.Column(
+        "copy_id",
+        sqlalchemy.ForeignKey("book_copies.id", ondelete="SET NULL"),
+        nullable=True,
+    ),
+    sqlalchemy.Index(
+        "ix_reservations_waiting_queue",
+        "book_id",
+        "id",
+        postgresql_where=sqlalchemy.text("status = 'waiting'"),
+    ),
+    sqlalchemy.Index(
+        "uq_reservations_open_user_book",
+        "user_id",
+        "book_id",
+        unique=True,
+        postgresql_where=sqlalchemy.text("status IN ('waiting', 'ready')"),
+    ),
+)
+
+# Fines table
+fine_table = sqlalchemy.Table(
+    "fines",
+    metadata,
+    sqlalchemy.Column(
+        "id",
+        sqlalchemy.Integer,
+        primary_key=True,
+    ),
+    # No foreign key: the partitioned borrowings table has no unique
+    # constraint on `id` alone.
+    sqlalchemy.Column("borrowing_id", sqlalchemy.Integer, nullable=False, unique=True),
+    sqlalchemy.Column(
+        "user_id",
+        sqlalchemy.ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    ),
+    sqlalchemy.Column("days_overdue", sqlalchemy.Integer, nullable=False),
+    sqlalchemy.Column("amount", sqlalchemy.Numeric(10, 2), nullable=False),
+    sqlalchemy.Column("assessed_on", sqlalchemy.Date, nullable=False),
+    sqlalchemy.Column("paid", sqlalchemy.Boolean, nullable=False, server_default=sqlalchemy.false()),
+    sqlalchemy.Column("paid_at", sqlalchemy.DateTime(timezone=True), nullable=True),
+    sqlalchemy.Index(
+        "ix_fines_unpaid_user",
+        "user_id",
+        postgresql_include=["amount"],
+        postgresql_where=sqlalchemy.text("NOT paid"),
+    ),
+)
+
+# Scheduler runs table
+scheduler_run_table = sqlalchemy.Table(
+    "scheduler_runs",
+    metadata,
+    sqlalchemy.Column("name", sqlalchemy.String, primary_key=True),
+    sqlalchemy.Column("last_slot", sqlalchemy.DateTime(timezone=True), nullable=False),
+    sqlalchemy.Column("last_duration", sqlalchemy.Float, nullable=True),
+    sqlalchemy.Column("last_error", sqlalchemy.String, nullable=True),
+)
+
+# Jobs table
+job_table = sqlalchemy.Table(
+    "jobs",
+    metadata,
+    sqlalchemy.Column(
+        "id",
+        sqlalchemy.Integer,
+        primary_key=True,
+    ),
+    sqlalchemy.Column("kind", sqlalchemy.String, nullable=False),
+    sqlalchemy.Column("payload", JSONB, nullable=False, server_default="{}"),
+    sqlalchemy.Column("status", sqlalchemy.String, nullable=False, server_default="queued"),
+    sqlalchemy.Column("attempts", sqlalchemy.Integer, nullable=False, server_default="0"),
+    sqlalchemy.Column("max_attempts", sqlalchemy.Integer, nullable=False),
+    sqlalchemy.Column(
+        "run_at",
+        sqlalchemy.DateTime(timezone=True),
+        nullable=False,
+        server_default=sqlalchemy.func.now(),
+    ),
+    sqlalchemy.Column("locked_until", sqlalchemy.DateTime(timezone=True), nullable=True),
+    sqlalchemy.Column("last_error", sqlalchemy.String, nullable=True),
+    sqlalchemy.Column("result", JSONB, nullable=True),
+    sqlalchemy.Column(
+        "created_at",
+        sqlalchemy.DateTime(timezone=True),
+        nullable=False,
+        server_default=sqlalchemy.func.now(),
+    ),
+    sqlalchemy.Column(
+        "updated_at",
+        sqlalchemy.DateTime(timezone=True),
+        nullable=False,
+        server_default=sqlalchemy.func.now(),
+    ),
+    sqlalchemy.Index(
+        "ix_jobs_pending_run_at",
+        "run_at",
+        postgresql_where=sqlalchemy.text("status IN ('queued', 'running')"),
+    ),
+)
+
+
+# Daily circulation rollup, one row per book and day. Author and category
+# are copied in, so statistics never have to join the history.
+daily_circulation_table = sqlalchemy.Table(
+    "daily_circulation",
+    metadata,
+    sqlalchemy.Column("day", sqlalchemy.Date, primary_key=True),
+    sqlalchemy.Column("book_id", sqlalchemy.Integer, primary_key=True),
+    sqlalchemy.Column("author_id", sqlalchemy.Integer, nullable=False),
+    sqlalchemy.Column("category_id", sqlalchemy.Integer, nullable=False),
+    sqlalchemy.Column("checkouts", sqlalchemy.Integer, nullable=False, server_default="0"),
+    sqlalchemy.Column("returns", sqlalchemy.Integer, nullable=False, server_default="0"),
+    sqlalchemy.Column("on_loan", sqlalchemy.Integer, nullable=False, server_default="0"),
+)
+
+# Watermarks of incrementally refreshed rollups and fine assessments
+rollup_watermark_table = sqlalchemy.Table(
+    "rollup_watermarks",
+    metadata,
+    sqlalchemy.Column("name", sqlalchemy.String, primary_key=True),
+    sqlalchemy.Column("refreshed_through", sqlalchemy.Date, nullable=False),
+    sqlalchemy.Column(
+        "updated_at",
+        sqlalchemy.DateTime(timezone=True),
+        nullable=False,
+        server_default=sqlalchemy.func.now(),
+    ),
+)
+
+# Watermarks of incremental analytics exports
+export_watermark_table = sqlalchemy.Table(
+    "export_watermarks",
+    metadata,
+    sqlalchemy.Column("name", sqlalchemy.String, primary_key=True),
+    sqlalchemy.Column(
+        "exported_through",
+        sqlalchemy.DateTime(timezone=True),
+        nullable=False,
+    ),
+)
+
+
+def database_uri(host: str | None) -> str:
+    """Function building the URI of the app database on a server.
+
+    Args:
+        host (str | None): The server as "host:port".
+
+    Returns:
+        str: The URI with the app credentials and database name.
+    """
+    return (
+        f"postgresql+asyncpg://{config.DB_USER}:{config.DB_PASSWORD}"
+        f"@{host}/{config.DB_NAME}"
+    )
+
+
+db_uri = database_uri(config.DB_HOST)
+
+
+class PooledPostgresConnection(PostgresConnection):
+    """A connection of the pool which waits for a free slot at most
+    `DB_POOL_ACQUIRE_TIMEOUT_SECONDS`."""
+
+    async def acquire(self) -> None:
+        assert self._connection is None, "Connection is already acquired"
+        assert self._database._pool is not None, "DatabaseBackend is not running"
+        self._connection = await self._database._pool.acquire(
+            timeout=config.DB_POOL_ACQUIRE_TIMEOUT_SECONDS,
+        )
+
+
+class PooledPostgresBackend(PostgresBackend):
+    """The asyncpg backend with connections limiting the acquire time."""
+
+    def connection(self) -> PooledPostgresConnection:
+        return PooledPostgresConnection(self, self._dialect)
+
+    def pool_stats(self) -> dict[str, int]:
+        """Returns the current size and usage of the pool."""
+        pool = self._pool
+        if pool is None:
+            return {"size": 0, "idle": 0, "in_use": 0, "min_size": 0, "max_size": 0}
+
+        return {
+            "size": pool.get_size(),
+            "idle": pool.get_idle_size(),
+            "in_use": pool.get_size() - pool.get_idle_size(),
+            "min_size": pool.get_min_size(),
+            "max_size": pool.get_max_size(),
+        }
+
+
+# Set when reads of the current request or task have to see its writes.
+primary_pinned: ContextVar[bool] = ContextVar("primary_pinned", default=False)
+
+REPLICA_LAG_QUERY = (
+    "SELECT CASE WHEN NOT pg_is_in_recovery() "
+    "OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE extract(epoch FROM now() - pg_last_xact_replay_timestamp()) END AS lag"
+)
+
+
+def is_read_only(query: sqlalchemy.ClauseElement | str) -> bool:
+    """Function telling whether a query can be served by a replica.
+
+    Only SELECT expressions without row locks and without data-modifying
+    CTEs qualify. Textual SQL always goes to the primary.
+
+    Args:
+        query (sqlalchemy.ClauseElement | str): The query.
+
+    Returns:
+        bool: True if the query only reads.
+    """
+    if not isinstance(query, (sqlalchemy.Select, sqlalchemy.CompoundSelect)):
+        return False
+
+    for element in sqlalchemy.sql.visitors.iterate(query):
+        if isinstance(element, sqlalchemy.sql.dml.UpdateBase):
+            return False
+        if isinstance(element, sqlalchemy.Select) and element._for_update_arg is not None:
+            return False
+
+    return True
+
+
+class Database(databases.Database):
+    """The connection pool of the app, used by the schema setup,
+    repositories, the scheduler and the job worker alike.
+
+    With read replicas configured, `fetch_*` and `iterate` of read-only
+    queries are spread over the replicas whose lag is within
+    `DB_REPLICA_MAX_LAG_SECONDS`; everything else goes to the primary.
+    Queries run on a connection held by the task, i.e. in a transaction,
+    stay on the primary, and so do all reads after the task wrote or
+    after `primary_pinned` was set for it.
+    """
+
+    SUPPORTED_BACKENDS = {
+        **databases.Database.SUPPORTED_BACKENDS,
+        "postgresql+asyncpg": "src.db:PooledPostgresBackend",
+    }
+
+    def __init__(
+        self,
+        url: str,
+        *,
+        replica_urls: list[str] | None = None,
+        **options: Any,
+    ) -> None:
+        super().__init__(url, **options)
+        self.replicas = [Database(replica_url, **options) for replica_url in replica_urls or []]
+        self.replica_lag: dict[int, float | None] = {}
+        self._healthy_replicas: list["Database"] = []
+        self._next_replica = itertools.count()
+        self._monitor: asyncio.Task | None = None
+
+    async def connect(self) -> None:
+        if self.is_connected:
+            return
+
+        await super().connect()
+        if not self.replicas:
+            return
+
+        await self.check_replicas()
+        self._monitor = asyncio.create_task(self._monitor_replicas())
+
+    async def disconnect(self) -> None:
+        if self._monitor:
+            self._monitor.cancel()
+            self._monitor = None
+        self._healthy_replicas = []
+        for replica in self.replicas:
+            if replica.is_connected:
+                await replica.disconnect()
+
+        await super().disconnect()
+
+    async def check_replicas(self) -> None:
+        """Measures the lag of every replica and updates the healthy ones.
+
+        Unreachable replicas and replicas lagging more than
+        `DB_REPLICA_MAX_LAG_SECONDS` are skipped until a later check.
+        """
+        healthy = []
+        for index, replica in enumerate(self.replicas):
+            try:
+                if not replica.is_connected:
+                    await replica.connect()
+                lag = await replica.fetch_val(REPLICA_LAG_QUERY)
+            except (OSError, asyncpg.PostgresError, asyncpg.InterfaceError) as e:
+                print(f"Replica {replica.url.hostname}:{replica.url.port} is unavailable: {e}")
+                lag = None
+
+            self.replica_lag[index] = None if lag is None else float(lag)
+            if lag is not None and lag <= config.DB_REPLICA_MAX_LAG_SECONDS:
+                healthy.append(replica)
+
+        self._healthy_replicas = healthy
+
+    async def _monitor_replicas(self) -> None:
+        while True:
+            await asyncio.sleep(config.DB_REPLICA_CHECK_INTERVAL_SECONDS)
+            try:
+                await self.check_replicas()
+            except Exception as e:
+                print(f"Replica check failed: {e}")
+
+    def reader(self, query: sqlalchemy.ClauseElement | str) -> "Database":
+        """Chooses the database serving a query.
+
+        Args:
+            query (sqlalchemy.ClauseElement | str): The query.
+
+        Returns:
+            Database: A healthy replica, or the primary itself.
+        """
+        if not self._healthy_replicas or primary_pinned.get():
+            return self
+        if self._connection is not None and self._connection._connection_counter:
+            return self
+        if not is_read_only(query):
+            primary_pinned.set(True)
+            return self
+
+        replicas = self._healthy_replicas
+        return replicas[next(self._next_replica) % len(replicas)]
+
+    async def fetch_all(self, query: sqlalchemy.ClauseElement | str, values: dict | None = None) -> list:
+        reader = self.reader(query)
+        if reader is not self:
+            return await reader.fetch_all(query, values)
+        return await super().fetch_all(query, values)
+
+    async def fetch_one(self, query: sqlalchemy.ClauseElement | str, values: dict | None = None) -> Any:
+        reader = self.reader(query)
+        if reader is not self:
+            return await reader.fetch_one(query, values)
+        return await super().fetch_one(query, values)
+
+    async def fetch_val(
+        self,
+        query: sqlalchemy.ClauseElement | str,
+        values: dict | None = None,
+        column: Any = 0,
+    ) -> Any:
+        reader = self.reader(query)
+        if reader is not self:
+            return await reader.fetch_val(query, values, column=column)
+        return await super().fetch_val(query, values, column=column)
+
+    async def iterate(
+        self,
+        query: sqlalchemy.ClauseElement | str,
+        values: dict | None = None,
+    ) -> AsyncGenerator[Any, None]:
+        reader = self.reader(query)
+        records = reader.iterate(query, values) if reader is not self else super().iterate(query, values)
+        async for record in records:
+            yield record
+
+    async def execute(self, query: sqlalchemy.ClauseElement | str, values: dict | None = None) -> Any:
+        primary_pinned.set(True)
+        return await super().execute(query, values)
+
+    async def execute_many(self, query: sqlalchemy.ClauseElement | str, values: list) -> None:
+        primary_pinned.set(True)
+        return await super().execute_many(query, values)
+
+    def pool_stats(self) -> dict[str, int]:
+        """Returns the current size and usage of the pool.
+
+        Returns:
+            dict[str, int]: Open, idle and used connections and the bounds
+                of the pool.
+        """
+        return self._backend.pool_stats()
+
+    def replica_stats(self) -> list[dict[str, Any]]:
+        """Returns the health, lag and pool usage of the replicas.
+
+        Returns:
+            list[dict[str, Any]]: The state of every configured replica.
+        """
+        return [
+            {
+                "host": f"{replica.url.hostname}:{replica.url.port}",
+                "healthy": replica in self._healthy_replicas,
+                "lag_seconds": self.replica_lag.get(index),
+                "pool": replica.pool_stats(),
+            }
+            for index, replica in enumerate(self.replicas)
+        ]
+
+
+pool_options = {
+    "min_size": config.DB_POOL_MIN_SIZE,
+    "max_size": config.DB_POOL_MAX_SIZE,
+    "max_queries": config.DB_POOL_MAX_QUERIES,
+    "max_inactive_connection_lifetime": config.DB_POOL_MAX_INACTIVE_SECONDS,
+    "statement_cache_size": config.DB_STATEMENT_CACHE_SIZE,
+    "timeout": config.DB_CONNECT_TIMEOUT_SECONDS,
+}
+
+database = Database(
     db_uri,
-    force_rollback=True,
+    replica_urls=[database_uri(host) for host in config.DB_REPLICA_HOSTS],
+    **pool_options,
 )
 
 
+# Tables of borrowings kept on the shard of their user.
+SHARDED_TABLES = (borrowing_table, borrowing_archive_table, user_loan_counter_table)
+
+T = TypeVar("T")
+
+
+def jump_hash(key: int, buckets: int) -> int:
+    """Function mapping a key to a bucket with the jump consistent hash.
+
+    Growing from n to n + 1 buckets moves only the keys landing in the
+    new bucket, about 1 / (n + 1) of them.
+
+    Args:
+        key (int): The key.
+        buckets (int): Number of buckets.
+
+    Returns:
+        int: The bucket of the key.
+    """
+    bucket, jump = -1, 0
+    while jump < buckets:
+        bucket = jump
+        key = (key * 2862933555777941757 + 1) & 0xFFFFFFFFFFFFFFFF
+        jump = int((bucket + 1) * (1 << 31) / ((key >> 33) + 1))
+
+    return bucket
+
+
+class ShardMap:
+    """The databases holding borrowings, archived borrowings and loan
+    counters, picked by a hash of the user id.
+
+    Shards only keep these tables, without foreign keys to users and
+    books, which stay in `database`. Borrowing ids are drawn from the
+    sequence of `database`, so they are unique across shards. Without
+    shard hosts `database` is the only shard.
+    """
+
+    def __init__(self, hosts: list[str], primary: Database, **options: Any) -> None:
+        self.hosts = hosts
+        self.sharded = bool(hosts)
+        self.databases = [Database(database_uri(host), **options) for host in hosts] or [primary]
+        self._primary = primary
+
+    def for_user(self, user_id: int) -> Database:
+        """Returns the shard of a user.
+
+        Args:
+            user_id (int): The user's id.
+
+        Returns:
+            Database: The shard holding the user's borrowings.
+        """
+        return self.databases[jump_hash(user_id, len(self.databases))]
+
+    def group_by_shard(self, user_ids: list[int]) -> dict[Database, list[int]]:
+        """Groups positions of a list of users by their shard.
+
+        Args:
+            user_ids (list[int]): The users' ids.
+
+        Returns:
+            dict[Database, list[int]]: The positions of users per shard.
+        """
+        groups: dict[Database, list[int]] = {}
+        for position, user_id in enumerate(user_ids):
+            groups.setdefault(self.for_user(user_id), []).append(position)
+
+        return groups
+
+    async def gather(self, call: Callable[[Database], Awaitable[T]]) -> list[T]:
+        """Runs a call on all shards concurrently.
+
+        Args:
+            call (Callable[[Database], Awaitable[T]]): The call taking a shard.
+
+        Returns:
+            list[T]: The results in shard order.
+        """
+        if not self.sharded:
+            return [await call(self._primary)]
+        return list(await asyncio.gather(*(call(shard) for shard in self.databases)))
+
+    async def next_ids(self, count: int) -> list[int] | None:
+        """Draws borrowing ids from the sequence of the main database.
+
+        Args:
+            count (int): Number of ids.
+
+        Returns:
+            list[int] | None: The ids, None when borrowings are not
+                sharded and the shard assigns them itself.
+        """
+        if not self.sharded:
+            return None
+
+        rows = await self._primary.fetch_all(
+            "SELECT nextval(pg_get_serial_sequence('borrowings', 'id')) AS id "
+            "FROM generate_series(1, :count)",
+            {"count": count},
+        )
+        return [row["id"] for row in rows]
+
+    async def connect(self) -> None:
+        """Connects the shards and creates their missing tables."""
+        if not self.sharded:
+            return
+
+        for shard in self.databases:
+            await shard.connect()
+            await create_schema(shard, SHARDED_TABLES, foreign_keys=False)
+
+    async def disconnect(self) -> None:
+        """Disconnects the shards."""
+        if not self.sharded:
+            return
+
+        for shard in self.databases:
+            if shard.is_connected:
+                await shard.disconnect()
+
+
+borrowing_shards = ShardMap(config.BORROWING_SHARD_HOSTS, database, **pool_options)
+
+
+async def create_schema(
+    db: Database = database,
+    tables: tuple[sqlalchemy.Table, ...] | None = None,
+    foreign_keys: bool = True,
+) -> None:
+    """Function creating missing tables through the app connection pool.
+
+    The DDL of `metadata.create_all` is collected with a mock engine and
+    executed by the pool of the database, so no second pool is opened for
+    schema setup.
+    Existing tables and enum types are skipped like with `checkfirst`.
+
+    Args:
+        db (Database): The database to set up. Defaults to `database`.
+        tables (tuple[sqlalchemy.Table, ...] | None): The tables to create.
+            Defaults to all tables.
+        foreign_keys (bool): Whether to create foreign keys. Defaults to True.
+    """
+    existing = {
+        row["name"]
+        for row in await db.fetch_all(
+            "SELECT tablename AS name FROM pg_tables WHERE schemaname = current_schema()"
+        )
+    }
+    existing_types = {
+        row["name"]
+        for row in await db.fetch_all(
+            "SELECT typname AS name FROM pg_type "
+            "WHERE typnamespace = current_schema()::regnamespace AND typtype = 'e'"
+        )
+    }
+
+    statements: list[sqlalchemy.sql.ddl.ExecutableDDLElement] = []
+
+    def collect(statement: sqlalchemy.sql.ddl.ExecutableDDLElement, *_, **__) -> None:
+        if isinstance(statement, CreateEnumType) and statement.element.name in existing_types:
+            return
+        if isinstance(statement, sqlalchemy.schema.CreateTable) and not foreign_keys:
+            statement = sqlalchemy.schema.CreateTable(
+                statement.element,
+                include_foreign_key_constraints=[],
+            )
+        statements.append(statement)
+
+    metadata.create_all(
+        sqlalchemy.create_mock_engine(db_uri, collect),
+        tables=[
+            table for table in metadata.sorted_tables
+            if table.name not in existing and (tables is None or table in tables)
+        ],
+        checkfirst=False,
+    )
+
+    async with db.transaction():
+        for statement in statements:
+            await db.execute(statement)
+
+
+async def partition_borrowings(db: Database = database) -> bool:
+    """Function migrating a `borrowings` table created before it was
+    partitioned.
+
+    In one transaction the old table is renamed together with its id
+    sequence and indexes, the partitioned table is created, the shared
+    columns are copied into its default partition and the old table is
+    dropped with the foreign keys pointing at it. The copied rows are
+    moved into monthly partitions by `ensure_borrowing_partitions`, the
+    loan counters are left to `reconcile_loan_counters`.
+
+    Args:
+        db (Database): The database to migrate. Defaults to `database`.
+
+    Returns:
+        bool: Whether the table was migrated.
+    """
+    plain = await db.fetch_val(
+        "SELECT relkind = 'r' FROM pg_class WHERE oid = to_regclass('borrowings')"
+    )
+    if not plain:
+        return False
+
+    async with db.transaction():
+        await db.execute("ALTER TABLE borrowings RENAME TO borrowings_unpartitioned")
+        sequence = await db.fetch_val(
+            "SELECT pg_get_serial_sequence('borrowings_unpartitioned', 'id')"
+        )
+        if sequence:
+            await db.execute(f"ALTER SEQUENCE {sequence} RENAME TO borrowings_unpartitioned_id_seq")
+        indexes = await db.fetch_all(
+            "SELECT relname AS name FROM pg_class JOIN pg_index ON pg_index.indexrelid = pg_class.oid "
+            "WHERE pg_index.indrelid = 'borrowings_unpartitioned'::regclass"
+        )
+        for index in indexes:
+            await db.execute(f'ALTER INDEX "{index["name"]}" RENAME TO "{index["name"]}_unpartitioned"')
+
+        await create_schema(db)
+
+        columns = await db.fetch_all(
+            "SELECT new.attname AS name, format_type(new.atttypid, new.atttypmod) AS type "
+            "FROM pg_attribute new JOIN pg_attribute old ON old.attname = new.attname "
+            "WHERE new.attrelid = 'borrowings'::regclass "
+            "AND old.attrelid = 'borrowings_unpartitioned'::regclass "
+            "AND new.attnum > 0 AND NOT new.attisdropped AND NOT old.attisdropped "
+            "ORDER BY new.attnum"
+        )
+        names = ", ".join(column["name"] for column in columns)
+        values = ", ".join(f"CAST({column['name']} AS {column['type']})" for column in columns)
+        await db.execute("ALTER TABLE borrowings_default DISABLE TRIGGER borrowings_user_loans")
+        await db.execute(
+            f"INSERT INTO borrowings ({names}) SELECT {values} FROM borrowings_unpartitioned"
+        )
+        await db.execute("ALTER TABLE borrowings_default ENABLE TRIGGER borrowings_user_loans")
+        await db.execute(
+            "SELECT setval(pg_get_serial_sequence('borrowings', 'id'), max(id)) FROM borrowings"
+        )
+        await db.execute("DROP TABLE borrowings_unpartitioned CASCADE")
+
+    return True
+
+
+async def normalize_emails(db: Database = database) -> int:
+    """Function lower-casing emails stored before they were normalized and
+    creating the unique email index missing on older databases.
+
+    Emails are trimmed and lower-cased with one update. Of users whose
+    emails differ only in case, the oldest one is normalized and all of
+    them are reported; the index is created once they are merged.
+
+    Args:
+        db (Database): The database holding users. Defaults to `database`.
+
+    Returns:
+        int: Number of normalized emails.
+    """
+    if not await db.fetch_val("SELECT to_regclass('users') IS NOT NULL"):
+        return 0
+
+    normalized = sqlalchemy.func.lower(sqlalchemy.func.trim(user_table.c.email))
+    ranked = sqlalchemy.select(
+        user_table.c.id,
+        normalized.label("email"),
+        sqlalchemy.func.row_number()
+            .over(partition_by=normalized, order_by=user_table.c.id)
+            .label("rank"),
+    ).cte("ranked")
+    query = user_table.update() \
+        .where(
+            (user_table.c.id == ranked.c.id) &
+            (ranked.c.rank == 1) &
+            (user_table.c.email != ranked.c.email)
+        ) \
+        .values(email=ranked.c.email) \
+        .returning(user_table.c.id)
+    updated = await db.fetch_all(query)
+
+    duplicates_query = sqlalchemy.select(
+        normalized.label("email"),
+        sqlalchemy.func.array_agg(user_table.c.id).label("ids"),
+    ) \
+        .group_by(normalized) \
+        .having(sqlalchemy.func.count() > 1)
+    for row in await db.fetch_all(duplicates_query):
+        print(f"Users {row['ids']} share the email {row['email']!r}.")
+
+    index = next(index for index in user_table.indexes if index.name == "uq_users_email_lower")
+    try:
+        async with db.transaction():
+            await db.execute(sqlalchemy.schema.CreateIndex(index, if_not_exists=True))
+    except UniqueViolationError as e:
+        print(f"Index {index.name} is not created: {e}")
+
+    return len(updated)
+
+
+async def normalize_isbns(db: Database = database) -> int:
+    """Function normalizing ISBNs stored before they were validated and
+    creating the unique ISBN index missing on older databases.
+
+    ISBNs are rewritten to the ISBN-13 form of `normalize_isbn` with one
+    update. A value which is not a valid ISBN, or whose number is already
+    stored for another book, is kept as written and reported, so no book
+    loses its ISBN. The index is created once such duplicates are fixed.
+
+    Args:
+        db (Database): The database holding books. Defaults to `database`.
+
+    Returns:
+        int: Number of normalized ISBNs.
+    """
+    if not await db.fetch_val("SELECT to_regclass('books') IS NOT NULL"):
+        return 0
+
+    rows = await db.fetch_all(
+        "SELECT id, isbn FROM books WHERE isbn !~ '^[0-9]{13}$' ORDER BY id"
+    )
+    normalized: dict[str, int] = {}
+    valid = []
+    for row in rows:
+        try:
+            normalized.setdefault(normalize_isbn(row["isbn"]), row["id"])
+        except ValueError as e:
+            print(f"Book {row['id']} keeps ISBN {row['isbn']!r}: {e}")
+        else:
+            valid.append(row)
+
+    updated = set()
+    if normalized:
+        isbns = sqlalchemy.func.unnest(
+            sqlalchemy.cast(list(normalized.values()), sqlalchemy.ARRAY(sqlalchemy.Integer)),
+            sqlalchemy.cast(list(normalized.keys()), sqlalchemy.ARRAY(sqlalchemy.String)),
+        ).table_valued("id", "isbn").render_derived(name="normalized")
+        other = book_table.alias("other")
+        query = book_table.update() \
+            .where(
+                (book_table.c.id == isbns.c.id) &
+                ~sqlalchemy.exists().where(other.c.isbn == isbns.c.isbn)
+            ) \
+            .values(isbn=isbns.c.isbn) \
+            .returning(book_table.c.id)
+        updated = {row["id"] for row in await db.fetch_all(query)}
+    for row in valid:
+        if row["id"] not in updated:
+            print(f"Book {row['id']} keeps ISBN {row['isbn']!r}: its number belongs to another book.")
+
+    index = next(index for index in book_table.indexes if index.name == "uq_books_isbn")
+    try:
+        async with db.transaction():
+            await db.execute(sqlalchemy.schema.CreateIndex(index, if_not_exists=True))
+    except UniqueViolationError as e:
+        print(f"Index {index.name} is not created: {e}")
+
+    return len(updated)
+
+
 async def init_db(retries: int = 5, delay: int = 5) -> None:
     """Function initializing the DB.
 
@@ -144,12 +1248,15 @@ async def init_db(retries: int = 5, delay: int = 5) -> None:
     """
     for attempt in range(retries):
         try:
-            async with engine.begin() as conn:
-                await conn.run_sync(metadata.create_all)
+            await database.connect()
+            await partition_borrowings()
+            await normalize_emails()
+            await normalize_isbns()
+            await create_schema()
+            await borrowing_shards.connect()
             return
         except (
-            OperationalError,
-            DatabaseError,
+            OSError,
             CannotConnectNowError,
             ConnectionDoesNotExistError,
         ) as e:
@@ -157,4 +1264,3 @@ async def init_db(retries: int = 5, delay: int = 5) -> None:
             await asyncio.sleep(delay)
 
     raise ConnectionError("Could not connect to DB after several retries.")
-
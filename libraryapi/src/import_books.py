@@ -0,0 +1,68 @@
+"""Command importing a catalog feed from a CSV or NDJSON file.
+
+Run with `python -m src.import_books <path> [--format csv|ndjson]`.
+"""
+
+import argparse
+import asyncio
+from pathlib import Path
+from typing import AsyncIterator
+
+from src.container import Container
+from src.core.domain.job import JobIn, JobKind
+from src.db import borrowing_shards, database
+from src.infrastructure.utils.catalog_import import CSV, NDJSON, feed_format, read_records
+
+READ_SIZE = 1 << 20
+
+
+container = Container()
+
+
+async def read_file(path: Path) -> AsyncIterator[bytes]:
+    """A function reading a file in chunks without blocking the loop.
+
+    Args:
+        path (Path): The path of the file.
+
+    Yields:
+        bytes: The consecutive chunks of the file.
+    """
+    with path.open("rb") as file:
+        while chunk := await asyncio.to_thread(file.read, READ_SIZE):
+            yield chunk
+
+
+async def main() -> None:
+    """The entry point of the import command."""
+    parser = argparse.ArgumentParser(description="Import a catalog feed.")
+    parser.add_argument("path", type=Path)
+    parser.add_argument("--format", choices=[CSV, NDJSON])
+    args = parser.parse_args()
+
+    await database.connect()
+    await borrowing_shards.connect()
+    try:
+        records = read_records(
+            read_file(args.path),
+            args.format or feed_format(None, args.path.name),
+        )
+        result = await container.book_repository().import_books(records)
+        if result.inserted or result.updated:
+            await container.job_repository().enqueue_job(
+                JobIn(kind=JobKind.SIMILARITY_REBUILD),
+            )
+    finally:
+        await borrowing_shards.disconnect()
+        await database.disconnect()
+
+    for error in result.errors:
+        print(f"Line {error.line}: {error.message}")
+    print(
+        f"Rows: {result.rows}, inserted: {result.inserted}, updated: {result.updated}, "
+        f"unchanged: {result.unchanged}, rejected: {result.rejected}"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
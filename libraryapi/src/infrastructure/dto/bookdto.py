@@ -15,4 +15,27 @@ class BookDTO(BaseModel):
     model_config = ConfigDict(
         from_attributes=True,
         extra="ignore",
-    )
\ No newline at end of file
+    )
+
+class BookImportErrorDTO(BaseModel):
+    """A DTO model for a rejected row of a catalog import."""
+
+    line: int
+    message: str
+
+
+class BookImportResultDTO(BaseModel):
+    """A DTO model for the summary of a catalog import."""
+
+    rows: int
+    inserted: int
+    updated: int
+    unchanged: int
+    rejected: int
+    errors: list[BookImportErrorDTO]
+    job_id: int | None = None
+
+    model_config = ConfigDict(
+        from_attributes=True,
+        extra="ignore",
+    )
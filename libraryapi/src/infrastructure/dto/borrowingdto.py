@@ -1,5 +1,6 @@
 from pydantic import BaseModel, ConfigDict
 from datetime import date, datetime
+from src.core.domain.borrowing import BorrowingStatus
 
 
 class BorrowingDTO(BaseModel):
@@ -11,7 +12,9 @@ class BorrowingDTO(BaseModel):
     borrowed_date: date
     planned_return_date: date | None = None
     return_date: date | None = None
-    status: str
+    branch_id: int | None = None
+    copy_id: int | None = None
+    status: BorrowingStatus
 
     model_config = ConfigDict(
         from_attributes=True,
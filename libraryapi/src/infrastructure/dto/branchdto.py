@@ -0,0 +1,41 @@
+from pydantic import BaseModel, ConfigDict
+
+
+class BranchDTO(BaseModel):
+    """A DTO model for branch."""
+
+    id: int
+    name: str
+    address: str | None = None
+
+    model_config = ConfigDict(
+        from_attributes=True,
+        extra="ignore",
+    )
+
+
+class BranchStockDTO(BaseModel):
+    """A DTO model for copies of a book on the shelves of a branch."""
+
+    branch_id: int
+    book_id: int
+    copies_available: int
+
+    model_config = ConfigDict(
+        from_attributes=True,
+        extra="ignore",
+    )
+
+
+class BookAvailabilityDTO(BaseModel):
+    """A DTO model for availability of a book across branches."""
+
+    book_id: int
+    copies_available: int
+    unassigned_copies: int
+    branches: list[BranchStockDTO]
+
+    model_config = ConfigDict(
+        from_attributes=True,
+        extra="ignore",
+    )
@@ -0,0 +1,21 @@
+from datetime import datetime
+
+from pydantic import BaseModel, ConfigDict
+
+from src.core.domain.copy import CopyStatus
+
+
+class BookCopyDTO(BaseModel):
+    """A DTO model for book copy."""
+
+    id: int
+    book_id: int
+    barcode: str
+    branch_id: int | None = None
+    status: CopyStatus
+    updated_at: datetime
+
+    model_config = ConfigDict(
+        from_attributes=True,
+        extra="ignore",
+    )
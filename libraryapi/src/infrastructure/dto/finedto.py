@@ -0,0 +1,20 @@
+from datetime import date
+
+from pydantic import BaseModel, ConfigDict
+
+
+class FineDTO(BaseModel):
+    """A DTO model for fine."""
+
+    id: int
+    borrowing_id: int
+    user_id: int
+    days_overdue: int
+    amount: float
+    assessed_on: date
+    paid: bool
+
+    model_config = ConfigDict(
+        from_attributes=True,
+        extra="ignore",
+    )
@@ -0,0 +1,33 @@
+from datetime import datetime
+
+from pydantic import BaseModel, ConfigDict
+
+from src.core.domain.job import JobKind
+
+
+class JobDTO(BaseModel):
+    """A DTO model for job."""
+
+    id: int
+    kind: JobKind
+    status: str
+    attempts: int
+    max_attempts: int
+    run_at: datetime
+    last_error: str | None = None
+    result: dict | None = None
+    created_at: datetime
+    updated_at: datetime
+
+    model_config = ConfigDict(
+        from_attributes=True,
+        extra="ignore",
+    )
+
+
+class JobAcceptedDTO(BaseModel):
+    """A DTO model for an accepted background job."""
+
+    job_id: int
+    status: str
+    status_url: str
@@ -0,0 +1,20 @@
+from pydantic import BaseModel
+
+
+class PoolStatsDTO(BaseModel):
+    """A DTO model for connection pool statistics."""
+
+    size: int
+    idle: int
+    in_use: int
+    min_size: int
+    max_size: int
+
+
+class ReplicaStatsDTO(BaseModel):
+    """A DTO model for the state of a read replica."""
+
+    host: str
+    healthy: bool
+    lag_seconds: float | None
+    pool: PoolStatsDTO
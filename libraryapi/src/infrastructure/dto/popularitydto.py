@@ -0,0 +1,14 @@
+from pydantic import BaseModel, ConfigDict
+
+
+class BookPopularityDTO(BaseModel):
+    """A DTO model for book popularity."""
+
+    book_id: int
+    score: float
+    borrow_count: int
+
+    model_config = ConfigDict(
+        from_attributes=True,
+        extra="ignore",
+    )
@@ -0,0 +1,21 @@
+from datetime import datetime
+
+from pydantic import BaseModel, ConfigDict
+
+
+class ReservationDTO(BaseModel):
+    """A DTO model for reservation."""
+
+    id: int
+    user_id: int
+    book_id: int
+    status: str
+    created_at: datetime
+    ready_at: datetime | None = None
+    branch_id: int | None = None
+    copy_id: int | None = None
+
+    model_config = ConfigDict(
+        from_attributes=True,
+        extra="ignore",
+    )
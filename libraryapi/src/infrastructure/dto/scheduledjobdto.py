@@ -0,0 +1,25 @@
+from datetime import datetime
+
+from pydantic import BaseModel, ConfigDict
+
+
+class ScheduledJobDTO(BaseModel):
+    """A DTO model for scheduled job metrics."""
+
+    name: str
+    interval: float
+    exclusive: bool
+    runs: int
+    failures: int
+    skipped: int
+    last_started_at: datetime | None = None
+    last_duration: float | None = None
+    average_duration: float | None = None
+    max_duration: float | None = None
+    last_error: str | None = None
+    next_run_at: datetime | None = None
+
+    model_config = ConfigDict(
+        from_attributes=True,
+        extra="ignore",
+    )
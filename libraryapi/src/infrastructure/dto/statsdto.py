@@ -0,0 +1,34 @@
+from datetime import date
+
+from pydantic import BaseModel, ConfigDict
+
+
+class MonthlyCirculationDTO(BaseModel):
+    """A DTO model for circulation of a category or an author in a month."""
+
+    month: date
+    id: int
+    name: str
+    checkouts: int
+    returns: int
+
+    model_config = ConfigDict(
+        from_attributes=True,
+        extra="ignore",
+    )
+
+
+class BookUtilizationDTO(BaseModel):
+    """A DTO model for utilization of a title."""
+
+    book_id: int
+    title: str
+    checkouts: int
+    loan_days: int
+    copies: int
+    utilization: float | None = None
+
+    model_config = ConfigDict(
+        from_attributes=True,
+        extra="ignore",
+    )
@@ -1,8 +1,14 @@
 
 from typing import Any
+from sqlalchemy import bindparam
 from src.core.domain.author import Author, AuthorIn
 from src.core.repositories.iauthor import IAuthorRepository
 from src.db import author_table, database, book_table
+from src.infrastructure.utils.prepared import PreparedQuery
+
+GET_AUTHOR_BY_ID = PreparedQuery(
+    author_table.select().where(author_table.c.id == bindparam("author_id"))
+)
 
 
 class AuthorRepository(IAuthorRepository):
@@ -31,8 +37,7 @@ class AuthorRepository(IAuthorRepository):
         Returns:
             Any | None: The author object if found, otherwise None.
         """
-        query = author_table.select().where(author_table.c.id == author_id)
-        author = await database.fetch_one(query)
+        author = await GET_AUTHOR_BY_ID.fetch_one(author_id=author_id)
         return Author(**dict(author)) if author else None
     
     async def get_books_by_author(self, author_id: int) -> list[dict]:
@@ -1,7 +1,64 @@
-from typing import Any
-from src.core.domain.book import Book, BookIn
+import asyncio
+from typing import Any, AsyncIterator
+
+import sqlalchemy
+from asyncpg.exceptions import UniqueViolationError
+from databases.core import Connection
+from pydantic import ValidationError
+from sqlalchemy import bindparam, case, distinct, exists, func, literal, literal_column, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.schema import CreateTable, DropTable
+
+from src.config import config
+from src.core.domain.book import (
+    Book,
+    BookIn,
+    BookImportError,
+    BookImportResult,
+    BookImportRow,
+    InventoryChange,
+    InventoryItem,
+    InventoryResult,
+)
 from src.core.repositories.ibook import IBookRepository
-from src.db import book_table, database
+from src.db import author_table, book_copy_table, book_table, category_table, database
+from src.infrastructure.utils.prepared import PreparedQuery
+from src.infrastructure.utils.similarity import book_tokens, similarity_index
+
+GET_BOOK_BY_ID = PreparedQuery(
+    book_table.select().where(book_table.c.id == bindparam("book_id"))
+)
+GET_BOOK_BY_ISBN = PreparedQuery(
+    book_table.select().where(book_table.c.isbn == bindparam("isbn"))
+)
+
+# Staging table of catalog imports, created per import transaction.
+book_import_table = sqlalchemy.Table(
+    "books_import",
+    sqlalchemy.MetaData(),
+    sqlalchemy.Column("line", sqlalchemy.Integer, nullable=False),
+    sqlalchemy.Column("title", sqlalchemy.String, nullable=False),
+    sqlalchemy.Column("author_first_name", sqlalchemy.String, nullable=False),
+    sqlalchemy.Column("author_last_name", sqlalchemy.String, nullable=False),
+    sqlalchemy.Column("published_year", sqlalchemy.Integer, nullable=False),
+    sqlalchemy.Column("isbn", sqlalchemy.String, nullable=False),
+    sqlalchemy.Column("category_name", sqlalchemy.String, nullable=False),
+    sqlalchemy.Column("copies_available", sqlalchemy.Integer, nullable=False),
+    prefixes=["TEMPORARY"],
+)
+IMPORT_COLUMNS = [column.name for column in book_import_table.columns]
+
+# Staging table of inventory updates, created per update transaction.
+inventory_table = sqlalchemy.Table(
+    "books_inventory",
+    sqlalchemy.MetaData(),
+    sqlalchemy.Column("position", sqlalchemy.Integer, nullable=False),
+    sqlalchemy.Column("book_id", sqlalchemy.Integer, nullable=True),
+    sqlalchemy.Column("isbn", sqlalchemy.String, nullable=True),
+    sqlalchemy.Column("copies_available", sqlalchemy.Integer, nullable=False),
+    prefixes=["TEMPORARY"],
+)
+INVENTORY_COLUMNS = [column.name for column in inventory_table.columns]
 
 
 class BookRepository(IBookRepository):
@@ -14,10 +71,24 @@ class BookRepository(IBookRepository):
             data (BookIn): The input data for the book.
 
         Returns:
-            Any | None: The newly created book object if successful, otherwise None.
+            Any | None: The newly created book object if successful, None if
+                a book with the same ISBN exists.
         """
-        query = book_table.insert().values(**data.model_dump())
+        query = insert(book_table) \
+            .values(**data.model_dump()) \
+            .on_conflict_do_nothing(
+                index_elements=[book_table.c.isbn],
+                index_where=book_table.c.isbn.is_not(None),
+            ) \
+            .returning(book_table.c.id)
         new_book_id = await database.execute(query)
+        if new_book_id is None:
+            return None
+
+        documents = await self._get_book_documents(new_book_id)
+        for book_id, tokens in documents:
+            await asyncio.to_thread(similarity_index.add, book_id, tokens)
+
         return await self.get_book_by_id(new_book_id)
     
     async def list_book(self) -> list[Book]:
@@ -41,8 +112,21 @@ class BookRepository(IBookRepository):
         Returns:
             Any | None: The book object if found, otherwise None.
         """
-        query = book_table.select().where(book_table.c.id == book_id)
-        book = await database.fetch_one(query)
+        book = await GET_BOOK_BY_ID.fetch_one(book_id=book_id)
+        return Book(**dict(book)) if book else None
+
+    async def get_book_by_isbn(self, isbn: str) -> Book | None:
+        """
+        Retrieves a book by its normalized ISBN with a probe of the unique
+        ISBN index.
+
+        Args:
+            isbn (str): The ISBN-13 of the book, without separators.
+
+        Returns:
+            Book | None: The book object if found, otherwise None.
+        """
+        book = await GET_BOOK_BY_ISBN.fetch_one(isbn=isbn)
         return Book(**dict(book)) if book else None
 
     async def search_book_by_title(self, title: str) -> Any:
@@ -87,19 +171,375 @@ class BookRepository(IBookRepository):
         rows = await database.fetch_all(query)
         return [Book(**row) for row in rows]
     
+    async def get_similar_books(self, book_id: int, limit: int) -> list[Book]:
+        """
+        Retrieves books similar to the given one from the TF-IDF model.
+
+        Args:
+            book_id (int): The ID of the book.
+            limit (int): Maximal number of returned books.
+
+        Returns:
+            list[Book]: Similar books, most similar first.
+        """
+        similar_ids = similarity_index.similar(book_id, limit)
+        if not similar_ids:
+            return []
+
+        query = book_table.select().where(book_table.c.id.in_(similar_ids))
+        rows = {row["id"]: row for row in await database.fetch_all(query)}
+        return [Book(**dict(rows[id_])) for id_ in similar_ids if id_ in rows]
+
+    async def rebuild_similarity_index(self, force: bool = False) -> None:
+        """
+        Rebuilds the similar books model from all books in the database.
+
+        The model lives on local disk and every worker of a host runs the
+        scheduled job, so the first worker to get to a slot rebuilds it and
+        the others skip the model it has just built.
+
+        Args:
+            force (bool): Whether to rebuild a recently built model too,
+                as requested rebuilds must pick up the latest books.
+        """
+        age = similarity_index.age()
+        if not force and age is not None and age < config.SIMILARITY_REBUILD_INTERVAL_SECONDS / 2:
+            return
+
+        documents = await self._get_book_documents()
+        await asyncio.to_thread(similarity_index.build, documents)
+
+    async def import_books(
+        self,
+        records: AsyncIterator[tuple[int, dict | str]],
+    ) -> BookImportResult:
+        """
+        Imports a catalog feed in a single transaction.
+
+        Records are validated as they arrive and copied into a staging
+        table in chunks of `IMPORT_CHUNK_SIZE` rows with `COPY`, so the
+        feed is never held in memory as a whole. Missing authors and
+        categories are then created in bulk and the books are upserted by
+        ISBN with one statement. The last row of an ISBN wins, earlier ones
+        count as unchanged. Available copies are only set for new books,
+        stock of existing ones is kept.
+
+        Args:
+            records (AsyncIterator[tuple[int, dict | str]]): Line numbers
+                with parsed records or parsing errors.
+
+        Returns:
+            BookImportResult: Counts of processed rows and rejected rows.
+        """
+        result = BookImportResult()
+        chunk: list[tuple] = []
+
+        def reject(line: int, message: str) -> None:
+            result.rejected += 1
+            if len(result.errors) < config.IMPORT_MAX_ERRORS:
+                result.errors.append(BookImportError(line=line, message=message))
+
+        async with database.connection() as connection:
+            async with connection.transaction():
+                # Concurrent imports would race creating the same authors.
+                await connection.execute(
+                    "SELECT pg_advisory_xact_lock(hashtext('books_import'))"
+                )
+                await connection.execute(CreateTable(book_import_table))
+
+                async for line, record in records:
+                    result.rows += 1
+                    if isinstance(record, str):
+                        reject(line, record)
+                        continue
+                    try:
+                        row = BookImportRow.model_validate(record)
+                    except ValidationError as e:
+                        reject(line, "; ".join(
+                            f"{'.'.join(map(str, error['loc'])) or 'row'}: {error['msg']}"
+                            for error in e.errors()
+                        ))
+                        continue
+
+                    chunk.append((line, *(getattr(row, name) for name in IMPORT_COLUMNS[1:])))
+                    if len(chunk) >= config.IMPORT_CHUNK_SIZE:
+                        await self._copy_import_chunk(connection, chunk)
+                        chunk = []
+
+                if chunk:
+                    await self._copy_import_chunk(connection, chunk)
+
+                inserted, upserted = await self._merge_import(connection)
+                await connection.execute(DropTable(book_import_table))
+
+        result.inserted = inserted
+        result.updated = upserted - inserted
+        result.unchanged = result.rows - result.rejected - upserted
+
+        return result
+
+    async def update_inventory(self, items: list[InventoryItem]) -> InventoryResult:
+        """
+        Sets available copies of many books at once, e.g. after stocktaking.
+
+        Items are copied into a staging table, ISBNs are resolved to ids
+        with one join and all changed books are updated with a single
+        `UPDATE ... FROM`. When a book is listed more than once, the last
+        item wins. Books with copy rows are skipped, since their counts are
+        derived from the copies.
+
+        Args:
+            items (list[InventoryItem]): The counted stock of books.
+
+        Returns:
+            InventoryResult: The previous and new stock of changed books, the
+                positions of items matching no book and of skipped items.
+        """
+        staged = inventory_table.c
+        copy_tracked = exists().where(book_copy_table.c.book_id == staged.book_id)
+
+        async with database.connection() as connection:
+            async with connection.transaction():
+                await connection.execute(CreateTable(inventory_table))
+                await connection.raw_connection.copy_records_to_table(
+                    inventory_table.name,
+                    records=[
+                        (position, item.book_id, item.isbn, item.copies_available)
+                        for position, item in enumerate(items)
+                    ],
+                    columns=INVENTORY_COLUMNS,
+                )
+                await connection.execute(f"ANALYZE {inventory_table.name}")
+                await connection.execute(
+                    inventory_table.update()
+                        .where(
+                            (staged.book_id.is_(None)) &
+                            (book_table.c.isbn == staged.isbn)
+                        )
+                        .values(book_id=book_table.c.id)
+                )
+
+                counted = select(staged.book_id, staged.copies_available) \
+                    .where((staged.book_id.is_not(None)) & ~copy_tracked) \
+                    .distinct(staged.book_id) \
+                    .order_by(staged.book_id, staged.position.desc()) \
+                    .subquery("counted")
+                previous = select(
+                    book_table.c.id,
+                    book_table.c.copies_available,
+                    counted.c.copies_available.label("counted"),
+                ) \
+                    .join(counted, counted.c.book_id == book_table.c.id) \
+                    .with_for_update(of=book_table) \
+                    .cte("previous")
+                update = book_table.update() \
+                    .where(
+                        (book_table.c.id == previous.c.id) &
+                        (book_table.c.copies_available.is_distinct_from(previous.c.counted))
+                    ) \
+                    .values(copies_available=previous.c.counted) \
+                    .returning(
+                        book_table.c.id.label("book_id"),
+                        book_table.c.isbn,
+                        previous.c.copies_available.label("previous"),
+                        book_table.c.copies_available,
+                    )
+                changes = await connection.fetch_all(update)
+
+                found = exists().where(book_table.c.id == staged.book_id)
+                not_found = await connection.fetch_all(
+                    select(staged.position).where(~found).order_by(staged.position)
+                )
+                skipped = await connection.fetch_all(
+                    select(staged.position).where(copy_tracked).order_by(staged.position)
+                )
+                matched = await connection.fetch_val(
+                    select(func.count(distinct(staged.book_id))).where(found & ~copy_tracked)
+                )
+                await connection.execute(DropTable(inventory_table))
+
+        return InventoryResult(
+            items=len(items),
+            updated=len(changes),
+            unchanged=matched - len(changes),
+            not_found=[row["position"] for row in not_found],
+            copy_tracked=[row["position"] for row in skipped],
+            changes=sorted(
+                (InventoryChange(**dict(row)) for row in changes),
+                key=lambda change: change.book_id,
+            ),
+        )
+
+    @staticmethod
+    async def _copy_import_chunk(connection: Connection, chunk: list[tuple]) -> None:
+        """Copies validated rows into the staging table.
+
+        Args:
+            connection (Connection): The connection of the import transaction.
+            chunk (list[tuple]): Rows in the order of the staging columns.
+        """
+        await connection.raw_connection.copy_records_to_table(
+            book_import_table.name,
+            records=chunk,
+            columns=IMPORT_COLUMNS,
+        )
+
+    @staticmethod
+    async def _merge_import(connection: Connection) -> tuple[int, int]:
+        """Merges the staging table into the catalog.
+
+        Args:
+            connection (Connection): The connection of the import transaction.
+
+        Returns:
+            tuple[int, int]: Numbers of inserted books and of inserted or
+                changed books.
+        """
+        staged = book_import_table.c
+        # Temporary tables are not analyzed automatically.
+        await connection.execute(f"ANALYZE {book_import_table.name}")
+
+        await connection.execute(
+            author_table.insert().from_select(
+                ["first_name", "last_name"],
+                select(staged.author_first_name, staged.author_last_name)
+                    .distinct()
+                    .where(~exists().where(
+                        (author_table.c.first_name == staged.author_first_name) &
+                        (author_table.c.last_name == staged.author_last_name)
+                    )),
+            )
+        )
+        await connection.execute(
+            category_table.insert().from_select(
+                ["name", "description"],
+                select(staged.category_name, literal(""))
+                    .distinct()
+                    .where(~exists().where(category_table.c.name == staged.category_name)),
+            )
+        )
+
+        authors = select(
+            author_table.c.first_name,
+            author_table.c.last_name,
+            func.min(author_table.c.id).label("id"),
+        ) \
+            .group_by(author_table.c.first_name, author_table.c.last_name) \
+            .subquery("import_authors")
+        categories = select(
+            category_table.c.name,
+            func.min(category_table.c.id).label("id"),
+        ) \
+            .group_by(category_table.c.name) \
+            .subquery("import_categories")
+        rows = select(
+            staged.title,
+            authors.c.id,
+            staged.published_year,
+            staged.isbn,
+            categories.c.id,
+            staged.copies_available,
+        ) \
+            .join(
+                authors,
+                (authors.c.first_name == staged.author_first_name) &
+                (authors.c.last_name == staged.author_last_name),
+            ) \
+            .join(categories, categories.c.name == staged.category_name) \
+            .distinct(staged.isbn) \
+            .order_by(staged.isbn, staged.line.desc())
+
+        upsert = insert(book_table).from_select(
+            ["title", "author_id", "published_year", "isbn", "category_id", "copies_available"],
+            rows,
+        )
+        changed = ["title", "author_id", "published_year", "category_id"]
+        upsert = upsert.on_conflict_do_update(
+            index_elements=[book_table.c.isbn],
+            index_where=book_table.c.isbn.is_not(None),
+            set_={name: upsert.excluded[name] for name in changed},
+            where=sqlalchemy.tuple_(*(book_table.c[name] for name in changed))
+                .is_distinct_from(sqlalchemy.tuple_(*(upsert.excluded[name] for name in changed))),
+        ) \
+            .returning(literal_column("xmax = 0").label("inserted")) \
+            .cte("upserted")
+
+        counts = await connection.fetch_one(
+            select(
+                func.count().filter(upsert.c.inserted).label("inserted"),
+                func.count().label("upserted"),
+            ).select_from(upsert)
+        )
+        return counts["inserted"], counts["upserted"]
+
+    async def _get_book_documents(
+        self,
+        book_id: int | None = None,
+    ) -> list[tuple[int, list[str]]]:
+        """
+        Fetches the tokens describing books for the similarity model.
+
+        Args:
+            book_id (int | None): The ID of a single book, all books if None.
+
+        Returns:
+            list[tuple[int, list[str]]]: Pairs of book id and its tokens.
+        """
+        query = (
+            select(
+                book_table.c.id,
+                book_table.c.title,
+                author_table.c.first_name,
+                author_table.c.last_name,
+                category_table.c.name,
+            )
+            .join(author_table, book_table.c.author_id == author_table.c.id)
+            .join(category_table, book_table.c.category_id == category_table.c.id)
+            .order_by(book_table.c.id)
+        )
+        if book_id is not None:
+            query = query.where(book_table.c.id == book_id)
+
+        rows = await database.fetch_all(query)
+        return [
+            (
+                row["id"],
+                book_tokens(row["title"], row["first_name"], row["last_name"], row["name"]),
+            )
+            for row in rows
+        ]
+
     async def update_book(self, book_id: int, data: BookIn) -> Any | None:
         """
-        Updates the details of a book.
+        Updates the details of a book. The available copies of a book with
+        copy rows are derived from its copies and are kept.
 
         Args:
             book_id (int): The ID of the book to update.
             data (BookIn): The updated data for the book.
 
         Returns:
-            Any | None: The updated book object if successful, otherwise None.
+            Any | None: The updated book object if successful, None if the
+                book does not exist or another book has the same ISBN.
         """
-        query = book_table.update().where(book_table.c.id == book_id).values(**data.model_dump())
-        await database.execute(query)
+        copy_tracked = exists().where(book_copy_table.c.book_id == book_table.c.id)
+        query = book_table.update() \
+            .where(book_table.c.id == book_id) \
+            .values(**data.model_dump() | {
+                "copies_available": case(
+                    (copy_tracked, book_table.c.copies_available),
+                    else_=data.copies_available,
+                ),
+            })
+        try:
+            async with database.transaction():
+                await database.execute(query)
+        except UniqueViolationError:
+            return None
+
+        for document_id, tokens in await self._get_book_documents(book_id):
+            await asyncio.to_thread(similarity_index.replace, document_id, tokens)
+
         return await self.get_book_by_id(book_id)
 
     async def delete_book(self, book_id: int) -> bool:
@@ -112,8 +552,11 @@ class BookRepository(IBookRepository):
         Returns:
             bool: True if the book was successfully deleted, otherwise False.
         """
-        if self.get_book_by_id(id):
-            query = book_table.delete().where(book_table.c.id == book_id)
-            await database.execute(query)
-            return True
-        return False
\ No newline at end of file
+        query = book_table.delete() \
+            .where(book_table.c.id == book_id) \
+            .returning(book_table.c.id)
+        if not await database.fetch_one(query):
+            return False
+
+        await asyncio.to_thread(similarity_index.remove, book_id)
+        return True
\ No newline at end of file
@@ -1,32 +1,423 @@
 """A repository for borrowing entity."""
 
+import heapq
+from collections import Counter
+from contextlib import AsyncExitStack
 from typing import Any
-from datetime import date, datetime
-from src.core.domain.borrowing import Borrowing, BorrowingIn
+from datetime import date, datetime, timedelta
+from sqlalchemy import (
+    Date,
+    Integer,
+    Select,
+    bindparam,
+    case,
+    cast,
+    exists,
+    func,
+    literal,
+    select,
+    tuple_,
+    union_all,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlalchemy.sql.expression import ColumnElement, TableValuedAlias
+from src.config import config
+from src.core.domain.borrowing import (
+    Borrowing,
+    BorrowingEligibility,
+    BorrowingIn,
+    BorrowingReturn,
+    BorrowingStatus,
+    BulkCheckoutResult,
+    BulkReturnResult,
+    EligibilityRule,
+    LoanCounter,
+)
+from src.core.domain.copy import CopyStatus
 from src.core.repositories.iborrowing import IBorrowingRepository
-from src.db import borrowing_table, database
+from src.db import (
+    book_copy_table,
+    book_stock_table,
+    book_table,
+    borrowing_archive_table,
+    borrowing_shards,
+    borrowing_table,
+    database,
+    fine_table,
+    reservation_table,
+    user_loan_counter_table,
+    user_table,
+)
+from src.infrastructure.repositories.copy import (
+    at_branch,
+    claim_copies,
+    claim_copy,
+    mark_copies,
+)
+from src.infrastructure.repositories.reservation import (
+    claim_ready_reservation,
+    release_copies,
+    release_copy,
+)
+from src.infrastructure.utils.popularity import popularity_tracker
+from src.infrastructure.utils.prepared import PreparedQuery
+
+GET_LOAN_COUNTER = PreparedQuery(
+    select(
+        user_table.c.id.label("user_id"),
+        func.coalesce(user_loan_counter_table.c.active_loans, 0).label("active_loans"),
+        func.coalesce(user_loan_counter_table.c.overdue_loans, 0).label("overdue_loans"),
+    )
+        .select_from(
+            user_table.outerjoin(
+                user_loan_counter_table,
+                user_loan_counter_table.c.user_id == user_table.c.id,
+            )
+        )
+        .where(user_table.c.id == bindparam("user_id"))
+)
 
 
 class BorrowingRepository(IBorrowingRepository):
-    """A class implementing the database borrowing repository."""
+    """A class implementing the database borrowing repository.
+
+    Borrowings, archived borrowings and loan counters live on the shard
+    of their user (see `ShardMap`), books, reservations and fines in
+    `database`. Queries of a single user go to their shard, lookups by
+    borrowing id and listings are run on all shards.
+    """
 
     async def create_borrowing(self, data: BorrowingIn) -> Any | None:
         """
-        Creates a new borrowing record in the database.
+        Checks out a book: takes the copy held for the user's ready
+        reservation or one of the available copies, from the stock of the
+        given branch or from the unassigned copies of the book, and
+        creates the borrowing record in a single transaction. A held copy
+        is lent from the branch holding it.
+
+        Books with copy rows lend any free copy of the location, picked
+        with `FOR UPDATE SKIP LOCKED`, so concurrent checkouts of one title
+        do not wait for each other. Their copy counts are left to
+        `refresh_copy_availability`.
+
+        The user row is locked first, so concurrent checkouts of one user
+        are checked against the loan limit one after another. The copy is
+        taken with a conditional update, so concurrent checkouts of the
+        last copy cannot both succeed. The borrowing is committed on the
+        shard of the user before the user lock is released.
 
         Args:
             data (BorrowingIn): The borrowing data to insert.
 
         Returns:
-            Any | None: The newly created borrowing record if successful, otherwise None.
+            Any | None: The newly created borrowing record if successful,
+                None if the user is not eligible to borrow the book.
+        """
+        async with database.transaction():
+            lock_query = select(user_table.c.id) \
+                .where(user_table.c.id == data.user_id) \
+                .with_for_update()
+            if not await database.fetch_one(lock_query):
+                return None
+
+            eligibility = await self.check_eligibility(data.user_id, data.book_id, data.branch_id)
+            if not eligibility or not eligibility.eligible:
+                return None
+
+            # A checkout always starts an active loan, whatever status was sent.
+            values = data.model_dump() | {"status": BorrowingStatus.BORROWED, "return_date": None}
+            if reservation := await claim_ready_reservation(data.user_id, data.book_id):
+                values["branch_id"] = reservation["branch_id"]
+                values["copy_id"] = reservation["copy_id"]
+            elif eligibility.copy_tracked:
+                values["copy_id"] = await claim_copy(data.book_id, data.branch_id)
+                if values["copy_id"] is None:
+                    return None
+            elif data.branch_id is None:
+                claim_query = book_table.update() \
+                    .where(
+                        (book_table.c.id == data.book_id) &
+                        (book_table.c.copies_available > 0)
+                    ) \
+                    .values(copies_available=book_table.c.copies_available - 1) \
+                    .returning(book_table.c.id)
+                if not await database.fetch_one(claim_query):
+                    return None
+            else:
+                claim_query = book_stock_table.update() \
+                    .where(
+                        (book_stock_table.c.branch_id == data.branch_id) &
+                        (book_stock_table.c.book_id == data.book_id) &
+                        (book_stock_table.c.copies_available > 0)
+                    ) \
+                    .values(copies_available=book_stock_table.c.copies_available - 1) \
+                    .returning(book_stock_table.c.book_id)
+                if not await database.fetch_one(claim_query):
+                    return None
+
+            if ids := await borrowing_shards.next_ids(1):
+                values["id"] = ids[0]
+            shard = borrowing_shards.for_user(data.user_id)
+            query = borrowing_table.insert() \
+                .values(**values) \
+                .returning(borrowing_table)
+            async with shard.transaction():
+                borrowing = await shard.fetch_one(query)
+
+        popularity_tracker.record(data.book_id)
+        return Borrowing(**dict(borrowing))
+
+    async def check_eligibility(
+        self,
+        user_id: int,
+        book_id: int,
+        branch_id: int | None = None,
+    ) -> BorrowingEligibility | None:
+        """
+        Evaluates all checkout rules for a user and a book with a single
+        statement: the active loan limit, outstanding fines, availability
+        of the book and whether the user already has it on loan.
+
+        Availability is checked in the stock of the branch if given, and
+        in the unassigned copies of the book otherwise. A ready reservation
+        of the user makes the book available to them even when no copies
+        are left on the shelf.
+
+        Args:
+            user_id (int): The ID of the user.
+            book_id (int): The ID of the book.
+            branch_id (int | None): The ID of the checkout branch, if any.
+
+        Returns:
+            BorrowingEligibility | None: The evaluated rules if the user exists.
         """
-        query = borrowing_table.insert().values(**data.model_dump())
-        new_borrowing_id = await database.execute(query)
-        return await self.get_borrowing_by_id(new_borrowing_id)
+        row = (await self._eligibility_facts([(user_id, book_id, branch_id)]))[0]
+        if not row["user_exists"]:
+            return None
+
+        failed_rules = self._failed_rules(
+            book_exists=row["book_exists"],
+            available=row["reserved_for_user"] or (row["copies_available"] or 0) > 0,
+            active_borrowings=row["active_borrowings"],
+            outstanding_fines=row["outstanding_fines"],
+            duplicate_loan=row["duplicate_loan"],
+        )
+
+        return BorrowingEligibility(
+            user_id=user_id,
+            book_id=book_id,
+            branch_id=branch_id,
+            eligible=not failed_rules,
+            failed_rules=failed_rules,
+            active_borrowings=row["active_borrowings"],
+            outstanding_fines=row["outstanding_fines"],
+            copies_available=row["copies_available"],
+            copy_tracked=row["copy_tracked"],
+            reserved_for_user=row["reserved_for_user"],
+        )
+
+    async def create_borrowings(self, items: list[BorrowingIn]) -> list[BulkCheckoutResult]:
+        """
+        Checks out a batch of books in a single transaction.
+
+        All users and books of the batch are locked up front, the rules of
+        every item are evaluated with one statement and the accepted items
+        are written with one multi-row statement per table. Items are
+        evaluated in order, so earlier items of the batch count towards
+        the loan limits and copies of later ones. Copies are counted per
+        branch, items without a branch take unassigned copies. Books with
+        copy rows lend free copies picked with `FOR UPDATE SKIP LOCKED`,
+        an item whose copies were all taken meanwhile fails as unavailable.
+        Every created borrowing is active, a sent status or return date
+        is ignored.
+
+        Args:
+            items (list[BorrowingIn]): The borrowings to create.
+
+        Returns:
+            list[BulkCheckoutResult]: The result of every item, in input order.
+        """
+        results = [
+            BulkCheckoutResult(user_id=item.user_id, book_id=item.book_id, branch_id=item.branch_id)
+            for item in items
+        ]
+
+        async with database.transaction():
+            for table, ids in (
+                (user_table, {item.user_id for item in items}),
+                (book_table, {item.book_id for item in items}),
+            ):
+                lock_query = select(table.c.id) \
+                    .where(table.c.id.in_(ids)) \
+                    .order_by(table.c.id) \
+                    .with_for_update()
+                await database.fetch_all(lock_query)
+
+            stock = sorted({
+                (item.branch_id, item.book_id) for item in items if item.branch_id is not None
+            })
+            if stock:
+                lock_query = select(book_stock_table.c.branch_id, book_stock_table.c.book_id) \
+                    .where(tuple_(book_stock_table.c.branch_id, book_stock_table.c.book_id).in_(stock)) \
+                    .order_by(book_stock_table.c.branch_id, book_stock_table.c.book_id) \
+                    .with_for_update()
+                await database.fetch_all(lock_query)
+
+            facts = await self._eligibility_facts(
+                [(item.user_id, item.book_id, item.branch_id) for item in items]
+            )
+            active_borrowings: dict[int, int] = {}
+            copies_available: dict[tuple[int, int | None], int] = {}
+            loans: set[tuple[int, int]] = set()
+            accepted: list[tuple[int, bool]] = []
+            copy_ids: dict[int, int | None] = {}
+
+            for position, (item, row) in enumerate(zip(items, facts)):
+                if not row["user_exists"]:
+                    results[position].failed_rules = [EligibilityRule.USER_NOT_FOUND]
+                    continue
+
+                loan = (item.user_id, item.book_id)
+                copy = (item.book_id, item.branch_id)
+                active_borrowings.setdefault(item.user_id, row["active_borrowings"])
+                copies_available.setdefault(copy, row["copies_available"] or 0)
+                reserved = row["reserved_for_user"] and loan not in loans
+
+                results[position].failed_rules = self._failed_rules(
+                    book_exists=row["book_exists"],
+                    available=reserved or copies_available[copy] > 0,
+                    active_borrowings=active_borrowings[item.user_id],
+                    outstanding_fines=row["outstanding_fines"],
+                    duplicate_loan=row["duplicate_loan"] or loan in loans,
+                )
+                if results[position].failed_rules:
+                    continue
+
+                active_borrowings[item.user_id] += 1
+                loans.add(loan)
+                if not reserved:
+                    copies_available[copy] -= 1
+                accepted.append((position, reserved))
+
+            reserved_loans = [items[position] for position, reserved in accepted if reserved]
+            if reserved_loans:
+                claims = func.unnest(
+                    cast([item.user_id for item in reserved_loans], ARRAY(Integer)),
+                    cast([item.book_id for item in reserved_loans], ARRAY(Integer)),
+                ).table_valued("user_id", "book_id").render_derived(name="claims")
+                claim_query = reservation_table.update() \
+                    .where(
+                        (reservation_table.c.user_id == claims.c.user_id) &
+                        (reservation_table.c.book_id == claims.c.book_id) &
+                        (reservation_table.c.status == "ready")
+                    ) \
+                    .values(status="fulfilled") \
+                    .returning(
+                        reservation_table.c.user_id,
+                        reservation_table.c.book_id,
+                        reservation_table.c.branch_id,
+                        reservation_table.c.copy_id,
+                    )
+                claimed = {
+                    (row["user_id"], row["book_id"]): row
+                    for row in await database.fetch_all(claim_query)
+                }
+                await mark_copies(
+                    sorted(row["copy_id"] for row in claimed.values() if row["copy_id"] is not None),
+                    CopyStatus.ON_LOAN,
+                )
+
+                # A hold may have expired since the rules were evaluated.
+                for position, reserved in list(accepted):
+                    loan = (items[position].user_id, items[position].book_id)
+                    if reserved and loan not in claimed:
+                        results[position].failed_rules = [EligibilityRule.BOOK_UNAVAILABLE]
+                        accepted.remove((position, reserved))
+                    elif reserved:
+                        results[position].branch_id = claimed[loan]["branch_id"]
+                        copy_ids[position] = claimed[loan]["copy_id"]
+
+            tracked = [
+                position for position, reserved in accepted
+                if not reserved and facts[position]["copy_tracked"]
+            ]
+            if tracked:
+                lent = await claim_copies(Counter(
+                    (items[position].book_id, items[position].branch_id) for position in tracked
+                ))
+                for position in tracked:
+                    if free_copies := lent.get((items[position].book_id, items[position].branch_id)):
+                        copy_ids[position] = free_copies.pop()
+                    else:
+                        results[position].failed_rules = [EligibilityRule.BOOK_UNAVAILABLE]
+                        accepted.remove((position, False))
+
+            taken = Counter(
+                (items[position].book_id, items[position].branch_id)
+                for position, reserved in accepted
+                if not reserved and position not in copy_ids
+            )
+            book_takes = {book_id: copies for (book_id, branch_id), copies in taken.items() if branch_id is None}
+            if book_takes:
+                takes = func.unnest(
+                    cast(list(book_takes.keys()), ARRAY(Integer)),
+                    cast(list(book_takes.values()), ARRAY(Integer)),
+                ).table_valued("book_id", "copies").render_derived(name="takes")
+                take_query = book_table.update() \
+                    .where(book_table.c.id == takes.c.book_id) \
+                    .values(copies_available=book_table.c.copies_available - takes.c.copies)
+                await database.execute(take_query)
+
+            stock_takes = {copy: copies for copy, copies in taken.items() if copy[1] is not None}
+            if stock_takes:
+                takes = func.unnest(
+                    cast([book_id for book_id, _ in stock_takes], ARRAY(Integer)),
+                    cast([branch_id for _, branch_id in stock_takes], ARRAY(Integer)),
+                    cast(list(stock_takes.values()), ARRAY(Integer)),
+                ).table_valued("book_id", "branch_id", "copies").render_derived(name="takes")
+                take_query = book_stock_table.update() \
+                    .where(
+                        (book_stock_table.c.branch_id == takes.c.branch_id) &
+                        (book_stock_table.c.book_id == takes.c.book_id)
+                    ) \
+                    .values(copies_available=book_stock_table.c.copies_available - takes.c.copies)
+                await database.execute(take_query)
+
+            if accepted:
+                values = [
+                    {
+                        **items[position].model_dump(),
+                        "status": BorrowingStatus.BORROWED,
+                        "return_date": None,
+                        "branch_id": results[position].branch_id,
+                        "copy_id": copy_ids.get(position),
+                    }
+                    for position, _ in accepted
+                ]
+                for value, borrowing_id in zip(values, await borrowing_shards.next_ids(len(values)) or []):
+                    value["id"] = borrowing_id
+
+                # Transactions of all shards are committed together at the end,
+                # so a failed insert leaves no borrowings on other shards.
+                async with AsyncExitStack() as shard_transactions:
+                    for shard, indexes in borrowing_shards.group_by_shard(
+                        [value["user_id"] for value in values]
+                    ).items():
+                        await shard_transactions.enter_async_context(shard.transaction())
+                        insert_query = borrowing_table.insert() \
+                            .values([values[index] for index in indexes]) \
+                            .returning(borrowing_table)
+                        rows = await shard.fetch_all(insert_query)
+                        for index, row in zip(indexes, rows):
+                            results[accepted[index][0]].borrowing = Borrowing(**dict(row))
+
+        for position, _ in accepted:
+            popularity_tracker.record(items[position].book_id)
+        return results
 
     async def get_borrowing_by_id(self, borrowing_id: int) -> Any | None:
         """
-        Fetches a borrowing record by its ID.
+        Fetches a borrowing record by its ID from all shards.
 
         Args:
             borrowing_id (int): The ID of the borrowing.
@@ -35,7 +426,8 @@ class BorrowingRepository(IBorrowingRepository):
             Any | None: The borrowing record if found, otherwise None.
         """
         query = borrowing_table.select().where(borrowing_table.c.id == borrowing_id)
-        borrowing = await database.fetch_one(query)
+        rows = await borrowing_shards.gather(lambda shard: shard.fetch_one(query))
+        borrowing = next((row for row in rows if row is not None), None)
         return Borrowing(**dict(borrowing)) if borrowing else None
     
     async def get_active_borrowings_by_user(self, user_id: int) -> list[Borrowing]:
@@ -49,58 +441,336 @@ class BorrowingRepository(IBorrowingRepository):
         """
         query = borrowing_table.select().where(
             (borrowing_table.c.user_id == user_id) &
-            (borrowing_table.c.status == "borrowed")
+            (borrowing_table.c.status == BorrowingStatus.BORROWED)
         )
-        rows = await database.fetch_all(query)
+        rows = await borrowing_shards.for_user(user_id).fetch_all(query)
         return [Borrowing(**row) for row in rows]
 
-    async def list_all_borrowings(self) -> list[Borrowing]:
+    async def get_loan_counter(self, user_id: int) -> LoanCounter | None:
+        """
+        Fetches the active and overdue loan counts of a user with a single
+        primary key lookup instead of counting their borrowings.
+
+        Args:
+            user_id (int): The ID of the user.
+
+        Returns:
+            LoanCounter | None: The loan counts if the user exists.
+        """
+        if not borrowing_shards.sharded:
+            counter = await GET_LOAN_COUNTER.fetch_one(user_id=user_id)
+            return LoanCounter(**dict(counter)) if counter else None
+
+        if not await database.fetch_val(select(exists().where(user_table.c.id == user_id))):
+            return None
+
+        query = select(
+            user_loan_counter_table.c.active_loans,
+            user_loan_counter_table.c.overdue_loans,
+        ).where(user_loan_counter_table.c.user_id == user_id)
+        counter = await borrowing_shards.for_user(user_id).fetch_one(query)
+        return LoanCounter(
+            user_id=user_id,
+            active_loans=counter["active_loans"] if counter else 0,
+            overdue_loans=counter["overdue_loans"] if counter else 0,
+        )
+
+    async def reconcile_loan_counters(self, today: date | None = None) -> int:
+        """
+        Recounts active and overdue loans of all users and repairs the
+        counters which drifted, refreshing overdue counts on the way.
+        Every shard is reconciled on its own.
+
+        The counters table is locked against writes for the duration, so
+        no checkout or return can change a counter between the recount and
+        the repair. The recount only reads the partial index of active
+        borrowings, so checkouts are held up briefly.
+
+        Args:
+            today (date | None): The reference date. Defaults to today.
+
+        Returns:
+            int: The number of repaired counters.
+        """
+        today = today or date.today()
+        active = borrowing_table.c.status == BorrowingStatus.BORROWED
+
+        actual = select(
+            borrowing_table.c.user_id,
+            func.count().label("active_loans"),
+            func.count()
+                .filter(borrowing_table.c.planned_return_date < today)
+                .label("overdue_loans"),
+        ) \
+            .where(active) \
+            .group_by(borrowing_table.c.user_id) \
+            .cte("actual")
+        drifted = select(
+            func.coalesce(actual.c.user_id, user_loan_counter_table.c.user_id),
+            func.coalesce(actual.c.active_loans, 0),
+            func.coalesce(actual.c.overdue_loans, 0),
+        ) \
+            .select_from(
+                actual.outerjoin(
+                    user_loan_counter_table,
+                    user_loan_counter_table.c.user_id == actual.c.user_id,
+                    full=True,
+                )
+            ) \
+            .where(
+                (user_loan_counter_table.c.user_id.is_(None)) |
+                (user_loan_counter_table.c.active_loans != func.coalesce(actual.c.active_loans, 0)) |
+                (user_loan_counter_table.c.overdue_loans != func.coalesce(actual.c.overdue_loans, 0))
+            )
+
+        query = insert(user_loan_counter_table) \
+            .from_select(["user_id", "active_loans", "overdue_loans"], drifted)
+        query = query.on_conflict_do_update(
+            index_elements=[user_loan_counter_table.c.user_id],
+            set_={
+                "active_loans": query.excluded.active_loans,
+                "overdue_loans": query.excluded.overdue_loans,
+                "updated_at": func.now(),
+            },
+        ).returning(user_loan_counter_table.c.user_id)
+
+        repaired = []
+        for shard in borrowing_shards.databases:
+            async with shard.transaction():
+                await shard.execute("LOCK TABLE user_loan_counters IN SHARE ROW EXCLUSIVE MODE")
+                repaired.extend(await shard.fetch_all(query))
+
+        if repaired:
+            print(f"Repaired loan counters of {len(repaired)} users.")
+        return len(repaired)
+
+    async def list_all_borrowings(
+        self,
+        since: date | None = None,
+        until: date | None = None,
+    ) -> list[Borrowing]:
         """
-        Retrieves all borrowing records from the database.
+        Retrieves borrowing records from all shards concurrently and
+        merges them in order of borrowed date. A date range restricts the
+        scan to the matching monthly partitions.
+
+        Args:
+            since (date | None): The earliest borrowed date, if any.
+            until (date | None): The latest borrowed date, if any.
 
         Returns:
-            list[Borrowing]: A list of all borrowing records.
+            list[Borrowing]: A list of borrowing records.
         """
-        query = borrowing_table.select()
-        borrowings = await database.fetch_all(query)
+        query = self._borrowed_between(borrowing_table.select(), since, until) \
+            .order_by(borrowing_table.c.borrowed_date, borrowing_table.c.id)
+        shards = await borrowing_shards.gather(lambda shard: shard.fetch_all(query))
+        borrowings = heapq.merge(*shards, key=lambda row: (row["borrowed_date"], row["id"]))
         return [Borrowing(**dict(borrowing)) for borrowing in borrowings]
     
     async def mark_borrowing_as_returned(self, borrowing_id: int, return_date: date) -> bool:
-        """Marks a borrowing as returned.
+        """Marks a borrowing as returned and, in a single transaction,
+        hands its copy to the next reservation in line or back to the
+        branch it was lent from.
 
         Args:
             borrowing_id (int): ID of the borrowing to mark as returned.
             return_date (date): The actual return date.
 
         Returns:
-            bool: True if the update was successful, otherwise False.
+            bool: True if the update was successful, False if the borrowing
+                does not exist or has already been returned.
         """
-        if self.get_borrowing_by_id(id):
-            query = borrowing_table.update().where(borrowing_table.c.id == borrowing_id).values(
-            status="returned",
-            return_date=return_date)
-            await database.execute(query)
-            return True
+        query = borrowing_table.update() \
+            .where(
+                (borrowing_table.c.id == borrowing_id) &
+                (borrowing_table.c.status == BorrowingStatus.BORROWED)
+            ) \
+            .values(status=BorrowingStatus.RETURNED, return_date=return_date) \
+            .returning(
+                borrowing_table.c.book_id,
+                borrowing_table.c.branch_id,
+                borrowing_table.c.copy_id,
+            )
+
+        for shard in borrowing_shards.databases:
+            async with shard.transaction():
+                returned = await shard.fetch_one(query)
+                if not returned:
+                    continue
+
+                async with database.transaction():
+                    await release_copy(returned["book_id"], returned["branch_id"], returned["copy_id"])
+                return True
+
         return False
     
-    async def get_borrowing_history_by_user(self, user_id: int) -> list[Borrowing]:
-        """Fetches the borrowing history for a specific user.
+    async def mark_borrowings_as_returned(
+        self,
+        items: list[BorrowingReturn],
+    ) -> list[BulkReturnResult]:
+        """Marks a batch of borrowings as returned with one multi-row
+        update and hands all freed copies to waiting reservations or back
+        to their branches, in a single transaction.
+
+        Args:
+            items (list[BorrowingReturn]): The borrowings and their return dates.
+
+        Returns:
+            list[BulkReturnResult]: The result of every item, in input order.
+        """
+        returns = func.unnest(
+            cast([item.borrowing_id for item in items], ARRAY(Integer)),
+            cast([item.return_date for item in items], ARRAY(Date)),
+        ).table_valued("borrowing_id", "return_date").render_derived(name="returns")
+        query = borrowing_table.update() \
+            .where(
+                (borrowing_table.c.id == returns.c.borrowing_id) &
+                (borrowing_table.c.status == BorrowingStatus.BORROWED)
+            ) \
+            .values(status=BorrowingStatus.RETURNED, return_date=returns.c.return_date) \
+            .returning(
+                borrowing_table.c.id,
+                borrowing_table.c.book_id,
+                borrowing_table.c.branch_id,
+                borrowing_table.c.copy_id,
+            )
+
+        returned = []
+        for shard in borrowing_shards.databases:
+            async with shard.transaction():
+                rows = await shard.fetch_all(query)
+                async with database.transaction():
+                    await release_copies([
+                        (row["book_id"], row["branch_id"], row["copy_id"]) for row in rows
+                    ])
+            returned.extend(rows)
+
+        returned_ids = {row["id"] for row in returned}
+        results = []
+        for item in items:
+            results.append(BulkReturnResult(
+                borrowing_id=item.borrowing_id,
+                returned=item.borrowing_id in returned_ids,
+            ))
+            returned_ids.discard(item.borrowing_id)
+
+        return results
+
+    async def get_borrowing_history_by_user(
+        self,
+        user_id: int,
+        since: date | None = None,
+        until: date | None = None,
+    ) -> list[Borrowing]:
+        """Fetches the borrowing history for a specific user, merging
+        returned borrowings of the hot table with the archived ones.
+        A date range restricts the scan to the matching monthly partitions.
 
         Args:
             user_id (int): ID of the user.
+            since (date | None): The earliest borrowed date, if any.
+            until (date | None): The latest borrowed date, if any.
 
         Returns:
             list[Borrowing]: List of borrowings with status 'returned'.
         """
-        query = borrowing_table.select().where(
+        hot_query = select(
+            borrowing_table.c.id,
+            borrowing_table.c.user_id,
+            borrowing_table.c.book_id,
+            borrowing_table.c.borrowed_date,
+            borrowing_table.c.planned_return_date,
+            borrowing_table.c.return_date,
+            borrowing_table.c.branch_id,
+            borrowing_table.c.copy_id,
+            borrowing_table.c.status,
+        ).where(
             (borrowing_table.c.user_id == user_id) &
-            (borrowing_table.c.status == "returned")
+            (borrowing_table.c.status == BorrowingStatus.RETURNED)
         )
-        rows = await database.fetch_all(query)
+        hot_query = self._borrowed_between(hot_query, since, until)
+
+        archive_query = select(
+            borrowing_archive_table.c.id,
+            borrowing_archive_table.c.user_id,
+            borrowing_archive_table.c.book_id,
+            borrowing_archive_table.c.borrowed_date,
+            borrowing_archive_table.c.planned_return_date,
+            borrowing_archive_table.c.return_date,
+            borrowing_archive_table.c.branch_id,
+            borrowing_archive_table.c.copy_id,
+            literal(BorrowingStatus.RETURNED, borrowing_table.c.status.type).label("status"),
+        ).where(borrowing_archive_table.c.user_id == user_id)
+        if since is not None:
+            archive_query = archive_query.where(borrowing_archive_table.c.borrowed_date >= since)
+        if until is not None:
+            archive_query = archive_query.where(borrowing_archive_table.c.borrowed_date <= until)
+
+        history = union_all(hot_query, archive_query).subquery()
+        query = select(history).order_by(history.c.borrowed_date, history.c.id)
+        rows = await borrowing_shards.for_user(user_id).fetch_all(query)
         return [Borrowing(**row) for row in rows]
+
+    async def archive_returned_borrowings(self, today: date | None = None) -> int:
+        """Moves borrowings returned more than `BORROWING_ARCHIVE_AFTER_DAYS`
+        ago from the hot table to the archive.
+
+        Rows are moved in batches, each with a single statement deleting
+        the rows and inserting what was deleted, so a row is never lost
+        nor present in both tables, and locks are held only briefly.
+
+        Args:
+            today (date | None): The reference date. Defaults to today.
+
+        Returns:
+            int: The number of archived borrowings.
+        """
+        cutoff = (today or date.today()) - timedelta(days=config.BORROWING_ARCHIVE_AFTER_DAYS)
+        columns = [
+            "id",
+            "user_id",
+            "book_id",
+            "borrowed_date",
+            "planned_return_date",
+            "return_date",
+            "branch_id",
+            "copy_id",
+        ]
+
+        batch = select(borrowing_table.c.id, borrowing_table.c.borrowed_date) \
+            .where(
+                (borrowing_table.c.status == BorrowingStatus.RETURNED) &
+                (borrowing_table.c.return_date < cutoff)
+            ) \
+            .limit(config.BORROWING_ARCHIVE_BATCH_SIZE) \
+            .with_for_update(skip_locked=True) \
+            .cte("batch")
+        moved = borrowing_table.delete() \
+            .where(
+                (borrowing_table.c.id == batch.c.id) &
+                (borrowing_table.c.borrowed_date == batch.c.borrowed_date)
+            ) \
+            .returning(*(borrowing_table.c[column] for column in columns)) \
+            .cte("moved")
+        archived = borrowing_archive_table.insert() \
+            .from_select(columns, select(*(moved.c[column] for column in columns))) \
+            .returning(borrowing_archive_table.c.id) \
+            .cte("archived")
+        query = select(func.count()).select_from(archived)
+
+        total = 0
+        for shard in borrowing_shards.databases:
+            while True:
+                count = await shard.fetch_val(query)
+                total += count
+                if count < config.BORROWING_ARCHIVE_BATCH_SIZE:
+                    break
+
+        return total
     
     async def delete_borrowing(self, borrowing_id: int) -> bool:
-        """Deletes a borrowing record by its id.
+        """Deletes a borrowing record by its id. The copy of an active loan
+        is released in the same transaction, as if it had been returned.
 
         Args:
             borrowing_id (int): ID of the borrowing to delete.
@@ -108,14 +778,35 @@ class BorrowingRepository(IBorrowingRepository):
         Returns:
             bool: True if the deletion was successful, otherwise False.
         """
-        if self.get_borrowing_by_id(id):
-            query = borrowing_table.delete().where(borrowing_table.c.id == borrowing_id)
-            await database.execute(query)
-            return True
+        query = borrowing_table.delete() \
+            .where(borrowing_table.c.id == borrowing_id) \
+            .returning(
+                borrowing_table.c.book_id,
+                borrowing_table.c.branch_id,
+                borrowing_table.c.copy_id,
+                borrowing_table.c.status,
+            )
+
+        for shard in borrowing_shards.databases:
+            async with shard.transaction():
+                deleted = await shard.fetch_one(query)
+                if not deleted:
+                    continue
+
+                if deleted["status"] == BorrowingStatus.BORROWED:
+                    async with database.transaction():
+                        await release_copy(deleted["book_id"], deleted["branch_id"], deleted["copy_id"])
+                return True
+
         return False
     
     async def update_borrowing(self, borrowing_id: int, borrowing_data: BorrowingIn) -> Borrowing | None:
-        """Updates an existing borrowing record.
+        """Updates an existing borrowing record. A borrowing handed to a
+        user of another shard is moved to that shard.
+
+        The book, branch, status and return date hold a claimed copy and
+        stock, so they are not overwritten. Setting the status of an active
+        loan to returned returns it as `mark_borrowing_as_returned` does.
 
         Args:
             borrowing_id (int): ID of the borrowing to update.
@@ -124,10 +815,234 @@ class BorrowingRepository(IBorrowingRepository):
         Returns:
             Borrowing | None: The updated borrowing record if successful, otherwise None.
         """
-        query = borrowing_table.update().where(borrowing_table.c.id == borrowing_id).values(
-            **borrowing_data.model_dump()
-        )
-        result = await database.execute(query)
-        if result:
-            return await self.get_borrowing_by_id(borrowing_id)
-        return None
\ No newline at end of file
+        updated = await self._update_borrowing_details(borrowing_id, borrowing_data)
+        if updated and updated.status == BorrowingStatus.BORROWED \
+                and borrowing_data.status == BorrowingStatus.RETURNED:
+            return_date = borrowing_data.return_date or date.today()
+            if await self.mark_borrowing_as_returned(borrowing_id, return_date):
+                updated = await self.get_borrowing_by_id(borrowing_id)
+
+        return updated
+
+    @staticmethod
+    async def _update_borrowing_details(borrowing_id: int, borrowing_data: BorrowingIn) -> Borrowing | None:
+        """Updates the fields of a borrowing which do not affect stock."""
+        values = borrowing_data.model_dump(exclude={"book_id", "branch_id", "status", "return_date"})
+        target = borrowing_shards.for_user(borrowing_data.user_id)
+        query = borrowing_table.update() \
+            .where(borrowing_table.c.id == borrowing_id) \
+            .values(**values) \
+            .returning(borrowing_table)
+        if updated := await target.fetch_one(query):
+            return Borrowing(**dict(updated))
+
+        move_query = borrowing_table.delete() \
+            .where(borrowing_table.c.id == borrowing_id) \
+            .returning(borrowing_table)
+        for shard in borrowing_shards.databases:
+            if shard is target:
+                continue
+            async with shard.transaction():
+                moved = await shard.fetch_one(move_query)
+                if not moved:
+                    continue
+                insert_query = borrowing_table.insert() \
+                    .values(**{**dict(moved), **values}) \
+                    .returning(borrowing_table)
+                async with target.transaction():
+                    return Borrowing(**dict(await target.fetch_one(insert_query)))
+
+        return None
+
+    @staticmethod
+    async def _eligibility_facts(loans: list[tuple[int, int, int | None]]) -> list[dict[str, Any]]:
+        """Fetches everything the checkout rules depend on for a list of
+        loans, with a single statement when borrowings are not sharded and
+        with one more statement per shard otherwise.
+
+        Args:
+            loans (list[tuple[int, int, int | None]]): User id, book id and
+                checkout branch id of every loan.
+
+        Returns:
+            list[dict[str, Any]]: One row of facts per pair, in input order.
+        """
+        loan_items = BorrowingRepository._loan_items(loans)
+        columns = BorrowingRepository._catalog_facts(loan_items)
+        if not borrowing_shards.sharded:
+            columns += BorrowingRepository._loan_facts(loan_items)
+        query = select(*columns).select_from(loan_items).order_by(loan_items.c.position)
+        facts = [dict(row) for row in await database.fetch_all(query)]
+        if not borrowing_shards.sharded:
+            return facts
+
+        for shard, positions in borrowing_shards.group_by_shard(
+            [user_id for user_id, _, _ in loans]
+        ).items():
+            loan_items = BorrowingRepository._loan_items([loans[position] for position in positions])
+            query = select(*BorrowingRepository._loan_facts(loan_items)) \
+                .select_from(loan_items) \
+                .order_by(loan_items.c.position)
+            for position, row in zip(positions, await shard.fetch_all(query)):
+                facts[position].update(row)
+
+        return facts
+
+    @staticmethod
+    def _loan_items(loans: list[tuple[int, int, int | None]]) -> TableValuedAlias:
+        """Builds a derived table of loans numbered by position.
+
+        Args:
+            loans (list[tuple[int, int, int | None]]): User id, book id and
+                checkout branch id of every loan.
+
+        Returns:
+            TableValuedAlias: The `loans` table with `user_id`, `book_id`,
+                `branch_id` and `position` columns.
+        """
+        return func.unnest(
+            cast([user_id for user_id, _, _ in loans], ARRAY(Integer)),
+            cast([book_id for _, book_id, _ in loans], ARRAY(Integer)),
+            cast([branch_id for _, _, branch_id in loans], ARRAY(Integer)),
+        ).table_valued("user_id", "book_id", "branch_id", with_ordinality="position") \
+            .render_derived(name="loans")
+
+    @staticmethod
+    def _catalog_facts(loan_items: TableValuedAlias) -> list[ColumnElement]:
+        """Lists the checkout facts kept in `database`.
+
+        Args:
+            loan_items (TableValuedAlias): The loans.
+
+        Returns:
+            list[ColumnElement]: The user, fine, book, stock, copy and
+                reservation facts.
+        """
+        copy_tracked = exists().where(book_copy_table.c.book_id == loan_items.c.book_id)
+
+        return [
+            exists()
+                .where(user_table.c.id == loan_items.c.user_id)
+                .label("user_exists"),
+            select(func.coalesce(func.sum(fine_table.c.amount), 0))
+                .where(
+                    (fine_table.c.user_id == loan_items.c.user_id) &
+                    (fine_table.c.paid.is_(False))
+                )
+                .scalar_subquery()
+                .label("outstanding_fines"),
+            case(
+                (
+                    copy_tracked,
+                    select(func.count())
+                        .where(
+                            (book_copy_table.c.book_id == loan_items.c.book_id) &
+                            (at_branch(loan_items.c.branch_id)) &
+                            (book_copy_table.c.status == CopyStatus.AVAILABLE)
+                        )
+                        .scalar_subquery(),
+                ),
+                (
+                    loan_items.c.branch_id.is_(None),
+                    select(book_table.c.copies_available)
+                        .where(book_table.c.id == loan_items.c.book_id)
+                        .scalar_subquery(),
+                ),
+                else_=select(book_stock_table.c.copies_available)
+                    .where(
+                        (book_stock_table.c.branch_id == loan_items.c.branch_id) &
+                        (book_stock_table.c.book_id == loan_items.c.book_id)
+                    )
+                    .scalar_subquery(),
+            ).label("copies_available"),
+            copy_tracked.label("copy_tracked"),
+            exists()
+                .where(book_table.c.id == loan_items.c.book_id)
+                .label("book_exists"),
+            exists()
+                .where(
+                    (reservation_table.c.user_id == loan_items.c.user_id) &
+                    (reservation_table.c.book_id == loan_items.c.book_id) &
+                    (reservation_table.c.status == "ready")
+                )
+                .label("reserved_for_user"),
+        ]
+
+    @staticmethod
+    def _loan_facts(loan_items: TableValuedAlias) -> list[ColumnElement]:
+        """Lists the checkout facts kept on the shards of users.
+
+        Args:
+            loan_items (TableValuedAlias): The loans.
+
+        Returns:
+            list[ColumnElement]: The active loan count and duplicate loan facts.
+        """
+        return [
+            func.coalesce(
+                select(user_loan_counter_table.c.active_loans)
+                    .where(user_loan_counter_table.c.user_id == loan_items.c.user_id)
+                    .scalar_subquery(),
+                0,
+            ).label("active_borrowings"),
+            exists()
+                .where(
+                    (borrowing_table.c.user_id == loan_items.c.user_id) &
+                    (borrowing_table.c.book_id == loan_items.c.book_id) &
+                    (borrowing_table.c.status == BorrowingStatus.BORROWED)
+                )
+                .label("duplicate_loan"),
+        ]
+
+    @staticmethod
+    def _failed_rules(
+        book_exists: bool,
+        available: bool,
+        active_borrowings: int,
+        outstanding_fines: float,
+        duplicate_loan: bool,
+    ) -> list[EligibilityRule]:
+        """Lists the checkout rules a loan would break.
+
+        Args:
+            book_exists (bool): Whether the book exists.
+            available (bool): Whether a copy is available to the user.
+            active_borrowings (int): The number of active loans of the user.
+            outstanding_fines (float): The total of unpaid fines of the user.
+            duplicate_loan (bool): Whether the user already has the book on loan.
+
+        Returns:
+            list[EligibilityRule]: The broken rules, empty if the loan is allowed.
+        """
+        failed_rules = []
+        if not book_exists:
+            failed_rules.append(EligibilityRule.BOOK_NOT_FOUND)
+        elif not available:
+            failed_rules.append(EligibilityRule.BOOK_UNAVAILABLE)
+        if active_borrowings >= config.MAX_ACTIVE_BORROWINGS:
+            failed_rules.append(EligibilityRule.ACTIVE_LOAN_LIMIT)
+        if outstanding_fines > config.MAX_OUTSTANDING_FINES:
+            failed_rules.append(EligibilityRule.OUTSTANDING_FINES)
+        if duplicate_loan:
+            failed_rules.append(EligibilityRule.DUPLICATE_LOAN)
+
+        return failed_rules
+
+    @staticmethod
+    def _borrowed_between(query: Select, since: date | None, until: date | None) -> Select:
+        """Restricts a query to a range of borrowed dates, which lets
+        Postgres prune partitions outside of the range.
+
+        Args:
+            query (Select): The query to restrict.
+            since (date | None): The earliest borrowed date, if any.
+            until (date | None): The latest borrowed date, if any.
+
+        Returns:
+            Select: The restricted query.
+        """
+        if since is not None:
+            query = query.where(borrowing_table.c.borrowed_date >= since)
+        if until is not None:
+            query = query.where(borrowing_table.c.borrowed_date <= until)
+        return query
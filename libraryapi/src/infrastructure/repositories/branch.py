@@ -0,0 +1,176 @@
+"""A repository for branch entity."""
+
+from sqlalchemy import Integer, cast, exists, func, select
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+
+from src.core.domain.branch import (
+    BookAvailability,
+    Branch,
+    BranchIn,
+    BranchStock,
+    BranchStockIn,
+)
+from src.core.repositories.ibranch import IBranchRepository
+from src.db import book_copy_table, book_stock_table, book_table, branch_table, database
+from src.infrastructure.utils.partitions import create_stock_partition
+
+
+class BranchRepository(IBranchRepository):
+    """A class implementing the database branch repository.
+
+    The stock of every branch is kept in its own partition of
+    `book_stock`, copies not assigned to any branch stay in
+    `books.copies_available`.
+    """
+
+    async def add_branch(self, data: BranchIn) -> Branch | None:
+        """
+        Adds a new branch and creates its stock partition in a single
+        transaction.
+
+        Args:
+            data (BranchIn): The branch data to add.
+
+        Returns:
+            Branch | None: The newly created branch, None if the name is taken.
+        """
+        async with database.transaction():
+            query = insert(branch_table) \
+                .values(**data.model_dump()) \
+                .on_conflict_do_nothing(index_elements=[branch_table.c.name]) \
+                .returning(branch_table)
+            branch = await database.fetch_one(query)
+            if not branch:
+                return None
+
+            await create_stock_partition(branch["id"])
+
+        return Branch(**dict(branch))
+
+    async def get_branch_by_id(self, branch_id: int) -> Branch | None:
+        """
+        Fetches a branch by its ID.
+
+        Args:
+            branch_id (int): The ID of the branch.
+
+        Returns:
+            Branch | None: The branch if found, otherwise None.
+        """
+        query = branch_table.select().where(branch_table.c.id == branch_id)
+        branch = await database.fetch_one(query)
+
+        return Branch(**dict(branch)) if branch else None
+
+    async def list_branches(self) -> list[Branch]:
+        """
+        Retrieves all branches ordered by name.
+
+        Returns:
+            list[Branch]: A list of all branches.
+        """
+        query = branch_table.select().order_by(branch_table.c.name)
+        branches = await database.fetch_all(query)
+
+        return [Branch(**dict(branch)) for branch in branches]
+
+    async def set_branch_stock(
+        self,
+        branch_id: int,
+        items: list[BranchStockIn],
+    ) -> list[BranchStock] | None:
+        """
+        Upserts the copies of a batch of books of a branch with a single
+        statement. Books which do not exist are skipped, the last entry
+        of a repeated book wins. Books with copy rows are skipped as well,
+        since their stock is derived from the copies.
+
+        Args:
+            branch_id (int): The ID of the branch.
+            items (list[BranchStockIn]): The copies per book.
+
+        Returns:
+            list[BranchStock] | None: The stored stock, None if the branch
+                does not exist.
+        """
+        if not await self.get_branch_by_id(branch_id):
+            return None
+
+        copies = {item.book_id: item.copies_available for item in items}
+        if not copies:
+            return []
+
+        stock = func.unnest(
+            cast(list(copies.keys()), ARRAY(Integer)),
+            cast(list(copies.values()), ARRAY(Integer)),
+        ).table_valued("book_id", "copies").render_derived(name="stock")
+        query = insert(book_stock_table).from_select(
+            ["branch_id", "book_id", "copies_available"],
+            select(
+                cast(branch_id, Integer),
+                book_table.c.id,
+                stock.c.copies,
+            ) \
+                .select_from(stock.join(book_table, book_table.c.id == stock.c.book_id)) \
+                .where(~exists().where(book_copy_table.c.book_id == book_table.c.id)),
+        )
+        query = query.on_conflict_do_update(
+            index_elements=[book_stock_table.c.branch_id, book_stock_table.c.book_id],
+            set_={"copies_available": query.excluded.copies_available},
+        ).returning(book_stock_table)
+        rows = await database.fetch_all(query)
+
+        return sorted(
+            (BranchStock(**dict(row)) for row in rows),
+            key=lambda row: row.book_id,
+        )
+
+    async def get_branch_stock(self, branch_id: int) -> list[BranchStock]:
+        """
+        Lists the stock of a branch, reading its partition only.
+
+        Args:
+            branch_id (int): The ID of the branch.
+
+        Returns:
+            list[BranchStock]: The copies per book of the branch.
+        """
+        query = book_stock_table.select() \
+            .where(book_stock_table.c.branch_id == branch_id) \
+            .order_by(book_stock_table.c.book_id)
+        rows = await database.fetch_all(query)
+
+        return [BranchStock(**dict(row)) for row in rows]
+
+    async def get_book_availability(self, book_id: int) -> BookAvailability | None:
+        """
+        Fetches the unassigned copies of a book and its copies on the
+        shelves of every branch which stocks it. For books with copy rows
+        the counts are cached, see `refresh_copy_availability`.
+
+        Args:
+            book_id (int): The ID of the book.
+
+        Returns:
+            BookAvailability | None: The availability if the book exists.
+        """
+        query = select(book_table.c.copies_available).where(book_table.c.id == book_id)
+        book = await database.fetch_one(query)
+        if not book:
+            return None
+
+        query = book_stock_table.select() \
+            .where(
+                (book_stock_table.c.book_id == book_id) &
+                (book_stock_table.c.copies_available > 0)
+            ) \
+            .order_by(book_stock_table.c.branch_id)
+        branches = [BranchStock(**dict(row)) for row in await database.fetch_all(query)]
+        unassigned = book["copies_available"] or 0
+
+        return BookAvailability(
+            book_id=book_id,
+            copies_available=unassigned + sum(branch.copies_available for branch in branches),
+            unassigned_copies=unassigned,
+            branches=branches,
+        )
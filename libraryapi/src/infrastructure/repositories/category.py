@@ -1,9 +1,15 @@
 """A repository for category entity."""
 
 from typing import Any
+from sqlalchemy import bindparam
 from src.core.domain.category import Category, CategoryIn
 from src.core.repositories.icategory import ICategoryRepository
 from src.db import category_table, database
+from src.infrastructure.utils.prepared import PreparedQuery
+
+GET_CATEGORY_BY_ID = PreparedQuery(
+    category_table.select().where(category_table.c.id == bindparam("category_id"))
+)
 
 
 class CategoryRepository(ICategoryRepository):
@@ -33,8 +39,7 @@ class CategoryRepository(ICategoryRepository):
         Returns:
             Any | None: The category record if found, otherwise None.
         """
-        query = category_table.select().where(category_table.c.id == category_id)
-        category = await database.fetch_one(query)
+        category = await GET_CATEGORY_BY_ID.fetch_one(category_id=category_id)
         return Category(**dict(category)) if category else None
     
     async def list_categories(self) -> list[Category]:
@@ -0,0 +1,312 @@
+"""A repository for book copy entity."""
+
+from sqlalchemy import Integer, String, cast, exists, func, select, true
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlalchemy.sql.expression import ColumnElement
+
+from src.core.domain.copy import BookCopy, BookCopyIn, BookCopyUpdate, CopyStatus
+from src.core.repositories.icopy import IBookCopyRepository
+from src.db import book_copy_table, book_stock_table, book_table, branch_table, database
+
+
+def at_branch(branch_id: ColumnElement | int | None) -> ColumnElement:
+    """A function matching copies of a location.
+
+    Args:
+        branch_id (ColumnElement | int | None): The branch id, None for
+            copies of no branch.
+
+    Returns:
+        ColumnElement: The condition on `book_copies.branch_id`.
+    """
+    if branch_id is None:
+        return book_copy_table.c.branch_id.is_(None)
+    if isinstance(branch_id, int):
+        return book_copy_table.c.branch_id == branch_id
+    return (book_copy_table.c.branch_id == branch_id) | (
+        (book_copy_table.c.branch_id.is_(None)) & (branch_id.is_(None))
+    )
+
+
+async def claim_copy(book_id: int, branch_id: int | None = None) -> int | None:
+    """A function lending any free copy of a book at a location.
+
+    The copy is picked with `FOR UPDATE SKIP LOCKED`, so concurrent
+    checkouts of the same title each take a different copy instead of
+    waiting for each other. Must be called inside a transaction.
+
+    Args:
+        book_id (int): The id of the book.
+        branch_id (int | None): The id of the branch, None for copies of
+            no branch.
+
+    Returns:
+        int | None: The id of the claimed copy, None if no copy is free.
+    """
+    free_copy = select(book_copy_table.c.id) \
+        .where(
+            (book_copy_table.c.book_id == book_id) &
+            (at_branch(branch_id)) &
+            (book_copy_table.c.status == CopyStatus.AVAILABLE)
+        ) \
+        .limit(1) \
+        .with_for_update(skip_locked=True) \
+        .scalar_subquery()
+    query = book_copy_table.update() \
+        .where(book_copy_table.c.id == free_copy) \
+        .values(status=CopyStatus.ON_LOAN, updated_at=func.now()) \
+        .returning(book_copy_table.c.id)
+    claimed = await database.fetch_one(query)
+
+    return claimed["id"] if claimed else None
+
+
+async def claim_copies(wanted: dict[tuple[int, int | None], int]) -> dict[tuple[int, int | None], list[int]]:
+    """A function lending free copies of a batch of books.
+
+    Every book and location takes up to the wanted number of its free
+    copies, picked with `FOR UPDATE SKIP LOCKED` in one statement. Copies
+    locked by concurrent checkouts are skipped, so fewer copies may be
+    claimed than wanted. Must be called inside a transaction.
+
+    Args:
+        wanted (dict[tuple[int, int | None], int]): Numbers of copies per
+            book id and branch id.
+
+    Returns:
+        dict[tuple[int, int | None], list[int]]: The ids of claimed copies
+            per book id and branch id.
+    """
+    if not wanted:
+        return {}
+
+    wants = func.unnest(
+        cast([book_id for book_id, _ in wanted], ARRAY(Integer)),
+        cast([branch_id for _, branch_id in wanted], ARRAY(Integer)),
+        cast(list(wanted.values()), ARRAY(Integer)),
+    ).table_valued("book_id", "branch_id", "copies").render_derived(name="wants")
+    free_copies = select(book_copy_table.c.id) \
+        .where(
+            (book_copy_table.c.book_id == wants.c.book_id) &
+            (at_branch(wants.c.branch_id)) &
+            (book_copy_table.c.status == CopyStatus.AVAILABLE)
+        ) \
+        .limit(wants.c.copies) \
+        .with_for_update(skip_locked=True) \
+        .lateral("free_copies")
+    claimed = select(free_copies.c.id) \
+        .select_from(wants.join(free_copies, true())) \
+        .cte("claimed")
+    query = book_copy_table.update() \
+        .where(book_copy_table.c.id == claimed.c.id) \
+        .values(status=CopyStatus.ON_LOAN, updated_at=func.now()) \
+        .returning(
+            book_copy_table.c.id,
+            book_copy_table.c.book_id,
+            book_copy_table.c.branch_id,
+        )
+
+    copies: dict[tuple[int, int | None], list[int]] = {}
+    for row in await database.fetch_all(query):
+        copies.setdefault((row["book_id"], row["branch_id"]), []).append(row["id"])
+
+    return copies
+
+
+async def mark_copies(copy_ids: list[int], status: CopyStatus) -> None:
+    """A function setting the status of copies taken back or handed over.
+
+    Args:
+        copy_ids (list[int]): The ids of the copies.
+        status (CopyStatus): The new status.
+    """
+    if not copy_ids:
+        return
+
+    query = book_copy_table.update() \
+        .where(book_copy_table.c.id.in_(copy_ids)) \
+        .values(status=status, updated_at=func.now())
+    await database.execute(query)
+
+
+async def refresh_copy_availability(book_ids: list[int] | None = None) -> int:
+    """A function deriving the copy counts of books with copy rows.
+
+    Checkouts and returns of such books only change their copies, so
+    `books.copies_available` and `book_stock` are a cache refreshed from
+    the free copies per location. Only changed counts are written.
+
+    Args:
+        book_ids (list[int] | None): The books to refresh. Defaults to all
+            books with copies.
+
+    Returns:
+        int: The number of changed counts.
+    """
+    copies = book_copy_table.c
+    available = copies.status == CopyStatus.AVAILABLE
+    scope = copies.book_id.in_(book_ids) if book_ids is not None else true()
+
+    central = select(
+        copies.book_id,
+        func.count().filter(available & copies.branch_id.is_(None)).label("copies"),
+    ) \
+        .where(scope) \
+        .group_by(copies.book_id) \
+        .subquery("central")
+    central_query = book_table.update() \
+        .where(
+            (book_table.c.id == central.c.book_id) &
+            (book_table.c.copies_available.is_distinct_from(central.c.copies))
+        ) \
+        .values(copies_available=central.c.copies) \
+        .returning(book_table.c.id)
+
+    shelved = select(
+        copies.branch_id,
+        copies.book_id,
+        func.count().filter(available),
+    ) \
+        .where(scope & copies.branch_id.is_not(None)) \
+        .group_by(copies.branch_id, copies.book_id)
+    shelved_query = insert(book_stock_table) \
+        .from_select(["branch_id", "book_id", "copies_available"], shelved)
+    shelved_query = shelved_query.on_conflict_do_update(
+        index_elements=[book_stock_table.c.branch_id, book_stock_table.c.book_id],
+        set_={"copies_available": shelved_query.excluded.copies_available},
+        where=book_stock_table.c.copies_available != shelved_query.excluded.copies_available,
+    ).returning(book_stock_table.c.book_id)
+
+    # Branches left without copies of a book keep a stale count otherwise.
+    emptied_query = book_stock_table.update() \
+        .where(
+            (book_stock_table.c.copies_available > 0) &
+            (exists().where((copies.book_id == book_stock_table.c.book_id) & scope)) &
+            ~exists().where(
+                (copies.book_id == book_stock_table.c.book_id) &
+                (copies.branch_id == book_stock_table.c.branch_id)
+            )
+        ) \
+        .values(copies_available=0) \
+        .returning(book_stock_table.c.book_id)
+
+    changed = 0
+    async with database.transaction():
+        for query in (central_query, shelved_query, emptied_query):
+            changed += len(await database.fetch_all(query))
+
+    return changed
+
+
+class BookCopyRepository(IBookCopyRepository):
+    """A class implementing the database book copy repository."""
+
+    async def add_copies(self, items: list[BookCopyIn]) -> list[BookCopy]:
+        """
+        Registers a batch of copies with a single statement and refreshes
+        the copy counts of their books. Copies of unknown books or
+        branches and already registered barcodes are skipped, the first
+        entry of a repeated barcode wins.
+
+        Args:
+            items (list[BookCopyIn]): The copies to register.
+
+        Returns:
+            list[BookCopy]: The registered copies.
+        """
+        unique: dict[str, BookCopyIn] = {}
+        for item in items:
+            unique.setdefault(item.barcode, item)
+        items = list(unique.values())
+
+        new_copies = func.unnest(
+            cast([item.book_id for item in items], ARRAY(Integer)),
+            cast([item.barcode for item in items], ARRAY(String)),
+            cast([item.branch_id for item in items], ARRAY(Integer)),
+        ).table_valued("book_id", "barcode", "branch_id").render_derived(name="new_copies")
+        known = select(new_copies.c.book_id, new_copies.c.barcode, new_copies.c.branch_id) \
+            .join(book_table, book_table.c.id == new_copies.c.book_id) \
+            .where(
+                (new_copies.c.branch_id.is_(None)) |
+                (exists().where(branch_table.c.id == new_copies.c.branch_id))
+            )
+        query = insert(book_copy_table) \
+            .from_select(["book_id", "barcode", "branch_id"], known) \
+            .on_conflict_do_nothing(index_elements=[book_copy_table.c.barcode]) \
+            .returning(book_copy_table)
+
+        async with database.transaction():
+            rows = await database.fetch_all(query)
+            if rows:
+                await refresh_copy_availability(sorted({row["book_id"] for row in rows}))
+
+        return sorted((BookCopy(**dict(row)) for row in rows), key=lambda copy: copy.id)
+
+    async def get_copy_by_barcode(self, barcode: str) -> BookCopy | None:
+        """
+        Fetches a copy by its barcode.
+
+        Args:
+            barcode (str): The barcode of the copy.
+
+        Returns:
+            BookCopy | None: The copy if found, otherwise None.
+        """
+        query = book_copy_table.select().where(book_copy_table.c.barcode == barcode)
+        copy = await database.fetch_one(query)
+
+        return BookCopy(**dict(copy)) if copy else None
+
+    async def get_copies_by_book(self, book_id: int) -> list[BookCopy]:
+        """
+        Lists all copies of a book.
+
+        Args:
+            book_id (int): The ID of the book.
+
+        Returns:
+            list[BookCopy]: The copies of the book.
+        """
+        query = book_copy_table.select() \
+            .where(book_copy_table.c.book_id == book_id) \
+            .order_by(book_copy_table.c.id)
+        rows = await database.fetch_all(query)
+
+        return [BookCopy(**dict(row)) for row in rows]
+
+    async def update_copy(self, copy_id: int, data: BookCopyUpdate) -> BookCopy | None:
+        """
+        Moves a copy on the shelf to another location or withdraws it,
+        and refreshes the copy counts of its book.
+
+        Args:
+            copy_id (int): The ID of the copy.
+            data (BookCopyUpdate): The new location and status.
+
+        Returns:
+            BookCopy | None: The updated copy, None if it does not exist or
+                is on loan or held for a reservation.
+        """
+        query = book_copy_table.update() \
+            .where(
+                (book_copy_table.c.id == copy_id) &
+                (book_copy_table.c.status.in_([CopyStatus.AVAILABLE, CopyStatus.WITHDRAWN]))
+            ) \
+            .values(**data.model_dump(), updated_at=func.now()) \
+            .returning(book_copy_table)
+
+        async with database.transaction():
+            copy = await database.fetch_one(query)
+            if copy:
+                await refresh_copy_availability([copy["book_id"]])
+
+        return BookCopy(**dict(copy)) if copy else None
+
+    async def refresh_copy_availability(self) -> int:
+        """
+        Refreshes the cached copy counts of all books with copies.
+
+        Returns:
+            int: The number of changed counts.
+        """
+        return await refresh_copy_availability()
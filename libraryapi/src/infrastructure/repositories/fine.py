@@ -0,0 +1,219 @@
+"""A repository for fine entity."""
+
+from datetime import date, timedelta
+
+from sqlalchemy import Integer, case, cast, func, literal, select
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlalchemy.sql.expression import Select, Subquery, TableValuedAlias
+
+from src.config import config
+from src.core.domain.borrowing import BorrowingStatus
+from src.core.domain.fine import Fine, FineTotal
+from src.core.repositories.ifine import IFineRepository
+from src.db import (
+    Database,
+    borrowing_shards,
+    borrowing_table,
+    database,
+    fine_table,
+    rollup_watermark_table,
+)
+
+WATERMARK = "fines"
+
+
+class FineRepository(IFineRepository):
+    """A class implementing the database fine repository."""
+
+    async def assess_fines(self, today: date) -> int:
+        """
+        Computes fines for all overdue borrowings in one set-based statement.
+
+        Returned borrowings are charged up to their return date, active ones
+        up to `today`. Existing unpaid fines are updated in place, paid ones
+        are left untouched.
+
+        The fine of a returned borrowing only changes with the borrowing, so
+        only active loans and borrowings updated since the day before the
+        last completed assessment are considered. With sharded borrowings they are
+        read from every shard in batches of `FINE_ASSESSMENT_BATCH_SIZE`
+        and each batch is upserted with one statement.
+
+        Args:
+            today (date): The date the fines are assessed on.
+
+        Returns:
+            int: Number of created or updated fines.
+        """
+        watermark_query = select(rollup_watermark_table.c.refreshed_through) \
+            .where(rollup_watermark_table.c.name == WATERMARK)
+        watermark = await database.fetch_val(watermark_query)
+        changed = borrowing_table.c.status == BorrowingStatus.BORROWED
+        if watermark is not None:
+            since = min(watermark, today) - timedelta(days=1)
+            changed = changed | (borrowing_table.c.updated_at >= since)
+
+        end_date = case(
+            (borrowing_table.c.status == BorrowingStatus.RETURNED, borrowing_table.c.return_date),
+            else_=literal(today),
+        )
+        days_overdue = end_date - borrowing_table.c.planned_return_date
+
+        overdue_query = select(
+            borrowing_table.c.id.label("borrowing_id"),
+            borrowing_table.c.user_id,
+            days_overdue.label("days_overdue"),
+        ).where(
+            (borrowing_table.c.planned_return_date.is_not(None)) &
+            (borrowing_table.c.planned_return_date < today) &
+            (days_overdue > 0) &
+            changed
+        )
+
+        if borrowing_shards.sharded:
+            assessed = 0
+            for shard in borrowing_shards.databases:
+                assessed += await self._assess_shard_fines(shard, overdue_query, today)
+        else:
+            assessed = await self._upsert_fines(overdue_query.subquery("overdue"), today)
+
+        watermark = insert(rollup_watermark_table) \
+            .values(name=WATERMARK, refreshed_through=today)
+        watermark = watermark.on_conflict_do_update(
+            index_elements=[rollup_watermark_table.c.name],
+            set_={
+                "refreshed_through": watermark.excluded.refreshed_through,
+                "updated_at": func.now(),
+            },
+        )
+        await database.execute(watermark)
+
+        return assessed
+
+    async def _assess_shard_fines(self, shard: Database, overdue_query: Select, today: date) -> int:
+        """Upserts fines of overdue borrowings of a shard in batches.
+
+        Args:
+            shard (Database): The shard of borrowings.
+            overdue_query (Select): The query of overdue borrowings.
+            today (date): The date the fines are assessed on.
+
+        Returns:
+            int: Number of created or updated fines.
+        """
+        assessed = 0
+        last_id = 0
+        while True:
+            batch_query = overdue_query \
+                .where(borrowing_table.c.id > last_id) \
+                .order_by(borrowing_table.c.id) \
+                .limit(config.FINE_ASSESSMENT_BATCH_SIZE)
+            rows = await shard.fetch_all(batch_query)
+            if not rows:
+                return assessed
+
+            overdue = func.unnest(
+                cast([row["borrowing_id"] for row in rows], ARRAY(Integer)),
+                cast([row["user_id"] for row in rows], ARRAY(Integer)),
+                cast([row["days_overdue"] for row in rows], ARRAY(Integer)),
+            ).table_valued("borrowing_id", "user_id", "days_overdue").render_derived(name="overdue")
+            assessed += await self._upsert_fines(overdue, today)
+
+            if len(rows) < config.FINE_ASSESSMENT_BATCH_SIZE:
+                return assessed
+            last_id = rows[-1]["borrowing_id"]
+
+    @staticmethod
+    async def _upsert_fines(overdue: Subquery | TableValuedAlias, today: date) -> int:
+        """Creates or updates fines of overdue borrowings.
+
+        Args:
+            overdue (Subquery | TableValuedAlias): Borrowing ids, user ids
+                and days overdue.
+            today (date): The date the fines are assessed on.
+
+        Returns:
+            int: Number of created or updated fines.
+        """
+        statement = insert(fine_table).from_select(
+            ["borrowing_id", "user_id", "days_overdue", "amount", "assessed_on", "paid"],
+            select(
+                overdue.c.borrowing_id,
+                overdue.c.user_id,
+                overdue.c.days_overdue,
+                overdue.c.days_overdue * literal(config.FINE_RATE),
+                literal(today),
+                literal(False),
+            ),
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=[fine_table.c.borrowing_id],
+            set_={
+                "days_overdue": statement.excluded.days_overdue,
+                "amount": statement.excluded.amount,
+                "assessed_on": statement.excluded.assessed_on,
+            },
+            where=(fine_table.c.paid.is_(False)) &
+                  (fine_table.c.days_overdue != statement.excluded.days_overdue),
+        ).returning(fine_table.c.id)
+
+        assessed = statement.cte("assessed")
+        query = select(func.count()).select_from(assessed)
+
+        return await database.fetch_val(query)
+
+    async def get_fines_by_user(self, user_id: int) -> list[Fine]:
+        """
+        Fetches fines of a user.
+
+        Args:
+            user_id (int): The ID of the user.
+
+        Returns:
+            list[Fine]: Fines of the user, newest first.
+        """
+        query = fine_table.select() \
+            .where(fine_table.c.user_id == user_id) \
+            .order_by(fine_table.c.id.desc())
+        rows = await database.fetch_all(query)
+
+        return [Fine(**dict(row)) for row in rows]
+
+    async def get_user_fine_total(self, user_id: int) -> FineTotal:
+        """
+        Fetches the total of unpaid fines of a user. The query is covered
+        by the partial index of unpaid fines including the amount.
+
+        Args:
+            user_id (int): The ID of the user.
+
+        Returns:
+            FineTotal: The total of unpaid fines.
+        """
+        query = select(
+            func.coalesce(func.sum(fine_table.c.amount), 0).label("total"),
+            func.count().label("count"),
+        ).where(
+            (fine_table.c.user_id == user_id) &
+            (fine_table.c.paid.is_(False))
+        )
+        row = await database.fetch_one(query)
+
+        return FineTotal(user_id=user_id, total=row["total"], count=row["count"])
+
+    async def pay_fine(self, fine_id: int) -> bool:
+        """
+        Marks a fine as paid.
+
+        Args:
+            fine_id (int): The ID of the fine.
+
+        Returns:
+            bool: True if the fine was unpaid and is now paid, otherwise False.
+        """
+        query = fine_table.update() \
+            .where((fine_table.c.id == fine_id) & (fine_table.c.paid.is_(False))) \
+            .values(paid=True, paid_at=func.now()) \
+            .returning(fine_table.c.id)
+
+        return await database.fetch_one(query) is not None
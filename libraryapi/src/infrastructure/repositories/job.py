@@ -0,0 +1,161 @@
+"""A repository for job entity."""
+
+from datetime import timedelta
+
+from sqlalchemy import func, select
+
+from src.config import config
+from src.core.domain.job import Job, JobIn
+from src.core.repositories.ijob import IJobRepository
+from src.db import database, job_table
+
+PENDING_STATUSES = ("queued", "running")
+
+
+class JobRepository(IJobRepository):
+    """A class implementing the Postgres-backed job queue."""
+
+    async def enqueue_job(self, data: JobIn) -> Job:
+        """
+        Adds a new job to the queue.
+
+        Args:
+            data (JobIn): The job data.
+
+        Returns:
+            Job: The queued job.
+        """
+        query = job_table.insert() \
+            .values(
+                kind=data.kind.value,
+                payload=data.payload,
+                status="queued",
+                attempts=0,
+                max_attempts=config.JOB_MAX_ATTEMPTS,
+            ) \
+            .returning(job_table)
+        job = await database.fetch_one(query)
+
+        return Job(**dict(job))
+
+    async def get_job_by_id(self, job_id: int) -> Job | None:
+        """
+        Fetches a job by its ID.
+
+        Args:
+            job_id (int): The ID of the job.
+
+        Returns:
+            Job | None: The job if found, otherwise None.
+        """
+        query = job_table.select().where(job_table.c.id == job_id)
+        job = await database.fetch_one(query)
+
+        return Job(**dict(job)) if job else None
+
+    async def dequeue_job(self) -> Job | None:
+        """
+        Takes the next due job with `FOR UPDATE SKIP LOCKED`, so concurrent
+        workers never wait for each other nor take the same job. Running
+        jobs whose visibility timeout passed are taken again, unless they
+        have used up their attempts, in which case they are marked failed.
+
+        Returns:
+            Job | None: The taken job, None if no job is due.
+        """
+        expired = (job_table.c.status == "running") & (job_table.c.locked_until < func.now())
+
+        give_up_query = job_table.update() \
+            .where(expired & (job_table.c.attempts >= job_table.c.max_attempts)) \
+            .values(
+                status="failed",
+                last_error="Visibility timeout exceeded.",
+                updated_at=func.now(),
+            )
+        await database.execute(give_up_query)
+
+        due = ((job_table.c.status == "queued") & (job_table.c.run_at <= func.now())) | expired
+        next_job = select(job_table.c.id) \
+            .where(due & (job_table.c.attempts < job_table.c.max_attempts)) \
+            .order_by(job_table.c.run_at) \
+            .limit(1) \
+            .with_for_update(skip_locked=True) \
+            .scalar_subquery()
+        query = job_table.update() \
+            .where(job_table.c.id == next_job) \
+            .values(
+                status="running",
+                attempts=job_table.c.attempts + 1,
+                locked_until=func.now() + timedelta(seconds=config.JOB_VISIBILITY_TIMEOUT_SECONDS),
+                updated_at=func.now(),
+            ) \
+            .returning(job_table)
+        job = await database.fetch_one(query)
+
+        return Job(**dict(job)) if job else None
+
+    async def complete_job(self, job: Job, result: dict | None) -> bool:
+        """
+        Marks a taken job as succeeded.
+
+        Args:
+            job (Job): The job returned by `dequeue_job`.
+            result (dict | None): The result of the job.
+
+        Returns:
+            bool: False if the job has meanwhile been taken by another worker.
+        """
+        query = job_table.update() \
+            .where(self._owned(job)) \
+            .values(
+                status="succeeded",
+                result=result,
+                locked_until=None,
+                last_error=None,
+                updated_at=func.now(),
+            ) \
+            .returning(job_table.c.id)
+
+        return await database.fetch_one(query) is not None
+
+    async def fail_job(self, job: Job, error: str) -> bool:
+        """
+        Schedules a retry with exponential backoff, or marks the job as
+        failed once it has used up its attempts.
+
+        Args:
+            job (Job): The job returned by `dequeue_job`.
+            error (str): The description of the error.
+
+        Returns:
+            bool: False if the job has meanwhile been taken by another worker.
+        """
+        if job.attempts >= job.max_attempts:
+            values = {"status": "failed"}
+        else:
+            backoff = config.JOB_RETRY_BASE_SECONDS * 2 ** (job.attempts - 1)
+            values = {
+                "status": "queued",
+                "run_at": func.now() + timedelta(seconds=backoff),
+            }
+
+        query = job_table.update() \
+            .where(self._owned(job)) \
+            .values(
+                **values,
+                last_error=error,
+                locked_until=None,
+                updated_at=func.now(),
+            ) \
+            .returning(job_table.c.id)
+
+        return await database.fetch_one(query) is not None
+
+    @staticmethod
+    def _owned(job: Job):
+        """The attempt number fences off workers whose visibility timed out."""
+        return (
+            (job_table.c.id == job.id) &
+            (job_table.c.status == "running") &
+            (job_table.c.attempts == job.attempts)
+        )
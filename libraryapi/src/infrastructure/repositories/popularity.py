@@ -0,0 +1,130 @@
+"""A repository for book popularity."""
+
+from datetime import datetime, timezone
+
+from asyncpg import InterfaceError
+from asyncpg.exceptions import (
+    PostgresConnectionError,
+    QueryCanceledError,
+    TransactionRollbackError,
+)
+from sqlalchemy import Float, Integer, cast, func, select
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+
+from src.core.domain.popularity import BookPopularity
+from src.core.repositories.ipopularity import IPopularityRepository
+from src.db import book_popularity_table, book_table, database
+from src.infrastructure.utils.popularity import popularity_tracker
+
+# Errors after which a retried flush may succeed, so pending counters are kept.
+TRANSIENT_ERRORS = (
+    OSError,
+    InterfaceError,
+    PostgresConnectionError,
+    QueryCanceledError,
+    TransactionRollbackError,
+)
+
+
+class PopularityRepository(IPopularityRepository):
+    """A class implementing the book popularity repository.
+
+    Reads are served from the in-memory tracker, the database table is
+    only used to merge counters of all workers.
+    """
+
+    async def get_trending_books(self, limit: int) -> list[BookPopularity]:
+        """
+        Retrieves the currently most popular books.
+
+        Args:
+            limit (int): Maximal number of returned books.
+
+        Returns:
+            list[BookPopularity]: Popularity of books, most popular first.
+        """
+        return [
+            BookPopularity(book_id=book_id, score=score, borrow_count=borrow_count)
+            for book_id, score, borrow_count in popularity_tracker.trending(limit)
+        ]
+
+    async def get_book_popularity(self, book_id: int) -> BookPopularity:
+        """
+        Retrieves the popularity of a single book.
+
+        Args:
+            book_id (int): The ID of the book.
+
+        Returns:
+            BookPopularity: The popularity of the book.
+        """
+        score, borrow_count = popularity_tracker.get(book_id)
+        return BookPopularity(book_id=book_id, score=score, borrow_count=borrow_count)
+
+    async def flush_popularity(self) -> int:
+        """
+        Adds pending counters to the `book_popularity` table in one batch
+        and reloads the merged counters of all workers.
+
+        The upsert decays the stored score and adds the increments in a
+        single atomic statement, so concurrent flushes of several workers
+        never overwrite each other. Rows are sent in book id order to keep
+        lock acquisition order the same in every worker.
+
+        Counters are joined with `books`, so counters of books deleted in
+        the meantime are dropped instead of failing the whole batch. They
+        are kept for the next flush only after transient errors.
+
+        Returns:
+            int: Number of books whose counters were flushed.
+        """
+        pending = popularity_tracker.take_pending()
+
+        if pending:
+            book_ids, counts = zip(*sorted(pending.items()))
+            counters = func.unnest(
+                cast(list(book_ids), ARRAY(Integer)),
+                cast(list(counts), ARRAY(Integer)),
+            ).table_valued("book_id", "borrow_count").render_derived(name="counters")
+            rows = select(
+                counters.c.book_id,
+                cast(counters.c.borrow_count, Float),
+                counters.c.borrow_count,
+            ) \
+                .join(book_table, book_table.c.id == counters.c.book_id) \
+                .order_by(counters.c.book_id) \
+                .with_for_update(key_share=True, of=book_table)
+            statement = insert(book_popularity_table).from_select(
+                ["book_id", "score", "borrow_count"],
+                rows,
+            )
+            age = func.extract("epoch", func.now() - book_popularity_table.c.updated_at)
+            statement = statement.on_conflict_do_update(
+                index_elements=[book_popularity_table.c.book_id],
+                set_={
+                    "score": book_popularity_table.c.score
+                    * func.exp(-popularity_tracker.decay_rate * age)
+                    + statement.excluded.score,
+                    "borrow_count": book_popularity_table.c.borrow_count
+                    + statement.excluded.borrow_count,
+                    "updated_at": func.now(),
+                },
+            )
+            try:
+                await database.execute(statement)
+            except TRANSIENT_ERRORS:
+                popularity_tracker.restore_pending(pending)
+                raise
+
+        rows = await database.fetch_all(select(book_popularity_table))
+        popularity_tracker.load(
+            (
+                row["book_id"],
+                row["score"],
+                row["borrow_count"],
+                (row["updated_at"] or datetime.now(timezone.utc)).timestamp(),
+            )
+            for row in rows
+        )
+
+        return len(pending)
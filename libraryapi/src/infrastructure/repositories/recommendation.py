@@ -1,8 +1,9 @@
 from typing import Any, List
-from sqlalchemy import func, select
+from sqlalchemy import Integer, TableValuedAlias, cast, func, select
+from sqlalchemy.dialects.postgresql import ARRAY
 from src.core.domain.recommendation import Recommendation
 from src.core.repositories.irecommendation import IRecommendationRepository
-from src.db import book_table, database, borrowing_table, category_table
+from src.db import book_table, database, borrowing_shards, borrowing_table, category_table
 
 
 class RecommendationRepository(IRecommendationRepository):
@@ -19,13 +20,17 @@ class RecommendationRepository(IRecommendationRepository):
             Recommendation: Recommendations generated for the user based on categories.
         """
         # Query to get the most borrowed category by the user
+        borrowed = await self._borrowed_books(user_id)
+        if borrowed is None:
+            return Recommendation(user_id=user_id, recommended_books=[], reason="No borrowing history available.")
+
         query = (
-            select(category_table.c.id, func.count(borrowing_table.c.id).label("count"))
-            .join(book_table, borrowing_table.c.book_id == book_table.c.id)
+            select(category_table.c.id, func.sum(borrowed.c.count).label("count"))
+            .select_from(borrowed)
+            .join(book_table, borrowed.c.book_id == book_table.c.id)
             .join(category_table, book_table.c.category_id == category_table.c.id)
-            .where(borrowing_table.c.user_id == user_id)
             .group_by(category_table.c.id)
-            .order_by(func.count(borrowing_table.c.id).desc())
+            .order_by(func.sum(borrowed.c.count).desc())
         )
         result = await database.fetch_one(query)
 
@@ -51,12 +56,16 @@ class RecommendationRepository(IRecommendationRepository):
             Recommendation: Recommendations generated for the user based on authors.
         """
         # Query to get the most borrowed author by the user
+        borrowed = await self._borrowed_books(user_id)
+        if borrowed is None:
+            return Recommendation(user_id=user_id, recommended_books=[], reason="No borrowing history available.")
+
         query = (
-            select(book_table.c.author_id, func.count(borrowing_table.c.id).label("count"))
-            .join(book_table, borrowing_table.c.book_id == book_table.c.id)
-            .where(borrowing_table.c.user_id == user_id)
+            select(book_table.c.author_id, func.sum(borrowed.c.count).label("count"))
+            .select_from(borrowed)
+            .join(book_table, borrowed.c.book_id == book_table.c.id)
             .group_by(book_table.c.author_id)
-            .order_by(func.count(borrowing_table.c.id).desc())
+            .order_by(func.sum(borrowed.c.count).desc())
         )
         result = await database.fetch_one(query)
 
@@ -70,3 +79,31 @@ class RecommendationRepository(IRecommendationRepository):
 
         recommended_books = [book["id"] for book in books]
         return Recommendation(user_id=user_id, recommended_books=recommended_books, reason="Based on your favorite author.")
+
+    @staticmethod
+    async def _borrowed_books(user_id: int) -> TableValuedAlias | None:
+        """
+        Counts the borrowings of a user per book on the user's shard. Books
+        stay in the main database, so the counts are passed back to it as
+        a table to be joined with.
+
+        Args:
+            user_id (int): The ID of the user.
+
+        Returns:
+            TableValuedAlias | None: The `book_id` and `count` rows, None
+                if the user has not borrowed anything.
+        """
+        query = (
+            select(borrowing_table.c.book_id, func.count().label("count"))
+            .where(borrowing_table.c.user_id == user_id)
+            .group_by(borrowing_table.c.book_id)
+        )
+        rows = await borrowing_shards.for_user(user_id).fetch_all(query)
+        if not rows:
+            return None
+
+        return func.unnest(
+            cast([row["book_id"] for row in rows], ARRAY(Integer)),
+            cast([row["count"] for row in rows], ARRAY(Integer)),
+        ).table_valued("book_id", "count").render_derived(name="borrowed")
@@ -0,0 +1,437 @@
+"""A repository for reservation entity."""
+
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from sqlalchemy import Integer, cast, exists, func, literal, literal_column, select
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+
+from src.config import config
+from src.core.domain.reservation import (
+    Reservation,
+    ReservationIn,
+    ReservationPosition,
+)
+from src.core.repositories.ireservation import IReservationRepository
+from src.core.domain.copy import CopyStatus
+from src.db import (
+    book_copy_table,
+    book_stock_table,
+    book_table,
+    database,
+    reservation_table,
+)
+from src.infrastructure.repositories.copy import mark_copies
+
+OPEN_STATUSES = ("waiting", "ready")
+# Inlined rather than bound, so queue lookups match the predicate of the
+# partial `ix_reservations_waiting_queue` index also in the generic plans
+# of prepared statements, where a bound status cannot be matched.
+WAITING = literal_column("'waiting'")
+
+
+async def restock_branches(copies: dict[tuple[int, int], int]) -> None:
+    """A function putting freed copies back on the shelves of branches.
+
+    Args:
+        copies (dict[tuple[int, int], int]): Numbers of copies per book id
+            and branch id.
+    """
+    if not copies:
+        return
+
+    restocked = func.unnest(
+        cast([book_id for book_id, _ in copies], ARRAY(Integer)),
+        cast([branch_id for _, branch_id in copies], ARRAY(Integer)),
+        cast(list(copies.values()), ARRAY(Integer)),
+    ).table_valued("book_id", "branch_id", "copies").render_derived(name="restocked")
+    query = insert(book_stock_table).from_select(
+        ["branch_id", "book_id", "copies_available"],
+        select(restocked.c.branch_id, restocked.c.book_id, restocked.c.copies),
+    )
+    query = query.on_conflict_do_update(
+        index_elements=[book_stock_table.c.branch_id, book_stock_table.c.book_id],
+        set_={
+            "copies_available": book_stock_table.c.copies_available + query.excluded.copies_available,
+        },
+    )
+    await database.execute(query)
+
+
+async def release_copy(
+    book_id: int,
+    branch_id: int | None = None,
+    copy_id: int | None = None,
+) -> int | None:
+    """A function handing a freed copy of a book to the next holder in line.
+
+    The next waiting reservation is picked with `FOR UPDATE SKIP LOCKED`,
+    so concurrent returns of the same title each take a different holder
+    instead of waiting for each other. The reservation is then held at the
+    branch of the copy. When nobody is waiting, the copy goes back to the
+    stock of its branch, or to `copies_available` of the book if it
+    belongs to no branch. A copy row is marked held or put back on the
+    shelf instead, the copy counts of its book are refreshed later. Must be
+    called inside a transaction.
+
+    Args:
+        book_id (int): The id of the book whose copy was freed.
+        branch_id (int | None): The id of the branch of the copy, if any.
+        copy_id (int | None): The id of the copy row, if the book has them.
+
+    Returns:
+        int | None: The id of the reservation which got the copy, if any.
+    """
+    next_in_line = select(reservation_table.c.id) \
+        .where(
+            (reservation_table.c.book_id == book_id) &
+            (reservation_table.c.status == WAITING)
+        ) \
+        .order_by(reservation_table.c.id) \
+        .limit(1) \
+        .with_for_update(skip_locked=True) \
+        .scalar_subquery()
+    assign_query = reservation_table.update() \
+        .where(reservation_table.c.id == next_in_line) \
+        .values(status="ready", ready_at=func.now(), branch_id=branch_id, copy_id=copy_id) \
+        .returning(reservation_table.c.id)
+    assigned = await database.fetch_one(assign_query)
+
+    if copy_id is not None:
+        await mark_copies([copy_id], CopyStatus.HELD if assigned else CopyStatus.AVAILABLE)
+    if assigned:
+        return assigned["id"]
+    if copy_id is not None:
+        return None
+
+    if branch_id is not None:
+        await restock_branches({(book_id, branch_id): 1})
+        return None
+
+    release_query = book_table.update() \
+        .where(book_table.c.id == book_id) \
+        .values(copies_available=func.coalesce(book_table.c.copies_available, 0) + 1)
+    await database.execute(release_query)
+
+    return None
+
+
+async def release_copies(copies: list[tuple[int, int | None, int | None]]) -> int:
+    """A function handing a batch of freed copies to holders in line.
+
+    Waiting reservations of all freed books are locked with
+    `FOR UPDATE SKIP LOCKED` and ranked per book, as are the freed copies,
+    so every book hands as many copies to its queue as it got back in one
+    statement and each reservation is held at the branch of its copy.
+    Copies nobody waits for go back to the stock of their branches or to
+    `copies_available` of their books, copy rows are marked held or put
+    back on the shelf. Must be called inside a transaction.
+
+    Args:
+        copies (list[tuple[int, int | None, int | None]]): The book id,
+            branch id and copy row id of every freed copy, the branch id is
+            None for copies of no branch and the copy id for books without
+            copy rows.
+
+    Returns:
+        int: The number of reservations which got a copy.
+    """
+    freed_copies = Counter(copies)
+    if not freed_copies:
+        return 0
+
+    copies = sorted(copies, key=lambda copy: (copy[0], copy[1] or 0, copy[2] or 0))
+    copy_items = func.unnest(
+        cast([book_id for book_id, _, _ in copies], ARRAY(Integer)),
+        cast([branch_id for _, branch_id, _ in copies], ARRAY(Integer)),
+        cast([copy_id for _, _, copy_id in copies], ARRAY(Integer)),
+    ).table_valued("book_id", "branch_id", "copy_id", with_ordinality="position") \
+        .render_derived(name="copies")
+    freed = select(
+        copy_items.c.book_id,
+        copy_items.c.branch_id,
+        copy_items.c.copy_id,
+        func.row_number().over(
+            partition_by=copy_items.c.book_id,
+            order_by=copy_items.c.position,
+        ).label("rank"),
+    ).cte("freed")
+    waiting = select(reservation_table.c.id, reservation_table.c.book_id) \
+        .where(
+            (reservation_table.c.book_id.in_({book_id for book_id, _, _ in copies})) &
+            (reservation_table.c.status == WAITING)
+        ) \
+        .order_by(reservation_table.c.id) \
+        .with_for_update(skip_locked=True) \
+        .cte("waiting")
+    ranked = select(
+        waiting.c.id,
+        waiting.c.book_id,
+        func.row_number().over(
+            partition_by=waiting.c.book_id,
+            order_by=waiting.c.id,
+        ).label("rank"),
+    ).cte("ranked")
+    assign_query = reservation_table.update() \
+        .where(
+            (reservation_table.c.id == ranked.c.id) &
+            (ranked.c.book_id == freed.c.book_id) &
+            (ranked.c.rank == freed.c.rank)
+        ) \
+        .values(
+            status="ready",
+            ready_at=func.now(),
+            branch_id=freed.c.branch_id,
+            copy_id=freed.c.copy_id,
+        ) \
+        .returning(
+            reservation_table.c.book_id,
+            reservation_table.c.branch_id,
+            reservation_table.c.copy_id,
+        )
+    assigned = Counter(
+        (row["book_id"], row["branch_id"], row["copy_id"])
+        for row in await database.fetch_all(assign_query)
+    )
+
+    remaining = freed_copies - assigned
+    await mark_copies(sorted(copy_id for _, _, copy_id in assigned if copy_id), CopyStatus.HELD)
+    await mark_copies(sorted(copy_id for _, _, copy_id in remaining if copy_id), CopyStatus.AVAILABLE)
+    await restock_branches(dict(sorted(
+        ((book_id, branch_id), count)
+        for (book_id, branch_id, copy_id), count in remaining.items()
+        if branch_id is not None and copy_id is None
+    )))
+    remaining = dict(sorted(
+        (book_id, count)
+        for (book_id, branch_id, copy_id), count in remaining.items()
+        if branch_id is None and copy_id is None
+    ))
+    if remaining:
+        released = func.unnest(
+            cast(list(remaining.keys()), ARRAY(Integer)),
+            cast(list(remaining.values()), ARRAY(Integer)),
+        ).table_valued("book_id", "copies").render_derived(name="released")
+        release_query = book_table.update() \
+            .where(book_table.c.id == released.c.book_id) \
+            .values(
+                copies_available=func.coalesce(book_table.c.copies_available, 0) + released.c.copies,
+            )
+        await database.execute(release_query)
+
+    return sum(assigned.values())
+
+
+async def claim_ready_reservation(user_id: int, book_id: int) -> Any | None:
+    """A function fulfilling the ready reservation of a user, if present.
+    A copy row held for the reservation is marked on loan.
+
+    Args:
+        user_id (int): The id of the borrowing user.
+        book_id (int): The id of the borrowed book.
+
+    Returns:
+        Any | None: The id, the holding branch id and the held copy id of
+            the claimed reservation, None if no copy was held for the user.
+    """
+    query = reservation_table.update() \
+        .where(
+            (reservation_table.c.user_id == user_id) &
+            (reservation_table.c.book_id == book_id) &
+            (reservation_table.c.status == "ready")
+        ) \
+        .values(status="fulfilled") \
+        .returning(
+            reservation_table.c.id,
+            reservation_table.c.branch_id,
+            reservation_table.c.copy_id,
+        )
+    reservation = await database.fetch_one(query)
+    if reservation and reservation["copy_id"] is not None:
+        await mark_copies([reservation["copy_id"]], CopyStatus.ON_LOAN)
+
+    return reservation
+
+
+class ReservationRepository(IReservationRepository):
+    """A class implementing the database reservation repository."""
+
+    async def create_reservation(self, data: ReservationIn) -> Reservation | None:
+        """
+        Queues a user for a book in a single statement. The row is only
+        inserted when the book has no available copies, neither unassigned
+        nor on the shelves of any branch nor among its copy rows, and the
+        partial
+        unique index rejects a second open reservation of the same user.
+
+        Args:
+            data (ReservationIn): The reservation data.
+
+        Returns:
+            Reservation | None: The created reservation if successful, otherwise None.
+        """
+        counted_out = exists().where(
+            (book_table.c.id == data.book_id) &
+            (func.coalesce(book_table.c.copies_available, 0) == 0)
+        ) & ~exists().where(
+            (book_stock_table.c.book_id == data.book_id) &
+            (book_stock_table.c.copies_available > 0)
+        )
+        # The counts of books with copy rows are only a cache.
+        has_copies = exists().where(book_copy_table.c.book_id == data.book_id)
+        unavailable = ~exists().where(
+            (book_copy_table.c.book_id == data.book_id) &
+            (book_copy_table.c.status == CopyStatus.AVAILABLE)
+        ) & (has_copies | counted_out)
+        query = insert(reservation_table) \
+            .from_select(
+                ["user_id", "book_id", "status"],
+                select(
+                    literal(data.user_id),
+                    literal(data.book_id),
+                    literal("waiting"),
+                ).where(unavailable),
+            ) \
+            .on_conflict_do_nothing() \
+            .returning(reservation_table)
+        reservation = await database.fetch_one(query)
+
+        return Reservation(**dict(reservation)) if reservation else None
+
+    async def get_reservation_by_id(self, reservation_id: int) -> Reservation | None:
+        """
+        Fetches a reservation by its ID.
+
+        Args:
+            reservation_id (int): The ID of the reservation.
+
+        Returns:
+            Reservation | None: The reservation if found, otherwise None.
+        """
+        query = reservation_table.select().where(reservation_table.c.id == reservation_id)
+        reservation = await database.fetch_one(query)
+
+        return Reservation(**dict(reservation)) if reservation else None
+
+    async def get_queue_position(self, reservation_id: int) -> ReservationPosition | None:
+        """
+        Fetches the position of a waiting reservation in its book queue.
+
+        Both lookups are answered from the partial `(book_id, id)` index of
+        waiting reservations: one probe for the reservation and an
+        index-only range count of the holders ahead of it. The count costs
+        O(log n + p) for n indexed reservations and position p, so it only
+        grows with the waiting queue of the one book, never with the
+        reservations of other books or the served ones.
+
+        Args:
+            reservation_id (int): The ID of the reservation.
+
+        Returns:
+            ReservationPosition | None: The position if the reservation is waiting.
+        """
+        reservation = await self.get_reservation_by_id(reservation_id)
+        if not reservation or reservation.status != "waiting":
+            return None
+
+        query = select(func.count()) \
+            .select_from(reservation_table) \
+            .where(
+                (reservation_table.c.book_id == reservation.book_id) &
+                (reservation_table.c.status == WAITING) &
+                (reservation_table.c.id <= reservation.id)
+            )
+        position = await database.fetch_val(query)
+
+        return ReservationPosition(
+            reservation_id=reservation.id,
+            book_id=reservation.book_id,
+            position=position,
+        )
+
+    async def get_reservations_by_user(self, user_id: int) -> list[Reservation]:
+        """
+        Fetches open reservations of a user.
+
+        Args:
+            user_id (int): The ID of the user.
+
+        Returns:
+            list[Reservation]: Waiting and ready reservations of the user.
+        """
+        query = reservation_table.select() \
+            .where(
+                (reservation_table.c.user_id == user_id) &
+                (reservation_table.c.status.in_(OPEN_STATUSES))
+            ) \
+            .order_by(reservation_table.c.id)
+        rows = await database.fetch_all(query)
+
+        return [Reservation(**dict(row)) for row in rows]
+
+    async def cancel_reservation(self, reservation_id: int) -> bool:
+        """
+        Cancels an open reservation. A copy already held for the
+        reservation is handed to the next holder in line.
+
+        Args:
+            reservation_id (int): The ID of the reservation.
+
+        Returns:
+            bool: True if the reservation was cancelled, otherwise False.
+        """
+        async with database.transaction():
+            query = reservation_table.update() \
+                .where(
+                    (reservation_table.c.id == reservation_id) &
+                    (reservation_table.c.status.in_(OPEN_STATUSES))
+                ) \
+                .values(status="cancelled") \
+                .returning(
+                    reservation_table.c.book_id,
+                    reservation_table.c.ready_at,
+                    reservation_table.c.branch_id,
+                    reservation_table.c.copy_id,
+                )
+            cancelled = await database.fetch_one(query)
+            if not cancelled:
+                return False
+
+            if cancelled["ready_at"] is not None:
+                await release_copy(
+                    cancelled["book_id"],
+                    cancelled["branch_id"],
+                    cancelled["copy_id"],
+                )
+
+        return True
+
+    async def expire_ready_reservations(self) -> int:
+        """
+        Expires ready reservations older than `RESERVATION_HOLD_DAYS` and
+        hands their copies to the next holders in line.
+
+        Returns:
+            int: Number of expired reservations.
+        """
+        cutoff = datetime.now(timezone.utc) - timedelta(days=config.RESERVATION_HOLD_DAYS)
+
+        async with database.transaction():
+            query = reservation_table.update() \
+                .where(
+                    (reservation_table.c.status == "ready") &
+                    (reservation_table.c.ready_at < cutoff)
+                ) \
+                .values(status="expired") \
+                .returning(
+                    reservation_table.c.book_id,
+                    reservation_table.c.branch_id,
+                    reservation_table.c.copy_id,
+                )
+            expired = await database.fetch_all(query)
+
+            for row in expired:
+                await release_copy(row["book_id"], row["branch_id"], row["copy_id"])
+
+        return len(expired)
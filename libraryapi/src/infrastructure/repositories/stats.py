@@ -0,0 +1,356 @@
+"""A repository for circulation statistics."""
+
+from datetime import date, timedelta
+
+from sqlalchemy import (
+    ColumnElement,
+    Date,
+    Float,
+    Integer,
+    Table,
+    cast,
+    func,
+    select,
+    union_all,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+
+from src.config import config
+from src.core.domain.stats import BookUtilization, MonthlyCirculation
+from src.core.repositories.istats import IStatsRepository
+from src.db import (
+    author_table,
+    book_stock_table,
+    book_table,
+    borrowing_archive_table,
+    borrowing_shards,
+    borrowing_table,
+    category_table,
+    daily_circulation_table,
+    database,
+    rollup_watermark_table,
+)
+
+WATERMARK = "daily_circulation"
+
+
+class StatsRepository(IStatsRepository):
+    """A class implementing the circulation statistics repository.
+
+    Statistics are read only from the `daily_circulation` rollup, which
+    stays small compared to the history and is refreshed in the background.
+    """
+
+    async def refresh_circulation(self, today: date | None = None) -> int:
+        """
+        Recomputes the rollup from the watermark on, in chunks of
+        `STATS_REFRESH_CHUNK_DAYS` days, each replaced in one transaction.
+
+        The last `STATS_REFRESH_LOOKBACK_DAYS` days before the watermark
+        are recomputed as well, so late returns and corrections are picked
+        up. The first refresh backfills the whole history, archive included.
+        Later refreshes skip the archive, which only holds borrowings
+        returned more than `BORROWING_ARCHIVE_AFTER_DAYS` days ago.
+
+        Args:
+            today (date | None): The last day to refresh. Defaults to today.
+
+        Returns:
+            int: Number of refreshed days.
+        """
+        today = today or date.today()
+        watermark_query = select(rollup_watermark_table.c.refreshed_through) \
+            .where(rollup_watermark_table.c.name == WATERMARK)
+        watermark = await database.fetch_val(watermark_query)
+
+        if watermark is None:
+            first_days = [
+                day
+                for table in (borrowing_table, borrowing_archive_table)
+                for day in await borrowing_shards.gather(
+                    lambda shard: shard.fetch_val(select(func.min(table.c.borrowed_date))),
+                )
+            ]
+            start = min([day for day in first_days if day is not None], default=today)
+        else:
+            start = watermark - timedelta(days=config.STATS_REFRESH_LOOKBACK_DAYS)
+
+        archived_before = date.today() - timedelta(days=config.BORROWING_ARCHIVE_AFTER_DAYS)
+        refreshed = 0
+        while start <= today:
+            end = min(start + timedelta(days=config.STATS_REFRESH_CHUNK_DAYS - 1), today)
+            async with database.transaction():
+                await self._refresh_days(start, end, start < archived_before)
+            refreshed += (end - start).days + 1
+            start = end + timedelta(days=1)
+
+        return refreshed
+
+    async def get_category_circulation(
+        self,
+        since: date | None = None,
+        until: date | None = None,
+    ) -> list[MonthlyCirculation]:
+        """
+        Retrieves monthly checkouts and returns per category.
+
+        Args:
+            since (date | None): The first day of the range. Defaults to a year ago.
+            until (date | None): The last day of the range. Defaults to today.
+
+        Returns:
+            list[MonthlyCirculation]: Circulation per month and category.
+        """
+        return await self._monthly_circulation(
+            daily_circulation_table.c.category_id,
+            category_table,
+            category_table.c.name,
+            since,
+            until,
+        )
+
+    async def get_author_circulation(
+        self,
+        since: date | None = None,
+        until: date | None = None,
+    ) -> list[MonthlyCirculation]:
+        """
+        Retrieves monthly checkouts and returns per author.
+
+        Args:
+            since (date | None): The first day of the range. Defaults to a year ago.
+            until (date | None): The last day of the range. Defaults to today.
+
+        Returns:
+            list[MonthlyCirculation]: Circulation per month and author.
+        """
+        return await self._monthly_circulation(
+            daily_circulation_table.c.author_id,
+            author_table,
+            author_table.c.first_name + " " + author_table.c.last_name,
+            since,
+            until,
+        )
+
+    async def get_book_utilization(
+        self,
+        limit: int,
+        since: date | None = None,
+        until: date | None = None,
+    ) -> list[BookUtilization]:
+        """
+        Retrieves the titles whose copies spent the largest share of the
+        range on loan. Copies of a title are its available copies, those
+        on the shelves of branches included, and the copies on loan on the
+        last day of the range.
+
+        Args:
+            limit (int): Maximal number of returned titles.
+            since (date | None): The first day of the range. Defaults to 30 days ago.
+            until (date | None): The last day of the range. Defaults to today.
+
+        Returns:
+            list[BookUtilization]: Utilization of titles, most utilized first.
+        """
+        until = until or date.today()
+        since = since or until - timedelta(days=29)
+        days = (until - since).days + 1
+
+        rollup = select(
+            daily_circulation_table.c.book_id,
+            func.sum(daily_circulation_table.c.checkouts).label("checkouts"),
+            func.sum(daily_circulation_table.c.on_loan).label("loan_days"),
+            func.coalesce(
+                func.sum(daily_circulation_table.c.on_loan)
+                    .filter(daily_circulation_table.c.day == until),
+                0,
+            ).label("on_loan"),
+        ) \
+            .where(daily_circulation_table.c.day.between(since, until)) \
+            .group_by(daily_circulation_table.c.book_id) \
+            .subquery()
+        shelved = select(func.coalesce(func.sum(book_stock_table.c.copies_available), 0)) \
+            .where(book_stock_table.c.book_id == rollup.c.book_id) \
+            .scalar_subquery()
+        copies = func.coalesce(book_table.c.copies_available, 0) + shelved + rollup.c.on_loan
+        utilization = cast(rollup.c.loan_days, Float) / func.nullif(copies * days, 0)
+
+        query = select(
+            rollup.c.book_id,
+            book_table.c.title,
+            rollup.c.checkouts,
+            rollup.c.loan_days,
+            copies.label("copies"),
+            utilization.label("utilization"),
+        ) \
+            .join_from(rollup, book_table, book_table.c.id == rollup.c.book_id) \
+            .order_by(utilization.desc().nulls_last(), rollup.c.book_id) \
+            .limit(limit)
+        rows = await database.fetch_all(query)
+
+        return [BookUtilization(**dict(row)) for row in rows]
+
+    @staticmethod
+    async def _refresh_days(start: date, end: date, archive: bool) -> None:
+        """Replaces rollup rows of a range of days. Only borrowings which
+        overlap the range are read.
+
+        Borrowings are counted per day and book where they are stored.
+        With sharded borrowings the counts of all shards are summed here,
+        since a book is borrowed by users of every shard, and passed back
+        to `database` to be joined with the books.
+
+        Args:
+            start (date): The first day to refresh.
+            end (date): The last day to refresh.
+            archive (bool): Whether archived borrowings can overlap the range.
+        """
+        history = select(
+            borrowing_table.c.book_id,
+            borrowing_table.c.borrowed_date,
+            borrowing_table.c.return_date,
+        ).where(
+            (borrowing_table.c.borrowed_date <= end) &
+            (
+                (borrowing_table.c.return_date.is_(None)) |
+                (borrowing_table.c.return_date >= start)
+            )
+        )
+        if archive:
+            history = union_all(
+                history,
+                select(
+                    borrowing_archive_table.c.book_id,
+                    borrowing_archive_table.c.borrowed_date,
+                    borrowing_archive_table.c.return_date,
+                ).where(
+                    (borrowing_archive_table.c.borrowed_date <= end) &
+                    (borrowing_archive_table.c.return_date >= start)
+                ),
+            )
+        history = history.cte("history")
+        offsets = func.generate_series(
+            cast(0, Integer),
+            cast((end - start).days, Integer),
+        ).table_valued("offset").render_derived(name="offsets")
+        days = select((cast(start, Date) + offsets.c.offset).label("day")).subquery("days")
+
+        on_loan = (history.c.borrowed_date <= days.c.day) & (
+            (history.c.return_date.is_(None)) |
+            (history.c.return_date > days.c.day)
+        )
+        circulation = select(
+            days.c.day,
+            history.c.book_id,
+            func.count().filter(history.c.borrowed_date == days.c.day).label("checkouts"),
+            func.count().filter(history.c.return_date == days.c.day).label("returns"),
+            func.count().filter(on_loan).label("on_loan"),
+        ) \
+            .select_from(days) \
+            .join(
+                history,
+                (history.c.borrowed_date <= days.c.day) &
+                (
+                    (history.c.return_date.is_(None)) |
+                    (history.c.return_date >= days.c.day)
+                ),
+            ) \
+            .group_by(days.c.day, history.c.book_id)
+
+        if borrowing_shards.sharded:
+            totals: dict[tuple[date, int], list[int]] = {}
+            for rows in await borrowing_shards.gather(lambda shard: shard.fetch_all(circulation)):
+                for row in rows:
+                    counts = totals.setdefault((row["day"], row["book_id"]), [0, 0, 0])
+                    counts[0] += row["checkouts"]
+                    counts[1] += row["returns"]
+                    counts[2] += row["on_loan"]
+            counted = func.unnest(
+                cast([day for day, _ in totals], ARRAY(Date)),
+                cast([book_id for _, book_id in totals], ARRAY(Integer)),
+                cast([counts[0] for counts in totals.values()], ARRAY(Integer)),
+                cast([counts[1] for counts in totals.values()], ARRAY(Integer)),
+                cast([counts[2] for counts in totals.values()], ARRAY(Integer)),
+            ).table_valued("day", "book_id", "checkouts", "returns", "on_loan") \
+                .render_derived(name="circulation")
+        else:
+            counted = circulation.subquery("circulation")
+
+        rollup = select(
+            counted.c.day,
+            book_table.c.id,
+            book_table.c.author_id,
+            book_table.c.category_id,
+            counted.c.checkouts,
+            counted.c.returns,
+            counted.c.on_loan,
+        ) \
+            .join_from(counted, book_table, book_table.c.id == counted.c.book_id)
+
+        await database.execute(
+            daily_circulation_table.delete()
+                .where(daily_circulation_table.c.day.between(start, end))
+        )
+        await database.execute(
+            daily_circulation_table.insert().from_select(
+                ["day", "book_id", "author_id", "category_id", "checkouts", "returns", "on_loan"],
+                rollup,
+            )
+        )
+
+        watermark = insert(rollup_watermark_table) \
+            .values(name=WATERMARK, refreshed_through=end)
+        watermark = watermark.on_conflict_do_update(
+            index_elements=[rollup_watermark_table.c.name],
+            set_={
+                "refreshed_through": watermark.excluded.refreshed_through,
+                "updated_at": func.now(),
+            },
+        )
+        await database.execute(watermark)
+
+    @staticmethod
+    async def _monthly_circulation(
+        key: ColumnElement[int],
+        dimension: Table,
+        name: ColumnElement[str],
+        since: date | None,
+        until: date | None,
+    ) -> list[MonthlyCirculation]:
+        """Sums the rollup per month and a dimension.
+
+        Args:
+            key (ColumnElement[int]): The rollup column of the dimension id.
+            dimension (Table): The table of the dimension.
+            name (ColumnElement[str]): The expression naming a dimension row.
+            since (date | None): The first day of the range. Defaults to a year ago.
+            until (date | None): The last day of the range. Defaults to today.
+
+        Returns:
+            list[MonthlyCirculation]: Circulation per month and dimension.
+        """
+        until = until or date.today()
+        since = since or until - timedelta(days=365)
+        month = cast(func.date_trunc("month", daily_circulation_table.c.day), Date)
+
+        rollup = select(
+            month.label("month"),
+            key.label("id"),
+            cast(func.sum(daily_circulation_table.c.checkouts), Integer).label("checkouts"),
+            cast(func.sum(daily_circulation_table.c.returns), Integer).label("returns"),
+        ) \
+            .where(daily_circulation_table.c.day.between(since, until)) \
+            .group_by(month, key) \
+            .subquery()
+        query = select(
+            rollup.c.month,
+            rollup.c.id,
+            name.label("name"),
+            rollup.c.checkouts,
+            rollup.c.returns,
+        ) \
+            .join_from(rollup, dimension, dimension.c.id == rollup.c.id) \
+            .order_by(rollup.c.month, rollup.c.id)
+        rows = await database.fetch_all(query)
+
+        return [MonthlyCirculation(**dict(row)) for row in rows]
@@ -1,12 +1,23 @@
 """A repository for user entity."""
 
 
+import asyncio
 from typing import Any
+from sqlalchemy import bindparam, func
+from sqlalchemy.dialects.postgresql import insert
 from src.infrastructure.utils.password import hash_password
-from src.core.domain.user import UserIn, User
+from src.infrastructure.utils.prepared import PreparedQuery
+from src.core.domain.user import UserIn, User, normalize_email
 from src.core.repositories.iuser import IUserRepository
 from src.db import database, user_table
 
+GET_USER_BY_ID = PreparedQuery(
+    user_table.select().where(user_table.c.id == bindparam("id"))
+)
+GET_USER_BY_EMAIL = PreparedQuery(
+    user_table.select().where(func.lower(user_table.c.email) == bindparam("email"))
+)
+
 
 class UserRepository(IUserRepository):
     """An implementation of repository class for user."""
@@ -14,22 +25,25 @@ class UserRepository(IUserRepository):
     async def register_user(self, user: UserIn) -> Any | None:
         """A method registering new user.
 
+        The user is inserted with a single statement which does nothing
+        when the email is taken, so concurrent signups cannot create
+        duplicates.
+
         Args:
             user (UserIn): The user input data.
 
         Returns:
-            Any | None: The new user object.
+            Any | None: The new user object, None if the email is taken.
         """
 
-        if await self.get_user_by_email(user.email):
-            return None
-
-        user.password = hash_password(user.password)
+        password = await asyncio.to_thread(hash_password, user.password)
 
-        query = user_table.insert().values(**user.model_dump())
-        new_user_id = await database.execute(query)
+        query = insert(user_table) \
+            .values(email=user.email, password=password) \
+            .on_conflict_do_nothing(index_elements=[func.lower(user_table.c.email)]) \
+            .returning(user_table)
 
-        return await self.get_user_by_id(new_user_id)
+        return await database.fetch_one(query)
     
 
         token_details = TokenDTO(
@@ -60,15 +74,12 @@ class UserRepository(IUserRepository):
             Any | None: The user object if exists.
         """
 
-        query = user_table \
-            .select() \
-            .where(user_table.c.id == id)
-        user = await database.fetch_one(query)
+        user = await GET_USER_BY_ID.fetch_one(id=id)
 
-        return user
+        return User(**dict(user)) if user else None
 
     async def get_user_by_email(self, email: str) -> Any | None:
-        """A method getting user by email.
+        """A method getting user by email, regardless of its case.
 
         Args:
             email (str): The email of the user.
@@ -77,12 +88,9 @@ class UserRepository(IUserRepository):
             Any | None: The user object if exists.
         """
 
-        query = user_table \
-            .select() \
-            .where(user_table.c.email == email)
-        user = await database.fetch_one(query)
+        user = await GET_USER_BY_EMAIL.fetch_one(email=normalize_email(email))
 
-        return user
+        return User(**dict(user)) if user else None
     
     async def update_user(self, id: int, user_data: UserIn) -> User | None:
         """
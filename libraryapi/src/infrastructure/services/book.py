@@ -1,8 +1,13 @@
 """Module containing the implementation of book services."""
 
-from typing import Iterable
-
-from src.core.domain.book import Book
+from typing import AsyncIterator, Iterable
+
+from src.core.domain.book import (
+    Book,
+    BookImportResult,
+    InventoryItem,
+    InventoryResult,
+)
 from src.infrastructure.dto.bookdto import BookDTO
 from src.infrastructure.services.ibook import IBookService
 from src.core.repositories.ibook import IBookRepository
@@ -39,6 +44,18 @@ class BookService(IBookService):
         """
         return await self._repository.get_book_by_id(book_id)
 
+    async def get_book_by_isbn(self, isbn: str) -> BookDTO | None:
+        """
+        Retrieves a book by its normalized ISBN.
+
+        Args:
+            isbn (str): The ISBN-13 of the book, without separators.
+
+        Returns:
+            BookDTO | None: The book object if found, otherwise None.
+        """
+        return await self._repository.get_book_by_isbn(isbn)
+
     async def list_books(self) -> Iterable[BookDTO]:
         """
         Lists all books available in the repository.
@@ -84,6 +101,48 @@ class BookService(IBookService):
         """
         return await self._repository.search_book_by_category(category_id)
     
+    async def get_similar_books(self, book_id: int, limit: int) -> Iterable[BookDTO]:
+        """
+        Retrieves books similar to the given one.
+
+        Args:
+            book_id (int): The ID of the book.
+            limit (int): Maximal number of returned books.
+
+        Returns:
+            Iterable[BookDTO]: A collection of similar books, most similar first.
+        """
+        return await self._repository.get_similar_books(book_id, limit)
+
+    async def import_books(
+        self,
+        records: AsyncIterator[tuple[int, dict | str]],
+    ) -> BookImportResult:
+        """
+        Imports a catalog feed, upserting books by ISBN.
+
+        Args:
+            records (AsyncIterator[tuple[int, dict | str]]): Line numbers
+                with parsed records or parsing errors.
+
+        Returns:
+            BookImportResult: Counts of processed rows and rejected rows.
+        """
+        return await self._repository.import_books(records)
+
+    async def update_inventory(self, items: list[InventoryItem]) -> InventoryResult:
+        """
+        Sets available copies of many books at once.
+
+        Args:
+            items (list[InventoryItem]): The counted stock of books.
+
+        Returns:
+            InventoryResult: The previous and new stock of changed books, the
+                positions of items matching no book and of skipped items.
+        """
+        return await self._repository.update_inventory(items)
+
     async def update_book(self, book_id: int, book_data: BookIn) -> BookDTO | None:
         """
         Updates an existing book record.
@@ -3,7 +3,15 @@
 from typing import Iterable
 from datetime import date
 
-from src.core.domain.borrowing import Borrowing, BorrowingIn
+from src.core.domain.borrowing import (
+    Borrowing,
+    BorrowingEligibility,
+    BorrowingIn,
+    BorrowingReturn,
+    BulkCheckoutResult,
+    BulkReturnResult,
+    LoanCounter,
+)
 from src.infrastructure.dto.borrowingdto import BorrowingDTO
 from src.infrastructure.services.iborrowing import IBorrowingService
 from src.core.repositories.iborrowing import IBorrowingRepository
@@ -28,6 +36,37 @@ class BorrowingService(IBorrowingService):
         """
         return await self._repository.create_borrowing(borrowing_data)
 
+    async def check_eligibility(
+        self,
+        user_id: int,
+        book_id: int,
+        branch_id: int | None = None,
+    ) -> BorrowingEligibility | None:
+        """
+        Evaluates whether a user may borrow a book.
+
+        Args:
+            user_id (int): The ID of the user.
+            book_id (int): The ID of the book.
+            branch_id (int | None): The ID of the checkout branch, if any.
+
+        Returns:
+            BorrowingEligibility | None: The evaluated rules if the user exists.
+        """
+        return await self._repository.check_eligibility(user_id, book_id, branch_id)
+
+    async def create_borrowings(self, items: list[BorrowingIn]) -> list[BulkCheckoutResult]:
+        """
+        Checks out a batch of books at once.
+
+        Args:
+            items (list[BorrowingIn]): The borrowings to create.
+
+        Returns:
+            list[BulkCheckoutResult]: The result of every item, in input order.
+        """
+        return await self._repository.create_borrowings(items)
+
     async def get_borrowing_by_id(self, borrowing_id: int) -> BorrowingDTO | None:
         """
         Retrieves a borrowing record by its ID.
@@ -52,14 +91,34 @@ class BorrowingService(IBorrowingService):
         """
         return await self._repository.get_active_borrowings_by_user(user_id)
 
-    async def list_all_borrowings(self) -> Iterable[BorrowingDTO]:
+    async def get_loan_counter(self, user_id: int) -> LoanCounter | None:
+        """
+        Fetches the active and overdue loan counts of a user.
+
+        Args:
+            user_id (int): The ID of the user.
+
+        Returns:
+            LoanCounter | None: The loan counts if the user exists.
+        """
+        return await self._repository.get_loan_counter(user_id)
+
+    async def list_all_borrowings(
+        self,
+        since: date | None = None,
+        until: date | None = None,
+    ) -> Iterable[BorrowingDTO]:
         """
         Lists all borrowing records in the repository.
 
+        Args:
+            since (date | None): The earliest borrowed date, if any.
+            until (date | None): The latest borrowed date, if any.
+
         Returns:
             Iterable[BorrowingDTO]: A list of all borrowings.
         """
-        return await self._repository.list_all_borrowings()
+        return await self._repository.list_all_borrowings(since, until)
     
     async def mark_borrowing_as_returned(self, borrowing_id: int, return_date: date) -> bool:
         """Marks a borrowing as returned.
@@ -73,17 +132,39 @@ class BorrowingService(IBorrowingService):
         """
         return await self._repository.mark_borrowing_as_returned(borrowing_id, return_date)
     
-    async def get_borrowing_history_by_user(self, user_id: int) -> list[Borrowing]:
+    async def mark_borrowings_as_returned(
+        self,
+        items: list[BorrowingReturn],
+    ) -> list[BulkReturnResult]:
+        """
+        Marks a batch of borrowings as returned at once.
+
+        Args:
+            items (list[BorrowingReturn]): The borrowings and their return dates.
+
+        Returns:
+            list[BulkReturnResult]: The result of every item, in input order.
+        """
+        return await self._repository.mark_borrowings_as_returned(items)
+
+    async def get_borrowing_history_by_user(
+        self,
+        user_id: int,
+        since: date | None = None,
+        until: date | None = None,
+    ) -> list[Borrowing]:
         """
         Retrieves the borrowing history for a specific user.
 
         Args:
             user_id (int): The ID of the user.
+            since (date | None): The earliest borrowed date, if any.
+            until (date | None): The latest borrowed date, if any.
 
         Returns:
             list[Borrowing]: A list of completed borrowings for the user.
         """
-        return await self._repository.get_borrowing_history_by_user(user_id)
+        return await self._repository.get_borrowing_history_by_user(user_id, since, until)
     
     async def delete_borrowing(self, borrowing_id: int) -> bool:
         """
@@ -0,0 +1,51 @@
+"""Module containing the implementation of branch services."""
+
+from typing import Iterable
+
+from src.core.domain.branch import BranchIn, BranchStockIn
+from src.core.repositories.ibranch import IBranchRepository
+from src.infrastructure.dto.branchdto import (
+    BookAvailabilityDTO,
+    BranchDTO,
+    BranchStockDTO,
+)
+from src.infrastructure.services.ibranch import IBranchService
+
+
+class BranchService(IBranchService):
+    """A service class implementing the IBranchService protocol."""
+
+    _repository: IBranchRepository
+
+    def __init__(self, repository: IBranchRepository) -> None:
+        self._repository = repository
+
+    async def add_branch(self, branch: BranchIn) -> BranchDTO | None:
+        new_branch = await self._repository.add_branch(branch)
+        return BranchDTO(**new_branch.model_dump()) if new_branch else None
+
+    async def get_branch_by_id(self, branch_id: int) -> BranchDTO | None:
+        branch = await self._repository.get_branch_by_id(branch_id)
+        return BranchDTO(**branch.model_dump()) if branch else None
+
+    async def list_branches(self) -> Iterable[BranchDTO]:
+        branches = await self._repository.list_branches()
+        return [BranchDTO(**branch.model_dump()) for branch in branches]
+
+    async def set_branch_stock(
+        self,
+        branch_id: int,
+        items: list[BranchStockIn],
+    ) -> Iterable[BranchStockDTO] | None:
+        stock = await self._repository.set_branch_stock(branch_id, items)
+        if stock is None:
+            return None
+        return [BranchStockDTO(**row.model_dump()) for row in stock]
+
+    async def get_branch_stock(self, branch_id: int) -> Iterable[BranchStockDTO]:
+        stock = await self._repository.get_branch_stock(branch_id)
+        return [BranchStockDTO(**row.model_dump()) for row in stock]
+
+    async def get_book_availability(self, book_id: int) -> BookAvailabilityDTO | None:
+        availability = await self._repository.get_book_availability(book_id)
+        return BookAvailabilityDTO(**availability.model_dump()) if availability else None
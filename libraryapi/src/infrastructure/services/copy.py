@@ -0,0 +1,33 @@
+"""Module containing the implementation of book copy services."""
+
+from typing import Iterable
+
+from src.core.domain.copy import BookCopyIn, BookCopyUpdate
+from src.core.repositories.icopy import IBookCopyRepository
+from src.infrastructure.dto.copydto import BookCopyDTO
+from src.infrastructure.services.icopy import IBookCopyService
+
+
+class BookCopyService(IBookCopyService):
+    """A service class implementing the IBookCopyService protocol."""
+
+    _repository: IBookCopyRepository
+
+    def __init__(self, repository: IBookCopyRepository) -> None:
+        self._repository = repository
+
+    async def add_copies(self, items: list[BookCopyIn]) -> Iterable[BookCopyDTO]:
+        copies = await self._repository.add_copies(items)
+        return [BookCopyDTO(**copy.model_dump()) for copy in copies]
+
+    async def get_copy_by_barcode(self, barcode: str) -> BookCopyDTO | None:
+        copy = await self._repository.get_copy_by_barcode(barcode)
+        return BookCopyDTO(**copy.model_dump()) if copy else None
+
+    async def get_copies_by_book(self, book_id: int) -> Iterable[BookCopyDTO]:
+        copies = await self._repository.get_copies_by_book(book_id)
+        return [BookCopyDTO(**copy.model_dump()) for copy in copies]
+
+    async def update_copy(self, copy_id: int, data: BookCopyUpdate) -> BookCopyDTO | None:
+        copy = await self._repository.update_copy(copy_id, data)
+        return BookCopyDTO(**copy.model_dump()) if copy else None
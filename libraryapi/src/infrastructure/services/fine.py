@@ -0,0 +1,67 @@
+"""Module containing the implementation of fine services."""
+
+from datetime import date
+from typing import Iterable
+
+from src.core.domain.fine import FineTotal
+from src.core.repositories.ifine import IFineRepository
+from src.infrastructure.dto.finedto import FineDTO
+from src.infrastructure.services.ifine import IFineService
+
+
+class FineService(IFineService):
+    """A service class implementing the IFineService protocol."""
+
+    _repository: IFineRepository
+
+    def __init__(self, repository: IFineRepository) -> None:
+        self._repository = repository
+
+    async def assess_fines(self, today: date) -> int:
+        """
+        Computes fines for all overdue borrowings.
+
+        Args:
+            today (date): The date the fines are assessed on.
+
+        Returns:
+            int: Number of created or updated fines.
+        """
+        return await self._repository.assess_fines(today)
+
+    async def get_fines_by_user(self, user_id: int) -> Iterable[FineDTO]:
+        """
+        Retrieves fines of a user.
+
+        Args:
+            user_id (int): The ID of the user.
+
+        Returns:
+            Iterable[FineDTO]: Fines of the user.
+        """
+        fines = await self._repository.get_fines_by_user(user_id)
+        return [FineDTO(**fine.model_dump()) for fine in fines]
+
+    async def get_user_fine_total(self, user_id: int) -> FineTotal:
+        """
+        Retrieves the total of unpaid fines of a user.
+
+        Args:
+            user_id (int): The ID of the user.
+
+        Returns:
+            FineTotal: The total of unpaid fines.
+        """
+        return await self._repository.get_user_fine_total(user_id)
+
+    async def pay_fine(self, fine_id: int) -> bool:
+        """
+        Marks a fine as paid.
+
+        Args:
+            fine_id (int): The ID of the fine.
+
+        Returns:
+            bool: True if the fine was paid, otherwise False.
+        """
+        return await self._repository.pay_fine(fine_id)
@@ -1,9 +1,14 @@
 """Module containing book service abstractions."""
 
 from abc import ABC, abstractmethod
-from typing import Iterable, List
-
-from src.core.domain.book import Book
+from typing import AsyncIterator, Iterable, List
+
+from src.core.domain.book import (
+    Book,
+    BookImportResult,
+    InventoryItem,
+    InventoryResult,
+)
 from src.infrastructure.dto.bookdto import BookDTO
 from src.core.domain.book import BookIn
 
@@ -33,6 +38,17 @@ class IBookService(ABC):
             BookDTO | None: The book details if found.
         """
 
+    @abstractmethod
+    async def get_book_by_isbn(self, isbn: str) -> BookDTO | None:
+        """Fetches a book's details using its normalized ISBN.
+
+        Args:
+            isbn (str): The ISBN-13 of the book, without separators.
+
+        Returns:
+            BookDTO | None: The book details if found.
+        """
+
     @abstractmethod
     async def list_books(self) -> Iterable[BookDTO]:
         """Lists all books in the repository.
@@ -74,6 +90,45 @@ class IBookService(ABC):
             List[Book]: A list of books belonging to the category.
         """
 
+    @abstractmethod
+    async def get_similar_books(self, book_id: int, limit: int) -> List[BookDTO]:
+        """Fetches books similar to the given one.
+
+        Args:
+            book_id (int): id of the book.
+            limit (int): Maximal number of returned books.
+
+        Returns:
+            List[BookDTO]: Similar books, most similar first.
+        """
+
+    @abstractmethod
+    async def import_books(
+        self,
+        records: AsyncIterator[tuple[int, dict | str]],
+    ) -> BookImportResult:
+        """Imports a catalog feed, upserting books by ISBN.
+
+        Args:
+            records (AsyncIterator[tuple[int, dict | str]]): Line numbers
+                with parsed records or parsing errors.
+
+        Returns:
+            BookImportResult: Counts of processed rows and rejected rows.
+        """
+
+    @abstractmethod
+    async def update_inventory(self, items: list[InventoryItem]) -> InventoryResult:
+        """Sets available copies of many books at once.
+
+        Args:
+            items (list[InventoryItem]): The counted stock of books.
+
+        Returns:
+            InventoryResult: The previous and new stock of changed books, the
+                positions of items matching no book and of skipped items.
+        """
+
     @abstractmethod
     async def update_book(self, book_id: int, book_data: BookIn) -> BookDTO | None:
         """Updates an existing book's information.
@@ -4,7 +4,15 @@ from abc import ABC, abstractmethod
 from typing import Iterable
 from datetime import date, datetime
 
-from src.core.domain.borrowing import Borrowing
+from src.core.domain.borrowing import (
+    Borrowing,
+    BorrowingEligibility,
+    BorrowingIn,
+    BorrowingReturn,
+    BulkCheckoutResult,
+    BulkReturnResult,
+    LoanCounter,
+)
 from src.infrastructure.dto.borrowingdto import BorrowingDTO
 
 
@@ -33,6 +41,35 @@ class IBorrowingService(ABC):
             BorrowingDTO | None: The borrowing details if found.
         """
 
+    @abstractmethod
+    async def check_eligibility(
+        self,
+        user_id: int,
+        book_id: int,
+        branch_id: int | None = None,
+    ) -> BorrowingEligibility | None:
+        """Evaluates whether a user may borrow a book.
+
+        Args:
+            user_id (int): The id of the user.
+            book_id (int): The id of the book.
+            branch_id (int | None): The id of the checkout branch, if any.
+
+        Returns:
+            BorrowingEligibility | None: The evaluated rules if the user exists.
+        """
+
+    @abstractmethod
+    async def create_borrowings(self, items: list[BorrowingIn]) -> list[BulkCheckoutResult]:
+        """Checks out a batch of books at once.
+
+        Args:
+            items (list[BorrowingIn]): The borrowings to create.
+
+        Returns:
+            list[BulkCheckoutResult]: The result of every item, in input order.
+        """
+
     @abstractmethod
     async def get_active_borrowings_by_user(self, user_id: int) -> list[Borrowing]:
         """Fetches active borrowings for a specific user.
@@ -45,9 +82,28 @@ class IBorrowingService(ABC):
         """
 
     @abstractmethod
-    async def list_all_borrowings(self) -> Iterable[BorrowingDTO]:
+    async def get_loan_counter(self, user_id: int) -> LoanCounter | None:
+        """Fetches the active and overdue loan counts of a user.
+
+        Args:
+            user_id (int): The id of the user.
+
+        Returns:
+            LoanCounter | None: The loan counts if the user exists.
+        """
+
+    @abstractmethod
+    async def list_all_borrowings(
+        self,
+        since: date | None = None,
+        until: date | None = None,
+    ) -> Iterable[BorrowingDTO]:
         """Lists all borrowing records.
 
+        Args:
+            since (date | None): The earliest borrowed date, if any.
+            until (date | None): The latest borrowed date, if any.
+
         Returns:
             Iterable[BorrowingDTO]: A collection of all borrowing records.
         """
@@ -65,12 +121,33 @@ class IBorrowingService(ABC):
         """
 
     @abstractmethod
-    async def get_borrowing_history_by_user(self, user_id: int) -> list[Borrowing]:
+    async def mark_borrowings_as_returned(
+        self,
+        items: list[BorrowingReturn],
+    ) -> list[BulkReturnResult]:
+        """Marks a batch of borrowings as returned at once.
+
+        Args:
+            items (list[BorrowingReturn]): The borrowings and their return dates.
+
+        Returns:
+            list[BulkReturnResult]: The result of every item, in input order.
+        """
+
+    @abstractmethod
+    async def get_borrowing_history_by_user(
+        self,
+        user_id: int,
+        since: date | None = None,
+        until: date | None = None,
+    ) -> list[Borrowing]:
         """
         Retrieves the borrowing history for a specific user.
 
         Args:
             user_id (int): The ID of the user whose borrowing history is to be fetched.
+            since (date | None): The earliest borrowed date, if any.
+            until (date | None): The latest borrowed date, if any.
 
         Returns:
             list[Borrowing]: A list of borrowings with status 'returned' for the specified user.
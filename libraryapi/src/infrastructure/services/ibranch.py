@@ -0,0 +1,84 @@
+"""Module containing branch service abstractions."""
+
+from abc import ABC, abstractmethod
+from typing import Iterable
+
+from src.core.domain.branch import BranchIn, BranchStockIn
+from src.infrastructure.dto.branchdto import (
+    BookAvailabilityDTO,
+    BranchDTO,
+    BranchStockDTO,
+)
+
+
+class IBranchService(ABC):
+    """An abstract class representing the protocol for branch services."""
+
+    @abstractmethod
+    async def add_branch(self, branch: BranchIn) -> BranchDTO | None:
+        """Adds a new branch.
+
+        Args:
+            branch (BranchIn): The branch input data.
+
+        Returns:
+            BranchDTO | None: The created branch, None if the name is taken.
+        """
+
+    @abstractmethod
+    async def get_branch_by_id(self, branch_id: int) -> BranchDTO | None:
+        """Fetches a branch by its id.
+
+        Args:
+            branch_id (int): The id of the branch.
+
+        Returns:
+            BranchDTO | None: The branch details if found.
+        """
+
+    @abstractmethod
+    async def list_branches(self) -> Iterable[BranchDTO]:
+        """Lists all branches.
+
+        Returns:
+            Iterable[BranchDTO]: A collection of all branches.
+        """
+
+    @abstractmethod
+    async def set_branch_stock(
+        self,
+        branch_id: int,
+        items: list[BranchStockIn],
+    ) -> Iterable[BranchStockDTO] | None:
+        """Sets the copies of books on the shelves of a branch.
+
+        Args:
+            branch_id (int): The id of the branch.
+            items (list[BranchStockIn]): The copies per book.
+
+        Returns:
+            Iterable[BranchStockDTO] | None: The stored stock, None if the
+                branch does not exist.
+        """
+
+    @abstractmethod
+    async def get_branch_stock(self, branch_id: int) -> Iterable[BranchStockDTO]:
+        """Lists the stock of a branch.
+
+        Args:
+            branch_id (int): The id of the branch.
+
+        Returns:
+            Iterable[BranchStockDTO]: The copies per book of the branch.
+        """
+
+    @abstractmethod
+    async def get_book_availability(self, book_id: int) -> BookAvailabilityDTO | None:
+        """Fetches the available copies of a book across branches.
+
+        Args:
+            book_id (int): The id of the book.
+
+        Returns:
+            BookAvailabilityDTO | None: The availability if the book exists.
+        """
@@ -0,0 +1,56 @@
+"""Module containing book copy service abstractions."""
+
+from abc import ABC, abstractmethod
+from typing import Iterable
+
+from src.core.domain.copy import BookCopyIn, BookCopyUpdate
+from src.infrastructure.dto.copydto import BookCopyDTO
+
+
+class IBookCopyService(ABC):
+    """An abstract class representing the protocol for book copy services."""
+
+    @abstractmethod
+    async def add_copies(self, items: list[BookCopyIn]) -> Iterable[BookCopyDTO]:
+        """Registers physical copies of books.
+
+        Args:
+            items (list[BookCopyIn]): The copies to register.
+
+        Returns:
+            Iterable[BookCopyDTO]: The registered copies.
+        """
+
+    @abstractmethod
+    async def get_copy_by_barcode(self, barcode: str) -> BookCopyDTO | None:
+        """Fetches a copy by its barcode.
+
+        Args:
+            barcode (str): The barcode of the copy.
+
+        Returns:
+            BookCopyDTO | None: The copy details if found.
+        """
+
+    @abstractmethod
+    async def get_copies_by_book(self, book_id: int) -> Iterable[BookCopyDTO]:
+        """Lists the copies of a book.
+
+        Args:
+            book_id (int): The id of the book.
+
+        Returns:
+            Iterable[BookCopyDTO]: The copies of the book.
+        """
+
+    @abstractmethod
+    async def update_copy(self, copy_id: int, data: BookCopyUpdate) -> BookCopyDTO | None:
+        """Moves or withdraws a copy on the shelf.
+
+        Args:
+            copy_id (int): The id of the copy.
+            data (BookCopyUpdate): The new location and status.
+
+        Returns:
+            BookCopyDTO | None: The updated copy if it was on the shelf.
+        """
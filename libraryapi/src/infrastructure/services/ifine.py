@@ -0,0 +1,56 @@
+"""Module containing fine service abstractions."""
+
+from abc import ABC, abstractmethod
+from datetime import date
+from typing import Iterable
+
+from src.core.domain.fine import FineTotal
+from src.infrastructure.dto.finedto import FineDTO
+
+
+class IFineService(ABC):
+    """An abstract class representing the protocol for fine services."""
+
+    @abstractmethod
+    async def assess_fines(self, today: date) -> int:
+        """Computes fines for all overdue borrowings.
+
+        Args:
+            today (date): The date the fines are assessed on.
+
+        Returns:
+            int: Number of created or updated fines.
+        """
+
+    @abstractmethod
+    async def get_fines_by_user(self, user_id: int) -> Iterable[FineDTO]:
+        """Fetches fines of a user.
+
+        Args:
+            user_id (int): The id of the user.
+
+        Returns:
+            Iterable[FineDTO]: Fines of the user.
+        """
+
+    @abstractmethod
+    async def get_user_fine_total(self, user_id: int) -> FineTotal:
+        """Fetches the total of unpaid fines of a user.
+
+        Args:
+            user_id (int): The id of the user.
+
+        Returns:
+            FineTotal: The total of unpaid fines.
+        """
+
+    @abstractmethod
+    async def pay_fine(self, fine_id: int) -> bool:
+        """Marks a fine as paid.
+
+        Args:
+            fine_id (int): The id of the fine.
+
+        Returns:
+            bool: True if the fine was paid, otherwise False.
+        """
@@ -0,0 +1,32 @@
+"""Module containing job service abstractions."""
+
+from abc import ABC, abstractmethod
+
+from src.core.domain.job import JobIn
+from src.infrastructure.dto.jobdto import JobDTO
+
+
+class IJobService(ABC):
+    """An abstract class representing the protocol for job services."""
+
+    @abstractmethod
+    async def enqueue_job(self, job: JobIn) -> JobDTO:
+        """Adds a new job to the queue.
+
+        Args:
+            job (JobIn): The job input data.
+
+        Returns:
+            JobDTO: The queued job.
+        """
+
+    @abstractmethod
+    async def get_job_by_id(self, job_id: int) -> JobDTO | None:
+        """Fetches a job by its id.
+
+        Args:
+            job_id (int): The id of the job.
+
+        Returns:
+            JobDTO | None: The job if found.
+        """
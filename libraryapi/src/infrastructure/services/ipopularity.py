@@ -0,0 +1,40 @@
+"""Module containing book popularity service abstractions."""
+
+from abc import ABC, abstractmethod
+from typing import Iterable
+
+from src.infrastructure.dto.popularitydto import BookPopularityDTO
+
+
+class IPopularityService(ABC):
+    """An abstract class representing the protocol for popularity services."""
+
+    @abstractmethod
+    async def get_trending_books(self, limit: int) -> Iterable[BookPopularityDTO]:
+        """Fetches the currently most popular books.
+
+        Args:
+            limit (int): Maximal number of returned books.
+
+        Returns:
+            Iterable[BookPopularityDTO]: Popularity of books, most popular first.
+        """
+
+    @abstractmethod
+    async def get_book_popularity(self, book_id: int) -> BookPopularityDTO:
+        """Fetches the popularity of a single book.
+
+        Args:
+            book_id (int): The id of the book.
+
+        Returns:
+            BookPopularityDTO: The popularity of the book.
+        """
+
+    @abstractmethod
+    async def flush_popularity(self) -> int:
+        """Flushes pending popularity counters.
+
+        Returns:
+            int: Number of books whose counters were flushed.
+        """
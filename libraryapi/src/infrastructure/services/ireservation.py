@@ -0,0 +1,74 @@
+"""Module containing reservation service abstractions."""
+
+from abc import ABC, abstractmethod
+from typing import Iterable
+
+from src.core.domain.reservation import ReservationIn, ReservationPosition
+from src.infrastructure.dto.reservationdto import ReservationDTO
+
+
+class IReservationService(ABC):
+    """An abstract class representing the protocol for reservation services."""
+
+    @abstractmethod
+    async def create_reservation(self, reservation: ReservationIn) -> ReservationDTO | None:
+        """Queues a user for an unavailable book.
+
+        Args:
+            reservation (ReservationIn): The reservation input data.
+
+        Returns:
+            ReservationDTO | None: The created reservation if successful.
+        """
+
+    @abstractmethod
+    async def get_reservation_by_id(self, reservation_id: int) -> ReservationDTO | None:
+        """Fetches a reservation by its id.
+
+        Args:
+            reservation_id (int): The id of the reservation.
+
+        Returns:
+            ReservationDTO | None: The reservation if found.
+        """
+
+    @abstractmethod
+    async def get_queue_position(self, reservation_id: int) -> ReservationPosition | None:
+        """Fetches the position of a waiting reservation in its book queue.
+
+        Args:
+            reservation_id (int): The id of the reservation.
+
+        Returns:
+            ReservationPosition | None: The position if the reservation is waiting.
+        """
+
+    @abstractmethod
+    async def get_reservations_by_user(self, user_id: int) -> Iterable[ReservationDTO]:
+        """Fetches open reservations of a user.
+
+        Args:
+            user_id (int): The id of the user.
+
+        Returns:
+            Iterable[ReservationDTO]: Waiting and ready reservations of the user.
+        """
+
+    @abstractmethod
+    async def cancel_reservation(self, reservation_id: int) -> bool:
+        """Cancels an open reservation.
+
+        Args:
+            reservation_id (int): The id of the reservation.
+
+        Returns:
+            bool: True if the reservation was cancelled, otherwise False.
+        """
+
+    @abstractmethod
+    async def expire_ready_reservations(self) -> int:
+        """Expires ready reservations which were not picked up in time.
+
+        Returns:
+            int: Number of expired reservations.
+        """
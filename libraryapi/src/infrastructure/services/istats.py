@@ -0,0 +1,61 @@
+"""Module containing circulation statistics service abstractions."""
+
+from abc import ABC, abstractmethod
+from datetime import date
+from typing import Iterable
+
+from src.infrastructure.dto.statsdto import BookUtilizationDTO, MonthlyCirculationDTO
+
+
+class IStatsService(ABC):
+    """An abstract class representing the protocol for statistics services."""
+
+    @abstractmethod
+    async def get_category_circulation(
+        self,
+        since: date | None = None,
+        until: date | None = None,
+    ) -> Iterable[MonthlyCirculationDTO]:
+        """Fetches monthly circulation of categories.
+
+        Args:
+            since (date | None): The first day of the range, if any.
+            until (date | None): The last day of the range, if any.
+
+        Returns:
+            Iterable[MonthlyCirculationDTO]: Circulation per month and category.
+        """
+
+    @abstractmethod
+    async def get_author_circulation(
+        self,
+        since: date | None = None,
+        until: date | None = None,
+    ) -> Iterable[MonthlyCirculationDTO]:
+        """Fetches monthly circulation of authors.
+
+        Args:
+            since (date | None): The first day of the range, if any.
+            until (date | None): The last day of the range, if any.
+
+        Returns:
+            Iterable[MonthlyCirculationDTO]: Circulation per month and author.
+        """
+
+    @abstractmethod
+    async def get_book_utilization(
+        self,
+        limit: int,
+        since: date | None = None,
+        until: date | None = None,
+    ) -> Iterable[BookUtilizationDTO]:
+        """Fetches the most utilized titles.
+
+        Args:
+            limit (int): Maximal number of returned titles.
+            since (date | None): The first day of the range, if any.
+            until (date | None): The last day of the range, if any.
+
+        Returns:
+            Iterable[BookUtilizationDTO]: Utilization of titles, most utilized first.
+        """
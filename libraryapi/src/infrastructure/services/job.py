@@ -0,0 +1,41 @@
+"""Module containing the implementation of job services."""
+
+from src.core.domain.job import JobIn
+from src.core.repositories.ijob import IJobRepository
+from src.infrastructure.dto.jobdto import JobDTO
+from src.infrastructure.services.ijob import IJobService
+
+
+class JobService(IJobService):
+    """A service class implementing the IJobService protocol."""
+
+    _repository: IJobRepository
+
+    def __init__(self, repository: IJobRepository) -> None:
+        self._repository = repository
+
+    async def enqueue_job(self, job: JobIn) -> JobDTO:
+        """
+        Adds a new job to the queue.
+
+        Args:
+            job (JobIn): The job data.
+
+        Returns:
+            JobDTO: The queued job.
+        """
+        new_job = await self._repository.enqueue_job(job)
+        return JobDTO(**new_job.model_dump())
+
+    async def get_job_by_id(self, job_id: int) -> JobDTO | None:
+        """
+        Retrieves a job by its ID.
+
+        Args:
+            job_id (int): The ID of the job.
+
+        Returns:
+            JobDTO | None: The job if found, otherwise None.
+        """
+        job = await self._repository.get_job_by_id(job_id)
+        return JobDTO(**job.model_dump()) if job else None
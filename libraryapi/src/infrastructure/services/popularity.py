@@ -0,0 +1,51 @@
+"""Module containing the implementation of book popularity services."""
+
+from typing import Iterable
+
+from src.core.repositories.ipopularity import IPopularityRepository
+from src.infrastructure.dto.popularitydto import BookPopularityDTO
+from src.infrastructure.services.ipopularity import IPopularityService
+
+
+class PopularityService(IPopularityService):
+    """A service class implementing the IPopularityService protocol."""
+
+    _repository: IPopularityRepository
+
+    def __init__(self, repository: IPopularityRepository) -> None:
+        self._repository = repository
+
+    async def get_trending_books(self, limit: int) -> Iterable[BookPopularityDTO]:
+        """
+        Retrieves the currently most popular books.
+
+        Args:
+            limit (int): Maximal number of returned books.
+
+        Returns:
+            Iterable[BookPopularityDTO]: Popularity of books, most popular first.
+        """
+        books = await self._repository.get_trending_books(limit)
+        return [BookPopularityDTO(**book.model_dump()) for book in books]
+
+    async def get_book_popularity(self, book_id: int) -> BookPopularityDTO:
+        """
+        Retrieves the popularity of a single book.
+
+        Args:
+            book_id (int): The ID of the book.
+
+        Returns:
+            BookPopularityDTO: The popularity of the book.
+        """
+        book = await self._repository.get_book_popularity(book_id)
+        return BookPopularityDTO(**book.model_dump())
+
+    async def flush_popularity(self) -> int:
+        """
+        Flushes pending popularity counters.
+
+        Returns:
+            int: Number of books whose counters were flushed.
+        """
+        return await self._repository.flush_popularity()
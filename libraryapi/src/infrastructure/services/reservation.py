@@ -0,0 +1,89 @@
+"""Module containing the implementation of reservation services."""
+
+from typing import Iterable
+
+from src.core.domain.reservation import ReservationIn, ReservationPosition
+from src.core.repositories.ireservation import IReservationRepository
+from src.infrastructure.dto.reservationdto import ReservationDTO
+from src.infrastructure.services.ireservation import IReservationService
+
+
+class ReservationService(IReservationService):
+    """A service class implementing the IReservationService protocol."""
+
+    _repository: IReservationRepository
+
+    def __init__(self, repository: IReservationRepository) -> None:
+        self._repository = repository
+
+    async def create_reservation(self, reservation: ReservationIn) -> ReservationDTO | None:
+        """
+        Queues a user for an unavailable book.
+
+        Args:
+            reservation (ReservationIn): The reservation data.
+
+        Returns:
+            ReservationDTO | None: The created reservation if successful, otherwise None.
+        """
+        new_reservation = await self._repository.create_reservation(reservation)
+        return ReservationDTO(**new_reservation.model_dump()) if new_reservation else None
+
+    async def get_reservation_by_id(self, reservation_id: int) -> ReservationDTO | None:
+        """
+        Retrieves a reservation by its ID.
+
+        Args:
+            reservation_id (int): The ID of the reservation.
+
+        Returns:
+            ReservationDTO | None: The reservation if found, otherwise None.
+        """
+        reservation = await self._repository.get_reservation_by_id(reservation_id)
+        return ReservationDTO(**reservation.model_dump()) if reservation else None
+
+    async def get_queue_position(self, reservation_id: int) -> ReservationPosition | None:
+        """
+        Retrieves the position of a waiting reservation in its book queue.
+
+        Args:
+            reservation_id (int): The ID of the reservation.
+
+        Returns:
+            ReservationPosition | None: The position if the reservation is waiting.
+        """
+        return await self._repository.get_queue_position(reservation_id)
+
+    async def get_reservations_by_user(self, user_id: int) -> Iterable[ReservationDTO]:
+        """
+        Retrieves open reservations of a user.
+
+        Args:
+            user_id (int): The ID of the user.
+
+        Returns:
+            Iterable[ReservationDTO]: Waiting and ready reservations of the user.
+        """
+        reservations = await self._repository.get_reservations_by_user(user_id)
+        return [ReservationDTO(**reservation.model_dump()) for reservation in reservations]
+
+    async def cancel_reservation(self, reservation_id: int) -> bool:
+        """
+        Cancels an open reservation.
+
+        Args:
+            reservation_id (int): The ID of the reservation.
+
+        Returns:
+            bool: True if the reservation was cancelled, otherwise False.
+        """
+        return await self._repository.cancel_reservation(reservation_id)
+
+    async def expire_ready_reservations(self) -> int:
+        """
+        Expires ready reservations which were not picked up in time.
+
+        Returns:
+            int: Number of expired reservations.
+        """
+        return await self._repository.expire_ready_reservations()
@@ -0,0 +1,73 @@
+"""Module containing the implementation of circulation statistics services."""
+
+from datetime import date
+from typing import Iterable
+
+from src.core.repositories.istats import IStatsRepository
+from src.infrastructure.dto.statsdto import BookUtilizationDTO, MonthlyCirculationDTO
+from src.infrastructure.services.istats import IStatsService
+
+
+class StatsService(IStatsService):
+    """A service class implementing the IStatsService protocol."""
+
+    _repository: IStatsRepository
+
+    def __init__(self, repository: IStatsRepository) -> None:
+        self._repository = repository
+
+    async def get_category_circulation(
+        self,
+        since: date | None = None,
+        until: date | None = None,
+    ) -> Iterable[MonthlyCirculationDTO]:
+        """
+        Retrieves monthly circulation of categories.
+
+        Args:
+            since (date | None): The first day of the range, if any.
+            until (date | None): The last day of the range, if any.
+
+        Returns:
+            Iterable[MonthlyCirculationDTO]: Circulation per month and category.
+        """
+        circulation = await self._repository.get_category_circulation(since, until)
+        return [MonthlyCirculationDTO(**row.model_dump()) for row in circulation]
+
+    async def get_author_circulation(
+        self,
+        since: date | None = None,
+        until: date | None = None,
+    ) -> Iterable[MonthlyCirculationDTO]:
+        """
+        Retrieves monthly circulation of authors.
+
+        Args:
+            since (date | None): The first day of the range, if any.
+            until (date | None): The last day of the range, if any.
+
+        Returns:
+            Iterable[MonthlyCirculationDTO]: Circulation per month and author.
+        """
+        circulation = await self._repository.get_author_circulation(since, until)
+        return [MonthlyCirculationDTO(**row.model_dump()) for row in circulation]
+
+    async def get_book_utilization(
+        self,
+        limit: int,
+        since: date | None = None,
+        until: date | None = None,
+    ) -> Iterable[BookUtilizationDTO]:
+        """
+        Retrieves the most utilized titles.
+
+        Args:
+            limit (int): Maximal number of returned titles.
+            since (date | None): The first day of the range, if any.
+            until (date | None): The last day of the range, if any.
+
+        Returns:
+            Iterable[BookUtilizationDTO]: Utilization of titles, most utilized first.
+        """
+        utilization = await self._repository.get_book_utilization(limit, since, until)
+        return [BookUtilizationDTO(**row.model_dump()) for row in utilization]
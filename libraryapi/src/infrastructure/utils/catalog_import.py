@@ -0,0 +1,140 @@
+"""A module reading catalog feeds streamed as CSV or NDJSON."""
+
+import codecs
+import csv
+import json
+from typing import AsyncIterator
+
+CSV = "csv"
+NDJSON = "ndjson"
+
+
+def feed_format(content_type: str | None, filename: str | None = None) -> str:
+    """A function detecting the format of a feed.
+
+    Args:
+        content_type (str | None): The media type of the feed, if known.
+        filename (str | None): The name of the feed file, if known.
+
+    Returns:
+        str: `ndjson` for JSON lines, `csv` otherwise.
+    """
+    if content_type and ("ndjson" in content_type or "jsonl" in content_type):
+        return NDJSON
+    if filename and filename.endswith((".ndjson", ".jsonl")):
+        return NDJSON
+    return CSV
+
+
+async def read_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[list[str]]:
+    """A function splitting a stream of UTF-8 bytes into lines.
+
+    Args:
+        chunks (AsyncIterator[bytes]): The raw feed.
+
+    Yields:
+        list[str]: The complete lines of every chunk, without line endings.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        if lines:
+            yield [line.removesuffix("\r") for line in lines]
+
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield [pending.removesuffix("\r")]
+
+
+async def read_json_records(chunks: AsyncIterator[bytes]) -> AsyncIterator[tuple[int, dict | str]]:
+    """A function parsing a streamed NDJSON feed into records.
+
+    Args:
+        chunks (AsyncIterator[bytes]): The raw feed.
+
+    Yields:
+        tuple[int, dict | str]: The line number and the parsed record, or
+            the parsing error message.
+    """
+    line_number = 0
+
+    async for lines in read_lines(chunks):
+        for line in lines:
+            line_number += 1
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield line_number, f"Invalid JSON: {e.msg}."
+                continue
+            if isinstance(record, dict):
+                yield line_number, record
+            else:
+                yield line_number, "Expected a JSON object."
+
+
+async def read_csv_records(chunks: AsyncIterator[bytes]) -> AsyncIterator[tuple[int, dict | str]]:
+    """A function parsing a streamed CSV feed with a header row into records.
+
+    A quoted field may span several lines, the record is then numbered
+    after its first line. Empty fields are left out of records, so they
+    are treated as missing.
+
+    Args:
+        chunks (AsyncIterator[bytes]): The raw feed.
+
+    Yields:
+        tuple[int, dict | str]: The line number and the parsed record, or
+            the parsing error message.
+    """
+    header: list[str] | None = None
+    pending: list[str] = []
+    parsed_lines = 0
+
+    async for lines in read_lines(chunks):
+        lines = pending + lines
+
+        # Only lines up to the last one closing all quoted fields are parsed,
+        # a record continuing in the next chunk waits for it.
+        complete, quotes = 0, 0
+        for index, line in enumerate(lines):
+            quotes += line.count('"')
+            if not quotes % 2:
+                complete = index + 1
+        pending = lines[complete:]
+
+        reader = csv.reader(f"{line}\n" for line in lines[:complete])
+        first_line = parsed_lines + 1
+        for values in reader:
+            if values:
+                if header is None:
+                    header = [name.strip() for name in values]
+                elif len(values) != len(header):
+                    yield first_line, f"Expected {len(header)} fields, got {len(values)}."
+                else:
+                    yield first_line, {name: value for name, value in zip(header, values) if value}
+            first_line = parsed_lines + reader.line_num + 1
+        parsed_lines += complete
+
+    if pending:
+        yield parsed_lines + 1, "Unterminated quoted field."
+
+
+def read_records(chunks: AsyncIterator[bytes], format: str) -> AsyncIterator[tuple[int, dict | str]]:
+    """A function parsing a streamed feed into records.
+
+    Args:
+        chunks (AsyncIterator[bytes]): The raw feed.
+        format (str): The format of the feed, `csv` or `ndjson`.
+
+    Returns:
+        AsyncIterator[tuple[int, dict | str]]: Line numbers with parsed
+            records or parsing errors.
+    """
+    if format == NDJSON:
+        return read_json_records(chunks)
+    return read_csv_records(chunks)
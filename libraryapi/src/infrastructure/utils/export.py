@@ -0,0 +1,213 @@
+"""A module exporting circulation data to Parquet files for analytics."""
+
+import asyncio
+import os
+from datetime import datetime, timedelta
+from enum import Enum
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import sqlalchemy
+from databases import Database
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+
+from src.config import config
+from src.db import (
+    author_table,
+    book_table,
+    borrowing_shards,
+    borrowing_table,
+    category_table,
+    database,
+    export_watermark_table,
+)
+
+SNAPSHOT_TABLES = (book_table, author_table, category_table)
+
+
+def arrow_schema(table: sqlalchemy.Table) -> pa.Schema:
+    """A function mapping the columns of a table to an Arrow schema.
+
+    Args:
+        table (sqlalchemy.Table): The exported table.
+
+    Returns:
+        pa.Schema: The schema of exported files.
+    """
+    fields = []
+    for column in table.columns:
+        column_type = column.type
+        if isinstance(column_type, sqlalchemy.Integer):
+            arrow_type = pa.int64()
+        elif isinstance(column_type, sqlalchemy.Float):
+            arrow_type = pa.float64()
+        elif isinstance(column_type, sqlalchemy.Boolean):
+            arrow_type = pa.bool_()
+        elif isinstance(column_type, sqlalchemy.DateTime):
+            arrow_type = pa.timestamp("us", tz="UTC")
+        elif isinstance(column_type, sqlalchemy.Date):
+            arrow_type = pa.date32()
+        else:
+            arrow_type = pa.string()
+        fields.append(pa.field(column.name, arrow_type, nullable=column.nullable))
+
+    return pa.schema(fields)
+
+
+async def export_query(
+    query: sqlalchemy.Select,
+    schema: pa.Schema,
+    path: Path,
+    db: Database = database,
+) -> int:
+    """A function streaming the rows of a query into a Parquet file.
+
+    Rows are fetched through a server-side cursor and written in record
+    batches of `EXPORT_BATCH_SIZE` rows, so memory use does not depend on
+    the size of the table. The file is written under a temporary name and
+    renamed when complete, so readers never see a partial file.
+
+    Args:
+        query (sqlalchemy.Select): The query selecting the exported rows.
+        schema (pa.Schema): The schema of the file.
+        path (Path): The path of the written file.
+        db (Database): The database queried. Defaults to `database`.
+
+    Returns:
+        int: Number of exported rows.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial = path.with_name(f".{path.name}.partial")
+    writer = pq.ParquetWriter(partial, schema, compression="zstd")
+    columns: dict[str, list] = {name: [] for name in schema.names}
+    exported = 0
+
+    async def flush() -> None:
+        batch = pa.RecordBatch.from_pydict(columns, schema=schema)
+        await asyncio.to_thread(writer.write_batch, batch)
+        for values in columns.values():
+            values.clear()
+
+    try:
+        async for row in db.iterate(query):
+            for name in schema.names:
+                value = row[name]
+                columns[name].append(value.value if isinstance(value, Enum) else value)
+            exported += 1
+            if exported % config.EXPORT_BATCH_SIZE == 0:
+                await flush()
+        if exported % config.EXPORT_BATCH_SIZE:
+            await flush()
+    finally:
+        await asyncio.to_thread(writer.close)
+
+    os.replace(partial, path)
+    return exported
+
+
+async def export_borrowings(directory: Path) -> int:
+    """A function exporting borrowings changed since the last export.
+
+    `updated_at` is the start time of the writing transaction, so a row
+    can commit long after the time it carries. Every run therefore writes
+    the rows with `updated_at` from the watermark up to, but excluding,
+    the start of the oldest transaction still open in the database, and
+    at most up to `EXPORT_LAG_SECONDS` ago. That bound becomes the next
+    watermark. Rows of transactions still in flight carry later times and
+    land in a later file, and no row can commit behind the watermark. The
+    bound sees every session of the app's own role, which writes all
+    borrowings. A borrowing updated again appears in later files too; the
+    row with the latest `updated_at` is the current one.
+
+    With sharded borrowings every shard is exported into its own files
+    with its own watermark, taken from the shard's clock.
+
+    Args:
+        directory (Path): The export directory.
+
+    Returns:
+        int: Number of exported rows.
+    """
+    if not borrowing_shards.sharded:
+        return await export_shard(database, borrowing_table.name, directory, "")
+
+    exported = await asyncio.gather(*(
+        export_shard(shard, f"{borrowing_table.name}@{host}", directory, f"_{index}")
+        for index, (shard, host) in enumerate(zip(borrowing_shards.databases, borrowing_shards.hosts))
+    ))
+    return sum(exported)
+
+
+async def export_shard(shard: Database, name: str, directory: Path, suffix: str) -> int:
+    """A function exporting borrowings of one shard changed since its
+    last export.
+
+    Args:
+        shard (Database): The shard holding the borrowings.
+        name (str): The name of the shard's watermark.
+        directory (Path): The export directory.
+        suffix (str): The suffix of the shard's file names.
+
+    Returns:
+        int: Number of exported rows.
+    """
+    watermark_query = select(export_watermark_table.c.exported_through) \
+        .where(export_watermark_table.c.name == name)
+    since: datetime | None = await database.fetch_val(watermark_query)
+    horizon = await shard.fetch_one(
+        "SELECT now() AS now, min(xact_start) AS oldest FROM pg_stat_activity "
+        "WHERE datname = current_database() AND backend_type = 'client backend'"
+    )
+    until = min(
+        horizon["now"] - timedelta(seconds=config.EXPORT_LAG_SECONDS),
+        horizon["oldest"] or horizon["now"],
+    )
+    if since is not None and since >= until:
+        return 0
+
+    query = borrowing_table.select().where(borrowing_table.c.updated_at < until)
+    if since is not None:
+        query = query.where(borrowing_table.c.updated_at >= since)
+
+    path = directory / borrowing_table.name / f"updated_{until:%Y%m%dT%H%M%S%f}{suffix}.parquet"
+    exported = await export_query(query, arrow_schema(borrowing_table), path, shard)
+    if not exported:
+        path.unlink()
+
+    watermark = insert(export_watermark_table) \
+        .values(name=name, exported_through=until)
+    watermark = watermark.on_conflict_do_update(
+        index_elements=[export_watermark_table.c.name],
+        set_={"exported_through": watermark.excluded.exported_through},
+    )
+    await database.execute(watermark)
+
+    return exported
+
+
+async def export_analytics(directory: str | None = None) -> dict[str, int]:
+    """A function exporting circulation data for analytics.
+
+    Borrowings are exported incrementally, the small dimension tables
+    (books, authors and categories) are exported as full snapshots which
+    replace the previous ones.
+
+    Args:
+        directory (str | None): The export directory. Defaults to `EXPORT_DIR`.
+
+    Returns:
+        dict[str, int]: Number of exported rows per table.
+    """
+    target = Path(directory or config.EXPORT_DIR)
+    exported = {borrowing_table.name: await export_borrowings(target)}
+
+    for table in SNAPSHOT_TABLES:
+        exported[table.name] = await export_query(
+            table.select(),
+            arrow_schema(table),
+            target / f"{table.name}.parquet",
+        )
+
+    return exported
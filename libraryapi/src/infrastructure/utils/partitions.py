@@ -0,0 +1,208 @@
+"""A module containing maintenance of the borrowings and book stock
+table partitions."""
+
+import re
+from datetime import date
+
+from src.config import config
+from src.db import Database, borrowing_shards, database
+
+PARTITION_PATTERN = re.compile(r"^borrowings_y(\d{4})m(\d{2})$")
+
+
+def month_start(day: date, months: int = 0) -> date:
+    """A function returning the first day of a month shifted by `months`.
+
+    Args:
+        day (date): Any day of the base month.
+        months (int): Number of months to shift by. Defaults to 0.
+
+    Returns:
+        date: The first day of the shifted month.
+    """
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    """A function returning the name of the partition of a month.
+
+    Args:
+        month (date): Any day of the month.
+
+    Returns:
+        str: The name of the partition.
+    """
+    return f"borrowings_y{month.year}m{month.month:02d}"
+
+
+async def list_borrowing_partitions(db: Database = database) -> dict[str, date]:
+    """A function listing monthly partitions attached to `borrowings`.
+
+    Args:
+        db (Database): The database holding borrowings. Defaults to `database`.
+
+    Returns:
+        dict[str, date]: The first day of the month per partition name.
+    """
+    rows = await db.fetch_all(
+        "SELECT child.relname AS name FROM pg_inherits "
+        "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+        "WHERE pg_inherits.inhparent = 'borrowings'::regclass"
+    )
+    partitions = {}
+    for row in rows:
+        if match := PARTITION_PATTERN.match(row["name"]):
+            partitions[row["name"]] = date(int(match[1]), int(match[2]), 1)
+
+    return partitions
+
+
+async def create_borrowing_partition(month: date, db: Database = database) -> None:
+    """A function creating the partition of a month.
+
+    Rows of the month which have already landed in the default partition
+    are moved into the new partition before it is attached, otherwise
+    Postgres would refuse to attach it. An advisory lock keeps workers
+    starting at the same time from creating the same partition twice.
+
+    Args:
+        month (date): The first day of the month.
+        db (Database): The database holding borrowings. Defaults to `database`.
+    """
+    name = partition_name(month)
+    start, end = month, month_start(month, 1)
+
+    async with db.transaction():
+        await db.execute(
+            "SELECT pg_advisory_xact_lock(hashtext('borrowings_partitions'))"
+        )
+        if await db.fetch_val(f"SELECT to_regclass('{name}') IS NOT NULL"):
+            return
+
+        await db.execute(
+            f"CREATE TABLE {name} "
+            "(LIKE borrowings INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+        )
+        # Moved rows stay the same loans, so the loan counters are left as is.
+        await db.execute("ALTER TABLE borrowings_default DISABLE TRIGGER borrowings_user_loans")
+        await db.execute(
+            f"WITH moved AS (DELETE FROM borrowings_default "
+            f"WHERE borrowed_date >= '{start}' AND borrowed_date < '{end}' "
+            f"RETURNING *) INSERT INTO {name} SELECT * FROM moved"
+        )
+        await db.execute("ALTER TABLE borrowings_default ENABLE TRIGGER borrowings_user_loans")
+        await db.execute(
+            f"ALTER TABLE borrowings ATTACH PARTITION {name} "
+            f"FOR VALUES FROM ('{start}') TO ('{end}')"
+        )
+
+
+async def ensure_borrowing_partitions(
+    today: date | None = None,
+    db: Database = database,
+) -> list[str]:
+    """A function creating missing monthly partitions.
+
+    Partitions are created from the previous month up to
+    `BORROWING_PARTITION_MONTHS_AHEAD` months ahead, and for every month
+    which has rows in the default partition.
+
+    Args:
+        today (date | None): The current date. Defaults to today.
+        db (Database): The database holding borrowings. Defaults to `database`.
+
+    Returns:
+        list[str]: Names of the created partitions.
+    """
+    today = today or date.today()
+    existing = set((await list_borrowing_partitions(db)).values())
+
+    months = {
+        month_start(today, offset)
+        for offset in range(-1, config.BORROWING_PARTITION_MONTHS_AHEAD + 1)
+    }
+    stray = await db.fetch_all(
+        "SELECT DISTINCT date_trunc('month', borrowed_date)::date AS month "
+        "FROM borrowings_default"
+    )
+    months.update(row["month"] for row in stray)
+
+    created = []
+    for month in sorted(months - existing):
+        await create_borrowing_partition(month, db)
+        created.append(partition_name(month))
+
+    return created
+
+
+async def detach_old_borrowing_partitions(
+    today: date | None = None,
+    db: Database = database,
+) -> list[str]:
+    """A function detaching partitions older than the retention period.
+
+    Detached partitions are renamed to `archived_borrowings_yYYYYmMM` and
+    stay available as standalone tables, which borrowing history does not
+    read. Partitions are therefore only detached once all their rows have
+    been moved to the archive by `archive_returned_borrowings`, which
+    keeps active loans and recent returns. Nothing is detached when
+    `BORROWING_PARTITION_RETENTION_MONTHS` is not set.
+
+    Args:
+        today (date | None): The current date. Defaults to today.
+        db (Database): The database holding borrowings. Defaults to `database`.
+
+    Returns:
+        list[str]: Names of the detached partitions.
+    """
+    if config.BORROWING_PARTITION_RETENTION_MONTHS is None:
+        return []
+
+    cutoff = month_start(today or date.today(), -config.BORROWING_PARTITION_RETENTION_MONTHS)
+    detached = []
+
+    for name, month in sorted((await list_borrowing_partitions(db)).items()):
+        if month_start(month, 1) > cutoff:
+            continue
+        # The lock keeps loans from being moved into the partition after it
+        # has been checked.
+        async with db.transaction():
+            await db.execute(f"LOCK TABLE {name} IN ACCESS EXCLUSIVE MODE")
+            if await db.fetch_val(f"SELECT EXISTS (SELECT 1 FROM {name})"):
+                continue
+
+            await db.execute(f"ALTER TABLE borrowings DETACH PARTITION {name}")
+            await db.execute(f"ALTER TABLE {name} RENAME TO archived_{name}")
+        detached.append(name)
+
+    return detached
+
+
+async def maintain_borrowing_partitions() -> None:
+    """A function running the whole partition maintenance on every shard."""
+    for shard in borrowing_shards.databases:
+        await ensure_borrowing_partitions(db=shard)
+        await detach_old_borrowing_partitions(db=shard)
+
+
+async def create_stock_partition(branch_id: int, db: Database = database) -> str:
+    """A function creating the `book_stock` partition of a branch.
+
+    Must be called in the transaction inserting the branch, so no stock
+    of the branch can land in the default partition first.
+
+    Args:
+        branch_id (int): The id of the branch.
+        db (Database): The database holding the stock. Defaults to `database`.
+
+    Returns:
+        str: The name of the partition.
+    """
+    name = f"book_stock_b{int(branch_id)}"
+    await db.execute(
+        f"CREATE TABLE IF NOT EXISTS {name} "
+        f"PARTITION OF book_stock FOR VALUES IN ({int(branch_id)})"
+    )
+
+    return name
@@ -0,0 +1,120 @@
+"""A module containing in-memory book popularity counters."""
+
+import heapq
+import math
+import time
+from typing import Iterable
+
+from src.config import config
+
+
+class PopularityTracker:
+    """In-memory per-book popularity counters with exponential time decay.
+
+    Scores are stored normalized to a reference time, so that a common
+    decay factor does not change the ranking and no value has to be
+    rewritten as time passes. Borrowings recorded since the last flush
+    are kept separately as pending increments.
+    """
+
+    def __init__(self, half_life_days: float) -> None:
+        self._decay_rate = math.log(2) / (half_life_days * 86400)
+        self._reference = time.time()
+        self._scores: dict[int, float] = {}
+        self._counts: dict[int, int] = {}
+        self._pending: dict[int, int] = {}
+
+    @property
+    def decay_rate(self) -> float:
+        """The decay rate of scores per second."""
+        return self._decay_rate
+
+    def record(self, book_id: int) -> None:
+        """A method recording a single borrowing of a book.
+
+        Args:
+            book_id (int): The id of the borrowed book.
+        """
+        self._pending[book_id] = self._pending.get(book_id, 0) + 1
+        self._bump(book_id, 1, time.time())
+
+    def take_pending(self) -> dict[int, int]:
+        """A method taking over the increments recorded since the last flush.
+
+        Returns:
+            dict[int, int]: Number of borrowings per book id.
+        """
+        pending, self._pending = self._pending, {}
+        return pending
+
+    def restore_pending(self, pending: dict[int, int]) -> None:
+        """A method giving back increments of a failed flush.
+
+        Args:
+            pending (dict[int, int]): Number of borrowings per book id.
+        """
+        for book_id, count in pending.items():
+            self._pending[book_id] = self._pending.get(book_id, 0) + count
+
+    def load(self, rows: Iterable[tuple[int, float, int, float]]) -> None:
+        """A method replacing counters with the state shared by all workers.
+
+        Increments recorded after the flush started are applied on top.
+
+        Args:
+            rows (Iterable[tuple[int, float, int, float]]): Book id, score,
+                borrow count and the timestamp the score refers to.
+        """
+        self._reference = time.time()
+        self._scores = {}
+        self._counts = {}
+
+        for book_id, score, borrow_count, updated_at in rows:
+            self._scores[book_id] = score * self._factor(updated_at)
+            self._counts[book_id] = borrow_count
+
+        for book_id, count in self._pending.items():
+            self._bump(book_id, count, self._reference)
+
+    def get(self, book_id: int) -> tuple[float, int]:
+        """A method returning the current popularity of a book.
+
+        Args:
+            book_id (int): The id of the book.
+
+        Returns:
+            tuple[float, int]: The decayed score and the borrow count.
+        """
+        now_factor = self._factor(time.time())
+        return (
+            self._scores.get(book_id, 0.0) / now_factor,
+            self._counts.get(book_id, 0),
+        )
+
+    def trending(self, limit: int) -> list[tuple[int, float, int]]:
+        """A method returning the most popular books.
+
+        Args:
+            limit (int): The maximal number of returned books.
+
+        Returns:
+            list[tuple[int, float, int]]: Book id, decayed score and borrow
+                count, most popular first.
+        """
+        now_factor = self._factor(time.time())
+        top = heapq.nlargest(limit, self._scores.items(), key=lambda item: item[1])
+
+        return [
+            (book_id, score / now_factor, self._counts.get(book_id, 0))
+            for book_id, score in top
+        ]
+
+    def _bump(self, book_id: int, count: int, at: float) -> None:
+        self._scores[book_id] = self._scores.get(book_id, 0.0) + count * self._factor(at)
+        self._counts[book_id] = self._counts.get(book_id, 0) + count
+
+    def _factor(self, at: float) -> float:
+        return math.exp(self._decay_rate * (at - self._reference))
+
+
+popularity_tracker = PopularityTracker(config.POPULARITY_HALF_LIFE_DAYS)
@@ -0,0 +1,84 @@
+"""A module containing repository queries compiled once at import time."""
+
+from typing import Any
+
+from asyncpg import Record
+from sqlalchemy.dialects.postgresql import asyncpg
+from sqlalchemy.sql import ClauseElement
+
+from src.db import database, primary_pinned
+
+dialect = asyncpg.dialect()
+
+
+class PreparedQuery:
+    """A SQLAlchemy Core query compiled once into parameterized SQL.
+
+    Calls skip building and compiling the expression and send the SQL to
+    asyncpg directly. asyncpg prepares every SQL text once per pooled
+    connection and keeps the server-side prepared statement in its
+    statement cache (`DB_STATEMENT_CACHE_SIZE`), so repeated calls only
+    bind the arguments. Variable values are declared with named
+    `bindparam`s and passed as keyword arguments.
+
+    Reads of read-only queries are served by a replica when `database`
+    would route them there.
+
+    Rows are returned as asyncpg records, which convert to dicts like the
+    records of `databases`. Columns needing result processing, such as
+    JSONB, come back as asyncpg decodes them, so they are better left to
+    the regular path.
+    """
+
+    def __init__(self, query: ClauseElement) -> None:
+        compiled = query.compile(dialect=dialect)
+        self.query = query
+        self.sql = compiled.string
+        self._names = compiled.positiontup or []
+        self._defaults = compiled.params
+
+    def arguments(self, values: dict[str, Any]) -> list[Any]:
+        """Orders the values of bound parameters as positional arguments.
+
+        Args:
+            values (dict[str, Any]): Values of the named parameters.
+
+        Returns:
+            list[Any]: The arguments of the SQL.
+        """
+        arguments = {**self._defaults, **values}
+        return [arguments[name] for name in self._names]
+
+    async def fetch_one(self, **values: Any) -> Record | None:
+        """Fetches the first row of the query.
+
+        Args:
+            **values (Any): Values of the named parameters.
+
+        Returns:
+            Record | None: The row if any.
+        """
+        async with database.reader(self.query).connection() as connection:
+            return await connection.raw_connection.fetchrow(self.sql, *self.arguments(values))
+
+    async def fetch_all(self, **values: Any) -> list[Record]:
+        """Fetches all rows of the query.
+
+        Args:
+            **values (Any): Values of the named parameters.
+
+        Returns:
+            list[Record]: The rows.
+        """
+        async with database.reader(self.query).connection() as connection:
+            return await connection.raw_connection.fetch(self.sql, *self.arguments(values))
+
+    async def execute(self, **values: Any) -> None:
+        """Executes the query without fetching rows.
+
+        Args:
+            **values (Any): Values of the named parameters.
+        """
+        primary_pinned.set(True)
+        async with database.connection() as connection:
+            await connection.raw_connection.execute(self.sql, *self.arguments(values))
@@ -0,0 +1,220 @@
+"""A module containing the in-app scheduler of periodic maintenance jobs."""
+
+import asyncio
+import math
+import random
+import time
+from contextlib import suppress
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable
+
+from sqlalchemy.dialects.postgresql import insert
+
+from src.config import config
+from src.db import database, scheduler_run_table
+
+
+class ScheduledJob:
+    """A periodic job together with its run metrics.
+
+    Runs are aligned to wall-clock slots like cron entries: a job with
+    `interval=86400` and `offset=3600` runs every day at 01:00 UTC.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable[[], Awaitable[Any]],
+        interval: float,
+        offset: float = 0.0,
+        jitter: float = 0.0,
+        exclusive: bool = True,
+    ) -> None:
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.offset = offset
+        self.jitter = jitter
+        self.exclusive = exclusive
+
+        self.runs = 0
+        self.failures = 0
+        self.skipped = 0
+        self.total_duration = 0.0
+        self.max_duration = 0.0
+        self.last_duration: float | None = None
+        self.last_started_at: datetime | None = None
+        self.last_error: str | None = None
+        self.next_run_at: datetime | None = None
+
+    def next_slot(self, now: float) -> float:
+        """A method computing the next slot the job is due in.
+
+        Args:
+            now (float): The current UNIX timestamp.
+
+        Returns:
+            float: The UNIX timestamp of the next slot.
+        """
+        return (math.floor((now - self.offset) / self.interval) + 1) * self.interval + self.offset
+
+    def metrics(self) -> dict:
+        """A method returning the run metrics of the job.
+
+        Returns:
+            dict: The run metrics.
+        """
+        return {
+            "name": self.name,
+            "interval": self.interval,
+            "exclusive": self.exclusive,
+            "runs": self.runs,
+            "failures": self.failures,
+            "skipped": self.skipped,
+            "last_started_at": self.last_started_at,
+            "last_duration": self.last_duration,
+            "average_duration": self.total_duration / self.runs if self.runs else None,
+            "max_duration": self.max_duration if self.runs else None,
+            "last_error": self.last_error,
+            "next_run_at": self.next_run_at,
+        }
+
+
+class Scheduler:
+    """A lightweight asyncio scheduler started in the app lifespan.
+
+    Exclusive jobs are run by a single worker per slot: the worker has to
+    take a Postgres advisory lock named after the job and then claim the
+    slot in `scheduler_runs`, so neither overlapping runs nor runs of a
+    late worker in an already handled slot can happen.
+    """
+
+    def __init__(self) -> None:
+        self._jobs: dict[str, ScheduledJob] = {}
+        self._tasks: list[asyncio.Task] = []
+
+    def add_job(
+        self,
+        name: str,
+        func: Callable[[], Awaitable[Any]],
+        interval: float,
+        offset: float = 0.0,
+        jitter: float | None = None,
+        exclusive: bool = True,
+    ) -> None:
+        """A method registering a periodic job.
+
+        Args:
+            name (str): The unique name of the job.
+            func (Callable[[], Awaitable[Any]]): The coroutine function to run.
+            interval (float): Seconds between runs.
+            offset (float): Seconds the slots are shifted by. Defaults to 0.
+            jitter (float | None): Maximal random delay of a run in seconds.
+                Defaults to `SCHEDULER_JITTER_SECONDS`.
+            exclusive (bool): Whether only one worker may run a slot.
+                Defaults to True.
+        """
+        self._jobs[name] = ScheduledJob(
+            name,
+            func,
+            interval,
+            offset,
+            config.SCHEDULER_JITTER_SECONDS if jitter is None else jitter,
+            exclusive,
+        )
+
+    def metrics(self) -> list[dict]:
+        """A method returning run metrics of all registered jobs.
+
+        Returns:
+            list[dict]: The run metrics of jobs.
+        """
+        return [job.metrics() for job in self._jobs.values()]
+
+    async def start(self) -> None:
+        """A method starting the loops of all registered jobs."""
+        self._tasks = [
+            asyncio.create_task(self._run_forever(job), name=f"scheduler:{job.name}")
+            for job in self._jobs.values()
+        ]
+
+    async def stop(self) -> None:
+        """A method cancelling the loops of all jobs."""
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            with suppress(asyncio.CancelledError):
+                await task
+        self._tasks = []
+
+    async def _run_forever(self, job: ScheduledJob) -> None:
+        while True:
+            slot = job.next_slot(time.time())
+            job.next_run_at = datetime.fromtimestamp(slot, tz=timezone.utc)
+            await asyncio.sleep(max(0.0, slot - time.time()) + random.uniform(0, job.jitter))
+
+            try:
+                if job.exclusive:
+                    await self._run_exclusive(job, slot)
+                else:
+                    await self._execute(job)
+            except Exception as e:
+                print(f"Scheduling of job {job.name} failed: {e}")
+
+    async def _run_exclusive(self, job: ScheduledJob, slot: float) -> None:
+        slot_at = datetime.fromtimestamp(slot, tz=timezone.utc)
+
+        async with database.connection() as connection:
+            locked = await connection.fetch_val(
+                "SELECT pg_try_advisory_lock(hashtext(:name))",
+                {"name": job.name},
+            )
+            if not locked:
+                job.skipped += 1
+                return
+
+            try:
+                claim = insert(scheduler_run_table).values(name=job.name, last_slot=slot_at)
+                claim = claim.on_conflict_do_update(
+                    index_elements=[scheduler_run_table.c.name],
+                    set_={"last_slot": claim.excluded.last_slot},
+                    where=scheduler_run_table.c.last_slot < claim.excluded.last_slot,
+                ).returning(scheduler_run_table.c.name)
+
+                if not await connection.fetch_one(claim):
+                    job.skipped += 1
+                    return
+
+                await self._execute(job)
+
+                finish = scheduler_run_table.update() \
+                    .where(scheduler_run_table.c.name == job.name) \
+                    .values(last_duration=job.last_duration, last_error=job.last_error)
+                await connection.execute(finish)
+            finally:
+                await connection.execute(
+                    "SELECT pg_advisory_unlock(hashtext(:name))",
+                    {"name": job.name},
+                )
+
+    @staticmethod
+    async def _execute(job: ScheduledJob) -> None:
+        job.last_started_at = datetime.now(timezone.utc)
+        started = time.perf_counter()
+
+        try:
+            await job.func()
+            job.last_error = None
+        except Exception as e:
+            job.failures += 1
+            job.last_error = str(e)
+            print(f"Job {job.name} failed: {e}")
+        finally:
+            duration = time.perf_counter() - started
+            job.runs += 1
+            job.last_duration = duration
+            job.total_duration += duration
+            job.max_duration = max(job.max_duration, duration)
+
+
+scheduler = Scheduler()
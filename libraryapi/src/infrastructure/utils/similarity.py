@@ -0,0 +1,430 @@
+"""A module containing the TF-IDF model used for similar books lookups."""
+
+import fcntl
+import os
+import re
+import shutil
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+import numpy as np
+
+from src.config import config
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+EMPTY_NEIGHBOUR = -1
+
+
+def book_tokens(
+    title: str,
+    author_first_name: str,
+    author_last_name: str,
+    category_name: str,
+) -> list[str]:
+    """A function building the token list describing a book.
+
+    Author and category are kept as single prefixed tokens so that they
+    match only the very same author or category, not shared words.
+
+    Args:
+        title (str): The title of the book.
+        author_first_name (str): The first name of the author.
+        author_last_name (str): The last name of the author.
+        category_name (str): The name of the category.
+
+    Returns:
+        list[str]: The tokens of the book document.
+    """
+    tokens = [token for token in TOKEN_PATTERN.findall(title.lower()) if len(token) > 1]
+    tokens.append(f"author:{author_first_name} {author_last_name}".lower())
+    tokens.append(f"category:{category_name}".lower())
+
+    return tokens
+
+
+class SimilarityIndex:
+    """A TF-IDF model over books with precomputed top-N neighbours.
+
+    Term counts are kept in CSR form and similarities are computed as
+    sparse row-by-column products against an inverted (CSC) copy of the
+    matrix. The model is persisted as versioned `.npy` files which are
+    opened with `mmap_mode="r"`, so all workers share one page-cache copy.
+    """
+
+    _ARRAYS = ("book_ids", "indptr", "indices", "counts", "neighbours", "scores")
+
+    def __init__(self, directory: str, top_n: int) -> None:
+        self._directory = Path(directory)
+        self._top_n = top_n
+        self._version: str | None = None
+        self._vocabulary: dict[str, int] = {}
+        self._arrays: dict[str, np.ndarray] = {}
+        self._positions: dict[int, int] = {}
+
+    def age(self) -> float | None:
+        """A method returning how long ago the model on disk was fully built.
+
+        Incremental updates publish new versions too, so the time of the
+        last full build is kept in its own `BUILT` marker.
+
+        Returns:
+            float | None: The age of the model in seconds, None if no model
+                has been built yet.
+        """
+        try:
+            version = (self._directory / "BUILT").read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return None
+
+        return time.time() - int(version.removeprefix("v")) / 1e9
+
+    def build(self, documents: list[tuple[int, list[str]]]) -> None:
+        """A method rebuilding the whole model from scratch.
+
+        Args:
+            documents (list[tuple[int, list[str]]]): Pairs of book id and tokens.
+        """
+        vocabulary: dict[str, int] = {}
+        book_ids = np.fromiter((book_id for book_id, _ in documents), dtype=np.int64)
+        indptr = [0]
+        indices: list[int] = []
+        counts: list[int] = []
+
+        for _, tokens in documents:
+            self._append_document(vocabulary, tokens, indptr, indices, counts)
+
+        arrays = {
+            "book_ids": book_ids,
+            "indptr": np.asarray(indptr, dtype=np.int64),
+            "indices": np.asarray(indices, dtype=np.int64),
+            "counts": np.asarray(counts, dtype=np.float32),
+        }
+        neighbours, scores = self._all_neighbours(arrays, len(vocabulary))
+        arrays["neighbours"] = neighbours
+        arrays["scores"] = scores
+
+        with self._lock():
+            self._save(vocabulary, arrays)
+            built = self._directory / "BUILT.tmp"
+            built.write_text(self._version, encoding="utf-8")
+            os.replace(built, self._directory / "BUILT")
+
+    def add(self, book_id: int, tokens: list[str]) -> None:
+        """A method adding a single book to the model incrementally.
+
+        The neighbours of the new book are computed exactly. Existing books
+        only gain the new book as a neighbour when it beats their current
+        worst neighbour; their other scores keep the idf they were built
+        with until the next full rebuild.
+
+        Args:
+            book_id (int): The id of the added book.
+            tokens (list[str]): The tokens describing the book.
+        """
+        with self._lock():
+            self._refresh()
+            if not self._arrays or book_id in self._positions:
+                return
+
+            self._save(*self._added(dict(self._vocabulary), self._arrays, book_id, tokens))
+
+    def replace(self, book_id: int, tokens: list[str]) -> None:
+        """A method replacing the document of an edited book.
+
+        The book is removed as in `remove` and added again as in `add`.
+
+        Args:
+            book_id (int): The id of the edited book.
+            tokens (list[str]): The new tokens describing the book.
+        """
+        with self._lock():
+            self._refresh()
+            if not self._arrays:
+                return
+
+            arrays = self._removed(self._arrays, book_id) if book_id in self._positions else self._arrays
+            self._save(*self._added(dict(self._vocabulary), arrays, book_id, tokens))
+
+    def remove(self, book_id: int) -> None:
+        """A method removing a deleted book from the model.
+
+        Books which had it as a neighbour keep their other neighbours and
+        get a replacement only with the next full rebuild.
+
+        Args:
+            book_id (int): The id of the deleted book.
+        """
+        with self._lock():
+            self._refresh()
+            if book_id not in self._positions:
+                return
+
+            self._save(self._vocabulary, self._removed(self._arrays, book_id))
+
+    def similar(self, book_id: int, limit: int) -> list[int]:
+        """A method returning ids of books most similar to the given one.
+
+        Args:
+            book_id (int): The id of the book.
+            limit (int): The maximal number of returned ids.
+
+        Returns:
+            list[int]: Ids of similar books, most similar first.
+        """
+        self._refresh()
+        position = self._positions.get(book_id)
+        if position is None:
+            return []
+
+        neighbours = self._arrays["neighbours"][position, :limit]
+        return [int(neighbour) for neighbour in neighbours if neighbour != EMPTY_NEIGHBOUR]
+
+    def _added(
+        self,
+        vocabulary: dict[str, int],
+        arrays: dict[str, np.ndarray],
+        book_id: int,
+        tokens: list[str],
+    ) -> tuple[dict[str, int], dict[str, np.ndarray]]:
+        indptr = [int(arrays["indptr"][-1])]
+        indices: list[int] = []
+        counts: list[int] = []
+        self._append_document(vocabulary, tokens, indptr, indices, counts)
+
+        added = {
+            "book_ids": np.append(arrays["book_ids"], book_id),
+            "indptr": np.append(arrays["indptr"], indptr[1:]),
+            "indices": np.append(arrays["indices"], indices),
+            "counts": np.append(arrays["counts"], np.asarray(counts, np.float32)),
+        }
+        position = len(added["book_ids"]) - 1
+        similarities = self._document_scores(added, len(vocabulary), position)
+
+        own_neighbours, own_scores = self._top(added, similarities)
+        neighbours = np.vstack([arrays["neighbours"], own_neighbours])
+        scores = np.vstack([arrays["scores"], own_scores])
+
+        improved = np.flatnonzero(similarities[:-1] > scores[:-1, -1])
+        for row in improved:
+            merged_ids = np.append(neighbours[row], book_id)
+            merged_scores = np.append(scores[row], similarities[row])
+            order = np.argsort(-merged_scores, kind="stable")[: self._top_n]
+            neighbours[row] = merged_ids[order]
+            scores[row] = merged_scores[order]
+
+        added["neighbours"] = neighbours
+        added["scores"] = scores
+        return vocabulary, added
+
+    def _removed(self, arrays: dict[str, np.ndarray], book_id: int) -> dict[str, np.ndarray]:
+        position = self._positions[book_id]
+        start, end = int(arrays["indptr"][position]), int(arrays["indptr"][position + 1])
+
+        neighbours = np.delete(arrays["neighbours"], position, axis=0)
+        scores = np.delete(arrays["scores"], position, axis=0)
+        for row in np.flatnonzero((neighbours == book_id).any(axis=1)):
+            kept = neighbours[row] != book_id
+            neighbours[row] = np.append(neighbours[row][kept], EMPTY_NEIGHBOUR)
+            scores[row] = np.append(scores[row][kept], 0)
+
+        return {
+            "book_ids": np.delete(arrays["book_ids"], position),
+            "indptr": np.concatenate([
+                arrays["indptr"][:position],
+                arrays["indptr"][position + 1:] - (end - start),
+            ]),
+            "indices": np.delete(arrays["indices"], np.s_[start:end]),
+            "counts": np.delete(arrays["counts"], np.s_[start:end]),
+            "neighbours": neighbours,
+            "scores": scores,
+        }
+
+    @staticmethod
+    def _append_document(
+        vocabulary: dict[str, int],
+        tokens: list[str],
+        indptr: list[int],
+        indices: list[int],
+        counts: list[int],
+    ) -> None:
+        terms: dict[int, int] = {}
+        for token in tokens:
+            term = vocabulary.setdefault(token, len(vocabulary))
+            terms[term] = terms.get(term, 0) + 1
+
+        indices.extend(terms.keys())
+        counts.extend(terms.values())
+        indptr.append(indptr[-1] + len(terms))
+
+    @staticmethod
+    def _weights(arrays: dict[str, np.ndarray], vocabulary_size: int) -> np.ndarray:
+        documents = len(arrays["book_ids"])
+        rows = np.repeat(np.arange(documents), np.diff(arrays["indptr"]))
+        document_frequency = np.bincount(arrays["indices"], minlength=vocabulary_size)
+        idf = np.log((1 + documents) / (1 + document_frequency)) + 1
+
+        weights = (1 + np.log(arrays["counts"])) * idf[arrays["indices"]]
+        norms = np.sqrt(np.bincount(rows, weights=weights**2, minlength=documents))
+        norms[norms == 0] = 1
+
+        return (weights / norms[rows]).astype(np.float32)
+
+    @staticmethod
+    def _columns(
+        arrays: dict[str, np.ndarray],
+        weights: np.ndarray,
+        vocabulary_size: int,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        rows = np.repeat(np.arange(len(arrays["book_ids"])), np.diff(arrays["indptr"]))
+        order = np.argsort(arrays["indices"], kind="stable")
+        column_ptr = np.zeros(vocabulary_size + 1, dtype=np.int64)
+        np.cumsum(np.bincount(arrays["indices"], minlength=vocabulary_size), out=column_ptr[1:])
+
+        return column_ptr, rows[order], weights[order]
+
+    @staticmethod
+    def _row_scores(
+        terms: np.ndarray,
+        term_weights: np.ndarray,
+        columns: tuple[np.ndarray, np.ndarray, np.ndarray],
+        documents: int,
+    ) -> np.ndarray:
+        column_ptr, column_rows, column_weights = columns
+        starts = column_ptr[terms]
+        lengths = column_ptr[terms + 1] - starts
+        offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+        postings = offsets + np.arange(lengths.sum())
+
+        return np.bincount(
+            column_rows[postings],
+            weights=column_weights[postings] * np.repeat(term_weights, lengths),
+            minlength=documents,
+        )
+
+    def _document_scores(
+        self,
+        arrays: dict[str, np.ndarray],
+        vocabulary_size: int,
+        position: int,
+    ) -> np.ndarray:
+        weights = self._weights(arrays, vocabulary_size)
+        columns = self._columns(arrays, weights, vocabulary_size)
+        start, end = arrays["indptr"][position], arrays["indptr"][position + 1]
+        scores = self._row_scores(
+            arrays["indices"][start:end],
+            weights[start:end],
+            columns,
+            len(arrays["book_ids"]),
+        )
+        scores[position] = 0
+
+        return scores
+
+    def _all_neighbours(
+        self,
+        arrays: dict[str, np.ndarray],
+        vocabulary_size: int,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        documents = len(arrays["book_ids"])
+        neighbours = np.full((documents, self._top_n), EMPTY_NEIGHBOUR, dtype=np.int64)
+        scores = np.zeros((documents, self._top_n), dtype=np.float32)
+        weights = self._weights(arrays, vocabulary_size)
+        columns = self._columns(arrays, weights, vocabulary_size)
+
+        for position in range(documents):
+            start, end = arrays["indptr"][position], arrays["indptr"][position + 1]
+            similarities = self._row_scores(
+                arrays["indices"][start:end],
+                weights[start:end],
+                columns,
+                documents,
+            )
+            similarities[position] = 0
+            neighbours[position], scores[position] = self._top(arrays, similarities)
+
+        return neighbours, scores
+
+    def _top(
+        self,
+        arrays: dict[str, np.ndarray],
+        similarities: np.ndarray,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        neighbours = np.full(self._top_n, EMPTY_NEIGHBOUR, dtype=np.int64)
+        scores = np.zeros(self._top_n, dtype=np.float32)
+
+        candidates = np.flatnonzero(similarities > 0)
+        if len(candidates) > self._top_n:
+            partition = np.argpartition(-similarities[candidates], self._top_n - 1)
+            candidates = candidates[partition[: self._top_n]]
+        candidates = candidates[np.argsort(-similarities[candidates], kind="stable")]
+
+        neighbours[: len(candidates)] = arrays["book_ids"][candidates]
+        scores[: len(candidates)] = similarities[candidates]
+
+        return neighbours, scores
+
+    @contextmanager
+    def _lock(self) -> Iterator[None]:
+        self._directory.mkdir(parents=True, exist_ok=True)
+        with open(self._directory / ".lock", "w", encoding="utf-8") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _save(self, vocabulary: dict[str, int], arrays: dict[str, np.ndarray]) -> None:
+        version = f"v{time.time_ns()}"
+        target = self._directory / version
+        target.mkdir()
+
+        for name in self._ARRAYS:
+            np.save(target / f"{name}.npy", arrays[name])
+        terms = sorted(vocabulary, key=vocabulary.get)
+        np.save(target / "vocabulary.npy", np.asarray(terms, dtype=str))
+
+        current = self._directory / "CURRENT.tmp"
+        current.write_text(version, encoding="utf-8")
+        os.replace(current, self._directory / "CURRENT")
+
+        # Mapped files stay readable after unlinking, so older versions
+        # can be removed as soon as the new one is published.
+        for stale in self._directory.glob("v*"):
+            if stale.name != version:
+                shutil.rmtree(stale, ignore_errors=True)
+
+        self._refresh()
+
+    def _refresh(self) -> None:
+        try:
+            version = (self._directory / "CURRENT").read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return
+        if version == self._version:
+            return
+
+        source = self._directory / version
+        try:
+            arrays = {
+                name: np.load(source / f"{name}.npy", mmap_mode="r")
+                for name in self._ARRAYS
+            }
+            terms = np.load(source / "vocabulary.npy")
+        except FileNotFoundError:
+            return
+
+        self._arrays = arrays
+        self._vocabulary = {str(term): index for index, term in enumerate(terms)}
+        self._positions = {
+            int(book_id): position
+            for position, book_id in enumerate(arrays["book_ids"])
+        }
+        self._version = version
+
+
+similarity_index = SimilarityIndex(
+    config.SIMILARITY_INDEX_DIR,
+    config.SIMILARITY_TOP_N,
+)
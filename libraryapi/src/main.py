@@ -1,11 +1,20 @@
 """Main module of the LibraryAPI app."""
 
+import time
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator
+from datetime import date
+from typing import AsyncGenerator, Awaitable, Callable
 from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.exception_handlers import http_exception_handler
+from src.config import config
 from src.container import Container
-from src.db import database, init_db
+from src.db import borrowing_shards, database, init_db, primary_pinned
+from src.infrastructure.utils.partitions import (
+    ensure_borrowing_partitions,
+    maintain_borrowing_partitions,
+)
+from src.infrastructure.utils.export import export_analytics
+from src.infrastructure.utils.scheduler import scheduler
 
 from src.api.routers.user import router as user_router
 from src.api.routers.author import router as author_router
@@ -13,6 +22,16 @@ from src.api.routers.book import router as book_router
 from src.api.routers.category import router as category_router
 from src.api.routers.borrowing import router as borrowing_router
 from src.api.routers.recommendation import router as recommendation_router
+from src.api.routers.popularity import router as popularity_router
+from src.api.routers.reservation import router as reservation_router
+from src.api.routers.fine import router as fine_router
+from src.api.routers.scheduler import router as scheduler_router
+from src.api.routers.job import router as job_router
+from src.api.routers.stats import router as stats_router
+from src.api.routers.export import router as export_router
+from src.api.routers.database import router as database_router
+from src.api.routers.branch import router as branch_router
+from src.api.routers.copy import router as copy_router
 
 
 
@@ -23,16 +42,96 @@ container.wire(modules=[
     "src.api.routers.book",
     "src.api.routers.category",
     "src.api.routers.borrowing",
-    "src.api.routers.recommendation"
+    "src.api.routers.recommendation",
+    "src.api.routers.popularity",
+    "src.api.routers.reservation",
+    "src.api.routers.fine",
+    "src.api.routers.job",
+    "src.api.routers.stats",
+    "src.api.routers.export",
+    "src.api.routers.branch",
+    "src.api.routers.copy",
 ])
 
 
+async def assess_fines() -> None:
+    """Job assessing fines of overdue borrowings."""
+    await container.fine_repository().assess_fines(date.today())
+
+
+# Popularity counters live in each worker, so every worker flushes its own.
+scheduler.add_job(
+    "popularity_flush",
+    container.popularity_repository().flush_popularity,
+    interval=config.POPULARITY_FLUSH_INTERVAL_SECONDS,
+    exclusive=False,
+)
+scheduler.add_job(
+    "fine_assessment",
+    assess_fines,
+    interval=config.FINE_ASSESSMENT_INTERVAL_SECONDS,
+)
+scheduler.add_job(
+    "reservation_expiry",
+    container.reservation_repository().expire_ready_reservations,
+    interval=config.RESERVATION_EXPIRY_INTERVAL_SECONDS,
+)
+scheduler.add_job(
+    "borrowing_partitions",
+    maintain_borrowing_partitions,
+    interval=config.BORROWING_PARTITION_INTERVAL_SECONDS,
+)
+scheduler.add_job(
+    "borrowing_archive",
+    container.borrowing_repository().archive_returned_borrowings,
+    interval=config.BORROWING_ARCHIVE_INTERVAL_SECONDS,
+    offset=1800,
+)
+scheduler.add_job(
+    "loan_counter_reconciliation",
+    container.borrowing_repository().reconcile_loan_counters,
+    interval=config.LOAN_COUNTER_RECONCILIATION_INTERVAL_SECONDS,
+)
+scheduler.add_job(
+    "circulation_rollup",
+    container.stats_repository().refresh_circulation,
+    interval=config.STATS_REFRESH_INTERVAL_SECONDS,
+)
+scheduler.add_job(
+    "copy_availability",
+    container.copy_repository().refresh_copy_availability,
+    interval=config.COPY_AVAILABILITY_REFRESH_INTERVAL_SECONDS,
+)
+scheduler.add_job(
+    "analytics_export",
+    export_analytics,
+    interval=config.EXPORT_INTERVAL_SECONDS,
+    offset=7200,
+)
+# The similarity model is stored on each host's disk, so every host rebuilds its own.
+scheduler.add_job(
+    "similarity_rebuild",
+    container.book_repository().rebuild_similarity_index,
+    interval=config.SIMILARITY_REBUILD_INTERVAL_SECONDS,
+    exclusive=False,
+)
+
+
 @asynccontextmanager
 async def lifespan(_: FastAPI) -> AsyncGenerator:
     """Lifespan function working on app startup."""
     await init_db()
-    await database.connect()
+    for shard in borrowing_shards.databases:
+        await ensure_borrowing_partitions(db=shard)
+    await container.borrowing_repository().reconcile_loan_counters()
+    await container.book_repository().rebuild_similarity_index()
+    await container.popularity_repository().flush_popularity()
+    if config.SCHEDULER_ENABLED:
+        await scheduler.start()
     yield
+    await scheduler.stop()
+    await container.popularity_repository().flush_popularity()
+    await borrowing_shards.disconnect()
     await database.disconnect()
 
 
@@ -43,6 +142,56 @@ app.include_router(book_router, prefix="/books")
 app.include_router(category_router, prefix="/categories")
 app.include_router(borrowing_router, prefix="/borrowings")
 app.include_router(recommendation_router, prefix="/recommendations")
+app.include_router(popularity_router)
+app.include_router(reservation_router)
+app.include_router(fine_router)
+app.include_router(scheduler_router)
+app.include_router(job_router)
+app.include_router(stats_router)
+app.include_router(export_router)
+app.include_router(database_router)
+app.include_router(branch_router)
+app.include_router(copy_router)
+
+
+# Clients which wrote recently keep reading from the primary, so they see
+# their own changes even when replicas lag behind.
+PRIMARY_PIN_COOKIE = "primary_pinned_until"
+MUTATING_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+
+@app.middleware("http")
+async def read_your_writes(
+    request: Request,
+    call_next: Callable[[Request], Awaitable[Response]],
+) -> Response:
+    """A middleware pinning reads of recent writers to the primary.
+
+    Args:
+        request (Request): The incoming HTTP request.
+        call_next (Callable[[Request], Awaitable[Response]]): The next handler.
+
+    Returns:
+        Response: The HTTP response.
+    """
+    try:
+        pinned_until = float(request.cookies.get(PRIMARY_PIN_COOKIE, 0))
+    except ValueError:
+        pinned_until = 0
+    primary_pinned.set(pinned_until > time.time())
+
+    response = await call_next(request)
+    if request.method in MUTATING_METHODS and response.status_code < 400:
+        response.set_cookie(
+            PRIMARY_PIN_COOKIE,
+            str(int(time.time() + config.DB_READ_YOUR_WRITES_SECONDS)),
+            max_age=int(config.DB_READ_YOUR_WRITES_SECONDS),
+            httponly=True,
+        )
+
+    return response
+
+
 @app.get("/")
 async def root():
     return {"message": "Welcome to LibraryAPI"}
@@ -0,0 +1,151 @@
+"""Command moving borrowings to the shards of their users after the shard
+map changed.
+
+Run with `python -m src.reshard_borrowings --source '["host:port", ...]'`,
+giving the previous `BORROWING_SHARD_HOSTS` (`[]` when borrowings were kept
+on DB_HOST). Rows are moved to the shards of the current
+`BORROWING_SHARD_HOSTS`.
+
+Borrowings, archived borrowings and loan counters are moved per batch of
+`BORROWING_RESHARD_BATCH_SIZE` users: copied to the new shard, skipping
+rows already there, and deleted from the old one. An interrupted run can
+be repeated. Checkouts and returns of the moved users must be paused
+while the command runs.
+"""
+
+import argparse
+import asyncio
+import json
+
+from sqlalchemy import select, union
+from sqlalchemy.dialects.postgresql import insert
+
+from src.config import config
+from src.container import Container
+from src.db import (
+    SHARDED_TABLES,
+    Database,
+    borrowing_shards,
+    borrowing_table,
+    database,
+    database_uri,
+    pool_options,
+)
+
+
+container = Container()
+
+
+def shard_databases(hosts: list[str], connections: dict[str, Database]) -> list[Database]:
+    """A function opening the databases of a shard map.
+
+    Args:
+        hosts (list[str]): The shard hosts, empty for DB_HOST only.
+        connections (dict[str, Database]): Databases opened so far per host.
+
+    Returns:
+        list[Database]: The shards in map order.
+    """
+    return [
+        connections.setdefault(host, Database(database_uri(host), **pool_options))
+        for host in hosts
+    ] or [database]
+
+
+async def move_users(source: Database, target: Database, user_ids: list[int]) -> int:
+    """A function moving the sharded rows of users between shards.
+
+    The rows are locked on the old shard until they are committed on the
+    new one. Loan counters of moved active borrowings are kept by the
+    triggers of both shards.
+
+    Args:
+        source (Database): The old shard.
+        target (Database): The new shard.
+        user_ids (list[int]): The users to move.
+
+    Returns:
+        int: Number of moved borrowings.
+    """
+    moved = 0
+
+    async with source.transaction():
+        for table in SHARDED_TABLES:
+            rows = await source.fetch_all(
+                table.select()
+                    .where(table.c.user_id.in_(user_ids))
+                    .with_for_update()
+            )
+            if not rows:
+                continue
+
+            async with target.transaction():
+                await target.execute(
+                    insert(table)
+                        .values([dict(row) for row in rows])
+                        .on_conflict_do_nothing()
+                )
+            await source.execute(table.delete().where(table.c.user_id.in_(user_ids)))
+            if table is borrowing_table:
+                moved += len(rows)
+
+    return moved
+
+
+async def reshard(source_hosts: list[str]) -> dict[str, int]:
+    """A function moving all users whose shard differs in the current map.
+
+    Args:
+        source_hosts (list[str]): The previous shard hosts.
+
+    Returns:
+        dict[str, int]: Numbers of moved users and borrowings.
+    """
+    connections = dict(zip(borrowing_shards.hosts, borrowing_shards.databases))
+    sources = shard_databases(source_hosts, connections)
+    await borrowing_shards.connect()
+    for source in sources:
+        await source.connect()
+
+    users, borrowings = 0, 0
+    try:
+        for source in sources:
+            query = union(*(select(table.c.user_id) for table in SHARDED_TABLES))
+            moves: dict[Database, list[int]] = {}
+            for row in await source.fetch_all(query):
+                target = borrowing_shards.for_user(row["user_id"])
+                if target is not source:
+                    moves.setdefault(target, []).append(row["user_id"])
+
+            for target, user_ids in moves.items():
+                for start in range(0, len(user_ids), config.BORROWING_RESHARD_BATCH_SIZE):
+                    batch = user_ids[start:start + config.BORROWING_RESHARD_BATCH_SIZE]
+                    borrowings += await move_users(source, target, batch)
+                    users += len(batch)
+
+        await container.borrowing_repository().reconcile_loan_counters()
+    finally:
+        for shard in connections.values():
+            if shard.is_connected:
+                await shard.disconnect()
+
+    return {"users": users, "borrowings": borrowings}
+
+
+async def main() -> None:
+    """The entry point of the resharding command."""
+    parser = argparse.ArgumentParser(description="Move borrowings between shards.")
+    parser.add_argument("--source", type=json.loads, required=True)
+    args = parser.parse_args()
+
+    await database.connect()
+    try:
+        moved = await reshard(args.source)
+    finally:
+        await database.disconnect()
+
+    print(f"Moved {moved['borrowings']} borrowings of {moved['users']} users.")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,106 @@
+"""Worker processing jobs of the Postgres-backed job queue.
+
+Run with `python -m src.worker`.
+"""
+
+import asyncio
+import signal
+from datetime import date
+from typing import Awaitable, Callable
+
+from src.config import config
+from src.container import Container
+from src.core.domain.job import Job, JobKind
+from src.db import borrowing_shards, database
+from src.infrastructure.utils.export import export_analytics
+
+
+container = Container()
+
+
+async def rebuild_similarity_index(_: dict) -> dict | None:
+    """Job handler rebuilding the similar books model."""
+    await container.book_repository().rebuild_similarity_index(force=True)
+    return None
+
+
+async def assess_fines(payload: dict) -> dict | None:
+    """Job handler assessing fines of overdue borrowings."""
+    today = date.fromisoformat(payload["today"]) if "today" in payload else date.today()
+    assessed = await container.fine_repository().assess_fines(today)
+    return {"assessed": assessed}
+
+
+async def export_circulation(_: dict) -> dict | None:
+    """Job handler exporting circulation data to Parquet files."""
+    return await export_analytics()
+
+
+HANDLERS: dict[JobKind, Callable[[dict], Awaitable[dict | None]]] = {
+    JobKind.SIMILARITY_REBUILD: rebuild_similarity_index,
+    JobKind.FINE_ASSESSMENT: assess_fines,
+    JobKind.ANALYTICS_EXPORT: export_circulation,
+}
+
+
+async def process_job(job: Job) -> None:
+    """A function running the handler of a taken job.
+
+    Args:
+        job (Job): The job taken from the queue.
+    """
+    repository = container.job_repository()
+    try:
+        result = await HANDLERS[job.kind](job.payload)
+    except Exception as e:
+        print(f"Job {job.id} ({job.kind.value}) failed: {e}")
+        await repository.fail_job(job, str(e))
+        return
+
+    await repository.complete_job(job, result)
+
+
+async def work(stop: asyncio.Event) -> None:
+    """A function taking and processing jobs until stopped.
+
+    Args:
+        stop (asyncio.Event): The event ending the loop.
+    """
+    repository = container.job_repository()
+    while not stop.is_set():
+        try:
+            job = await repository.dequeue_job()
+        except Exception as e:
+            print(f"Dequeueing failed: {e}")
+            job = None
+
+        if job:
+            await process_job(job)
+            continue
+
+        try:
+            await asyncio.wait_for(stop.wait(), config.JOB_POLL_INTERVAL_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def main() -> None:
+    """The entry point of the worker process."""
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, stop.set)
+
+    await database.connect()
+    await borrowing_shards.connect()
+    try:
+        await asyncio.gather(
+            *(work(stop) for _ in range(config.JOB_WORKER_CONCURRENCY)),
+        )
+    finally:
+        await borrowing_shards.disconnect()
+        await database.disconnect()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,32 @@
+"""Fixtures of tests run against the Postgres database set by `DB_*`."""
+
+from typing import AsyncGenerator
+
+import pytest
+import pytest_asyncio
+from asyncpg.exceptions import PostgresError
+
+from src.db import Database, borrowing_shards, create_schema, database
+from tests.factories import delete_created
+
+
+@pytest_asyncio.fixture
+async def db() -> AsyncGenerator[Database, None]:
+    """Connects the app database and its borrowing shards and deletes
+    the rows added by the test when it finishes.
+
+    Tests using the database are skipped when it cannot be reached.
+    """
+    try:
+        await database.connect()
+    except (OSError, PostgresError) as e:
+        pytest.skip(f"Postgres is not available: {e}")
+
+    await create_schema()
+    await borrowing_shards.connect()
+    try:
+        yield database
+    finally:
+        await delete_created(database)
+        await borrowing_shards.disconnect()
+    await database.disconnect()
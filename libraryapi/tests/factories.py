@@ -0,0 +1,72 @@
+"""Helpers adding test data and deleting it when a test finishes."""
+
+import uuid
+
+from src.db import (
+    Database,
+    author_table,
+    book_table,
+    borrowing_archive_table,
+    borrowing_shards,
+    borrowing_table,
+    category_table,
+    user_loan_counter_table,
+    user_table,
+)
+
+# Ids of rows added by the running test. Books and everything referencing
+# them or the users are deleted by cascades from these rows.
+created: dict[str, list[int]] = {"authors": [], "categories": [], "users": []}
+
+
+async def add_book(db: Database, copies: int) -> int:
+    """Adds a book with its own author and category."""
+    name = uuid.uuid4().hex
+    author_id = await db.execute(
+        author_table.insert().values(first_name="Test", last_name=name)
+    )
+    created["authors"].append(author_id)
+    category_id = await db.execute(
+        category_table.insert().values(name=name, description="")
+    )
+    created["categories"].append(category_id)
+    return await db.execute(
+        book_table.insert().values(
+            title=name,
+            author_id=author_id,
+            category_id=category_id,
+            published_year=2000,
+            copies_available=copies,
+        )
+    )
+
+
+async def add_users(db: Database, count: int) -> list[int]:
+    """Adds users without any borrowings."""
+    user_ids = [
+        await db.execute(
+            user_table.insert().values(email=f"{uuid.uuid4().hex}@example.com", password="")
+        )
+        for _ in range(count)
+    ]
+    created["users"].extend(user_ids)
+    return user_ids
+
+
+async def delete_created(db: Database) -> None:
+    """Deletes rows added by the finished test.
+
+    Borrowings and loan counters of other shards have no foreign keys to
+    the users, so they are deleted explicitly.
+    """
+    user_ids = created["users"]
+    if borrowing_shards.sharded and user_ids:
+        for table in (borrowing_table, borrowing_archive_table, user_loan_counter_table):
+            await borrowing_shards.gather(
+                lambda shard: shard.execute(table.delete().where(table.c.user_id.in_(user_ids)))
+            )
+
+    for table, name in ((user_table, "users"), (author_table, "authors"), (category_table, "categories")):
+        if created[name]:
+            await db.execute(table.delete().where(table.c.id.in_(created[name])))
+        created[name].clear()
@@ -0,0 +1,139 @@
+"""Tests of concurrent checkouts."""
+
+import asyncio
+import uuid
+from datetime import date
+
+import pytest
+from sqlalchemy import func, select
+
+from src.container import Container
+from src.core.domain.borrowing import BorrowingIn
+from src.core.domain.copy import BookCopyIn
+from src.db import (
+    Database,
+    book_table,
+    borrowing_shards,
+    borrowing_table,
+    user_loan_counter_table,
+    user_table,
+)
+from tests.factories import add_book, add_users
+
+CHECKOUTS = 20
+COPIES = 3
+LOCK_TIMEOUT_SECONDS = 5
+
+container = Container()
+
+
+async def active_loans(user_ids: list[int]) -> dict[int, int]:
+    """Counts active loans per user in the counters and in borrowings."""
+    counters, borrowings = {}, {}
+    for user_id in user_ids:
+        shard = borrowing_shards.for_user(user_id)
+        counters[user_id] = await shard.fetch_val(
+            select(func.coalesce(func.sum(user_loan_counter_table.c.active_loans), 0))
+                .where(user_loan_counter_table.c.user_id == user_id)
+        )
+        borrowings[user_id] = await shard.fetch_val(
+            select(func.count())
+                .where(
+                    (borrowing_table.c.user_id == user_id) &
+                    (borrowing_table.c.status == "borrowed")
+                )
+        )
+
+    assert counters == borrowings
+    return counters
+
+
+@pytest.mark.asyncio
+async def test_concurrent_checkouts_lend_each_copy_once(db: Database) -> None:
+    book_id = await add_book(db, COPIES)
+    user_ids = await add_users(db, CHECKOUTS)
+    repository = container.borrowing_repository()
+
+    results = await asyncio.gather(*(
+        repository.create_borrowing(
+            BorrowingIn(user_id=user_id, book_id=book_id, borrowed_date=date.today())
+        )
+        for user_id in user_ids
+    ))
+
+    lent = [result for result in results if result is not None]
+    assert len(lent) == COPIES
+    available = await db.fetch_val(
+        select(book_table.c.copies_available).where(book_table.c.id == book_id)
+    )
+    assert available == 0
+    loans = await active_loans(user_ids)
+    assert loans == {
+        user_id: int(user_id in {borrowing.user_id for borrowing in lent})
+        for user_id in user_ids
+    }
+
+    for borrowing in lent:
+        assert await repository.mark_borrowing_as_returned(borrowing.id, date.today())
+    available = await db.fetch_val(
+        select(book_table.c.copies_available).where(book_table.c.id == book_id)
+    )
+    assert available == COPIES
+    assert set((await active_loans(user_ids)).values()) == {0}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_checkouts_claim_distinct_copies(db: Database) -> None:
+    book_id = await add_book(db, 0)
+    user_ids = await add_users(db, CHECKOUTS)
+    await container.copy_repository().add_copies([
+        BookCopyIn(book_id=book_id, barcode=uuid.uuid4().hex) for _ in range(COPIES)
+    ])
+    repository = container.borrowing_repository()
+
+    results = await asyncio.gather(*(
+        repository.create_borrowing(
+            BorrowingIn(user_id=user_id, book_id=book_id, borrowed_date=date.today())
+        )
+        for user_id in user_ids
+    ))
+
+    lent = [result for result in results if result is not None]
+    assert len(lent) == COPIES
+    assert len({borrowing.copy_id for borrowing in lent}) == COPIES
+    await container.copy_repository().refresh_copy_availability()
+    available = await db.fetch_val(
+        select(book_table.c.copies_available).where(book_table.c.id == book_id)
+    )
+    assert available == 0
+    assert sum((await active_loans(user_ids)).values()) == COPIES
+
+
+
+@pytest.mark.asyncio
+async def test_checkouts_of_other_books_do_not_wait(db: Database) -> None:
+    book_id, other_book_id = await add_book(db, 1), await add_book(db, 1)
+    user_id, other_user_id = await add_users(db, 2)
+    repository = container.borrowing_repository()
+
+    # A checkout in flight holds the row locks of its user and its book
+    # until it commits. Checkouts of other users and books must not wait.
+    async with db.connection() as connection:
+        async with connection.transaction():
+            await connection.execute(
+                select(user_table.c.id).where(user_table.c.id == user_id).with_for_update()
+            )
+            await connection.execute(
+                book_table.update()
+                    .where(book_table.c.id == book_id)
+                    .values(copies_available=book_table.c.copies_available - 1)
+            )
+
+            borrowing = await asyncio.wait_for(
+                asyncio.create_task(repository.create_borrowing(
+                    BorrowingIn(user_id=other_user_id, book_id=other_book_id, borrowed_date=date.today())
+                )),
+                LOCK_TIMEOUT_SECONDS,
+            )
+
+    assert borrowing is not None
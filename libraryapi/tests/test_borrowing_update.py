@@ -0,0 +1,73 @@
+"""Tests of borrowing updates keeping stock consistent."""
+
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import select
+
+from src.container import Container
+from src.core.domain.borrowing import BorrowingIn, BorrowingStatus
+from src.db import Database, book_table
+from tests.factories import add_book, add_users
+
+container = Container()
+
+
+async def copies_available(db: Database, book_id: int) -> int:
+    """Reads the stock of a book."""
+    return await db.fetch_val(
+        select(book_table.c.copies_available).where(book_table.c.id == book_id)
+    )
+
+
+@pytest.mark.asyncio
+async def test_update_keeps_book_of_active_loan(db: Database) -> None:
+    book_id, other_book_id = await add_book(db, 1), await add_book(db, 1)
+    [user_id] = await add_users(db, 1)
+    repository = container.borrowing_repository()
+    borrowing = await repository.create_borrowing(
+        BorrowingIn(user_id=user_id, book_id=book_id, borrowed_date=date.today())
+    )
+
+    planned = date.today() + timedelta(days=30)
+    updated = await repository.update_borrowing(borrowing.id, BorrowingIn(
+        user_id=user_id,
+        book_id=other_book_id,
+        borrowed_date=borrowing.borrowed_date,
+        planned_return_date=planned,
+    ))
+
+    assert updated.book_id == book_id
+    assert updated.planned_return_date == planned
+    assert await copies_available(db, book_id) == 0
+    assert await copies_available(db, other_book_id) == 1
+
+
+@pytest.mark.asyncio
+async def test_update_to_returned_releases_stock(db: Database) -> None:
+    book_id = await add_book(db, 1)
+    [user_id] = await add_users(db, 1)
+    repository = container.borrowing_repository()
+    borrowing = await repository.create_borrowing(
+        BorrowingIn(user_id=user_id, book_id=book_id, borrowed_date=date.today())
+    )
+
+    updated = await repository.update_borrowing(borrowing.id, BorrowingIn(
+        user_id=user_id,
+        book_id=book_id,
+        borrowed_date=borrowing.borrowed_date,
+        status=BorrowingStatus.RETURNED,
+    ))
+
+    assert updated.status == BorrowingStatus.RETURNED
+    assert updated.return_date == date.today()
+    assert await copies_available(db, book_id) == 1
+
+    reopened = await repository.update_borrowing(borrowing.id, BorrowingIn(
+        user_id=user_id,
+        book_id=book_id,
+        borrowed_date=borrowing.borrowed_date,
+    ))
+
+    assert reopened.status == BorrowingStatus.RETURNED
+    assert await copies_available(db, book_id) == 1
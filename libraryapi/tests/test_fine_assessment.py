@@ -0,0 +1,63 @@
+"""Tests of incremental fine assessment."""
+
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import select
+
+from src.config import config
+from src.container import Container
+from src.core.domain.borrowing import BorrowingIn
+from src.db import Database, fine_table
+from tests.factories import add_book, add_users
+
+LOANS = 5
+
+container = Container()
+
+
+async def fine_days(db: Database, borrowing_ids: list[int]) -> dict[int, int]:
+    """Reads days overdue of fines of borrowings."""
+    rows = await db.fetch_all(
+        select(fine_table.c.borrowing_id, fine_table.c.days_overdue)
+            .where(fine_table.c.borrowing_id.in_(borrowing_ids))
+    )
+    return {row["borrowing_id"]: row["days_overdue"] for row in rows}
+
+
+@pytest.mark.asyncio
+async def test_assess_fines_in_batches(
+    db: Database,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(config, "FINE_ASSESSMENT_BATCH_SIZE", 2)
+    book_id = await add_book(db, LOANS)
+    user_ids = await add_users(db, LOANS)
+    borrowing_repository = container.borrowing_repository()
+    fine_repository = container.fine_repository()
+    today = date.today()
+
+    borrowings = [
+        await borrowing_repository.create_borrowing(BorrowingIn(
+            user_id=user_id,
+            book_id=book_id,
+            borrowed_date=today - timedelta(days=20),
+            planned_return_date=today - timedelta(days=10),
+        ))
+        for user_id in user_ids
+    ]
+    borrowing_ids = [borrowing.id for borrowing in borrowings]
+    returned = borrowings[0]
+    assert await borrowing_repository.mark_borrowing_as_returned(returned.id, today - timedelta(days=4))
+
+    await fine_repository.assess_fines(today)
+    assert await fine_days(db, borrowing_ids) == {
+        borrowing_id: 6 if borrowing_id == returned.id else 10
+        for borrowing_id in borrowing_ids
+    }
+
+    await fine_repository.assess_fines(today + timedelta(days=1))
+    assert await fine_days(db, borrowing_ids) == {
+        borrowing_id: 6 if borrowing_id == returned.id else 11
+        for borrowing_id in borrowing_ids
+    }
@@ -0,0 +1,58 @@
+"""Tests of startup migrations run against a schema of an older release."""
+
+import uuid
+
+import pytest
+from sqlalchemy import select
+
+from src.container import Container
+from src.core.domain.user import UserIn
+from src.db import Database, normalize_emails, user_table
+
+container = Container()
+
+
+async def add_users(db: Database, emails: list[str]) -> list[int]:
+    """Adds users with emails stored as written."""
+    return [
+        await db.execute(user_table.insert().values(email=email, password=""))
+        for email in emails
+    ]
+
+
+@pytest.mark.asyncio
+async def test_normalize_emails_builds_missing_index(db: Database) -> None:
+    name = uuid.uuid4().hex
+    async with db.transaction(force_rollback=True):
+        await db.execute("DROP INDEX uq_users_email_lower")
+        user_ids = await add_users(db, [f" {name}@Example.COM", f"{name}.other@example.com"])
+
+        assert await normalize_emails(db) >= 1
+        emails = await db.fetch_all(
+            select(user_table.c.email).where(user_table.c.id.in_(user_ids)).order_by(user_table.c.id)
+        )
+        assert [row["email"] for row in emails] == [
+            f"{name}@example.com",
+            f"{name}.other@example.com",
+        ]
+        assert await db.fetch_val("SELECT to_regclass('uq_users_email_lower') IS NOT NULL")
+
+        repository = container.user_repository()
+        assert await repository.register_user(UserIn(email=f"{name}.new@example.com", password="x"))
+        assert await repository.register_user(UserIn(email=f"{name}@EXAMPLE.com", password="x")) is None
+
+
+@pytest.mark.asyncio
+async def test_normalize_emails_reports_duplicates(
+    db: Database,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    name = uuid.uuid4().hex
+    async with db.transaction(force_rollback=True):
+        await db.execute("DROP INDEX uq_users_email_lower")
+        await add_users(db, [f"{name}@example.com", f"{name}@EXAMPLE.com"])
+
+        await normalize_emails(db)
+
+        assert f"share the email '{name}@example.com'" in capsys.readouterr().out
+        assert not await db.fetch_val("SELECT to_regclass('uq_users_email_lower') IS NOT NULL")